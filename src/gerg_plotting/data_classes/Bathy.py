@@ -1,23 +1,33 @@
 import matplotlib.figure
 import numpy as np
-from attrs import define,field,asdict
+from attrs import define,field
 from pprint import pformat
 from typing import Iterable
 import matplotlib.axes
 import matplotlib.pyplot
 import matplotlib.colorbar
-from matplotlib.colors import Colormap
+from matplotlib.colors import Colormap,Normalize,from_levels_and_colors
+from matplotlib.cm import ScalarMappable
 import xarray as xr
 from pathlib import Path
+from functools import lru_cache
+import tempfile
+import hashlib
+import os
+import shutil
 import cmocean
 import copy
 
 
-from gerg_plotting.modules.calculations import get_center_of_mass
-from gerg_plotting.modules.plotting import colorbar
+from gerg_plotting.modules.calculations import get_center_of_mass,coarsen_mean
+from gerg_plotting.modules.plotting import colorbar,get_contour_levels
+from gerg_plotting.modules.contours import _grid_hash
+from gerg_plotting.modules.utilities import get_field_names,get_field_set,public_asdict
 
 from gerg_plotting.data_classes.bounds import Bounds
 from gerg_plotting.data_classes.variable import Variable
+from gerg_plotting.data_classes.tile_store import TilePyramid
+from gerg_plotting.data_classes.array_cache import ArrayCache
 
 @define(repr=False)
 class Bathy:
@@ -27,17 +37,21 @@ class Bathy:
     Attributes
     ----------
     lat : Iterable | Variable | None
-        Latitude values or Variable object containing latitude data
+        1D latitude coordinates of the rows of the depth grid
     lon : Iterable | Variable | None
-        Longitude values or Variable object containing longitude data
+        1D longitude coordinates of the columns of the depth grid
     depth : Iterable | Variable | None
-        Depth values or Variable object containing depth data
+        2D depth grid with shape (lat, lon)
     time : Iterable | Variable | None
         Time values or Variable object containing temporal data
     bounds : Bounds
         Object containing spatial and vertical boundaries for the dataset.
-    resolution_level : float or int, optional
+    resolution_level : float or int or str, optional
         Degree resolution for coarsening the dataset, default is 5.
+        'auto' reads the precomputed overview whose resolution is closest to ``target_resolution`` instead.
+    target_resolution : int, optional
+        Number of grid cells wanted across the larger side of the bounds when resolution_level is 'auto',
+        for example the width of the axes in pixels, default is 1000.
     contour_levels : int, optional
         Number of contour levels for visualization, default is 50.
     land_color : list
@@ -58,6 +72,13 @@ class Bathy:
         Center of mass of the bathymetry data (longitude, latitude, depth).
     label : str
         Label for the bathymetry data, default is 'Bathymetry'.
+    raster : bool
+        Whether maps draw the bathymetry as an image colored by contour level instead of with contourf,
+        which looks the same but skips computing the contour polygons, default is False.
+    raster_cache_dir : str or None
+        Directory where rendered rasters are cached between runs, default is None for no on-disk cache.
+    contour_cache_dir : str or None
+        Directory where the contour polygons drawn by maps are cached between runs, default is None for no on-disk cache.
     """
     # Dims
     lat: Iterable|Variable|None = field(default=None)
@@ -66,7 +87,8 @@ class Bathy:
     time: Iterable|Variable|None = field(default=None)
     
     bounds: Bounds = field(default=None)
-    resolution_level: float | int | None = field(default=5)
+    resolution_level: float | int | str | None = field(default=5)
+    target_resolution: int = field(default=1000)
     contour_levels: int = field(default=50)
     land_color: list = field(default=[231 / 255, 194 / 255, 139 / 255, 1])
     vmin: int | float = field(default=0)
@@ -77,6 +99,9 @@ class Bathy:
     cbar_kwargs: dict = field(default={})
     center_of_mass: tuple = field(default=None)
     label: str = field(default='Bathymetry')
+    raster: bool = field(default=False)
+    raster_cache_dir: str | None = field(default=None)
+    contour_cache_dir: str | None = field(default=None)
 
     def __attrs_post_init__(self) -> None:
         """
@@ -86,7 +111,7 @@ class Bathy:
         self.get_bathy()
         # Scale depth values if a vertical scaler is provided
         if self.bounds.vertical_scalar is not None:
-            self.depth = self.depth * self.bounds.vertical_scalar
+            self.depth = self._load_bathy(self.bounds.vertical_scalar)[2]
         # Compute the center of mass of the bathymetry data
         self.center_of_mass = get_center_of_mass(self.lon, self.lat, self.depth)
         # Adjust the colormap for visualization
@@ -101,13 +126,12 @@ class Bathy:
 
     def _has_var(self, key) -> bool:
         """Checks if a variable exists in the instrument."""
-        return key in self.get_vars()
+        return key in get_field_set(type(self))
     
 
     def get_vars(self) -> list:
         """Gets a list of all available variables."""
-        vars = list(asdict(self).keys())
-        return vars
+        return list(get_field_names(type(self)))
 
 
     def __getitem__(self, key) -> Variable:
@@ -127,7 +151,7 @@ class Bathy:
 
     def __repr__(self) -> None:
         '''Pretty printing'''
-        return pformat(asdict(self),width=1)
+        return pformat(public_asdict(self),width=1)
 
     def get_label(self) -> str:
         """
@@ -156,10 +180,12 @@ class Bathy:
         """
         Load and process bathymetry data.
 
+        The arrays are shared through a process-wide cache, ``bathy_cache``, and are read-only.
+
         Returns
         -------
         tuple of np.ndarray
-            Longitude, latitude, and depth values.
+            1D longitude and latitude coordinates, and the 2D depth grid with shape (lat, lon).
 
         Raises
         ------
@@ -169,38 +195,154 @@ class Bathy:
         if self.bounds is None:
             raise ValueError(f'The map bounds are not found')
 
-        # Define the path to the seafloor data file
-        self_path = Path(__file__).parent
-        seafloor_path = self_path.parent.joinpath('seafloor_data/seafloor_data.nc')
-        ds = xr.open_dataset(seafloor_path)  # Read in seafloor data
+        self.lon, self.lat, self.depth = self._load_bathy()
+
+        return self.lon, self.lat, self.depth
+
+    def _cache_key(self, vertical_scalar=None) -> tuple:
+        """Key identifying the bathymetry grid for the bounds, resolution and vertical scalar."""
+        target_resolution = self.target_resolution if self.resolution_level == 'auto' else None
+        return (self.bounds["lat_min"], self.bounds["lat_max"], self.bounds["lon_min"], self.bounds["lon_max"],
+                self.bounds["depth_top"], self.bounds["depth_bottom"], self.resolution_level, target_resolution, vertical_scalar)
+
+    def _load_bathy(self, vertical_scalar=None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the bathymetry for the bounds and resolution from the cache, reading it on a miss.
+
+        Parameters
+        ----------
+        vertical_scalar : float or int, optional
+            Factor the depth is multiplied by
 
-        # Slice the dataset to match the spatial bounds
-        ds = ds.sel(lat=slice(self.bounds["lat_min"], self.bounds["lat_max"])).sel(
-            lon=slice(self.bounds["lon_min"], self.bounds["lon_max"])
-        )
+        Returns
+        -------
+        tuple of np.ndarray
+            Read-only 1D longitude and latitude coordinates, and the 2D depth grid.
+        """
+        if vertical_scalar == 1:
+            vertical_scalar = None
+        key = self._cache_key(vertical_scalar)
+        arrays = bathy_cache.get(key)
+        if arrays is None:
+            if vertical_scalar is not None:
+                lon, lat, depth = self._load_bathy()
+                arrays = (lon, lat, depth * vertical_scalar)
+            else:
+                arrays = self._read_bathy()
+            arrays = bathy_cache.put(key, arrays)
+        return arrays
 
-        # Coarsen the dataset to improve performance, if resolution_level is set
-        if self.resolution_level is not None:
-            ds = ds.coarsen(lat=self.resolution_level, boundary='trim').mean().coarsen(
-                lon=self.resolution_level, boundary='trim'
-            ).mean()  # type: ignore
+    def _read_bathy(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Read the bathymetry for the bounds and resolution from the seafloor data.
+
+        Returns
+        -------
+        tuple of np.ndarray
+            1D longitude and latitude coordinates, and the 2D depth grid.
+        """
+        # Read only the tiles of the seafloor data that intersect the bounds
+        pyramid = get_seafloor_store()
+        bounds = dict(lat_min=self.bounds["lat_min"], lat_max=self.bounds["lat_max"],
+                      lon_min=self.bounds["lon_min"], lon_max=self.bounds["lon_max"])
+        level = 0
+        if self.resolution_level == 'auto':
+            level = pyramid.select_level(**bounds, target_size=self.target_resolution)
+        lat, lon, elevation = pyramid.read(**bounds, level=level)
+
+        # Coarsen the data to improve performance, if resolution_level is set
+        if self.resolution_level is not None and self.resolution_level != 'auto':
+            lat = coarsen_mean(lat, self.resolution_level)
+            lon = coarsen_mean(lon, self.resolution_level)
+            elevation = coarsen_mean(coarsen_mean(elevation, self.resolution_level, axis=0), self.resolution_level, axis=1)
 
         # Extract and flip depth values
-        self.depth = ds['elevation'].values * -1
+        depth = elevation * -1
 
         # Apply depth constraints for visualization
         if self.bounds["depth_top"] is not None:
-            self.depth = np.where(self.depth > self.bounds["depth_top"], self.depth, self.bounds["depth_top"])
+            depth = np.where(depth > self.bounds["depth_top"], depth, self.bounds["depth_top"])
         if self.bounds["depth_bottom"] is not None:
-            self.depth = np.where(self.depth < self.bounds["depth_bottom"], self.depth, self.bounds["depth_bottom"])
+            depth = np.where(depth < self.bounds["depth_bottom"], depth, self.bounds["depth_bottom"])
 
-        # Extract latitude and longitude values
-        self.lon = ds.coords['lat'].values
-        self.lat = ds.coords['lon'].values
-        # Create a meshgrid for plotting
-        self.lon, self.lat = np.meshgrid(self.lat, self.lon)
+        return lon, lat, depth
 
-        return self.lon, self.lat, self.depth
+    def get_raster(self) -> tuple[np.ndarray, list, ScalarMappable]:
+        """
+        Render the depth grid to an RGBA image colored like ``contourf`` with ``contour_levels`` levels.
+
+        Every cell gets the color of the contour band it falls in, so the image matches the filled contours
+        at the grid resolution. When ``raster_cache_dir`` is set the image is cached on disk,
+        keyed by a hash of the coordinates and depth grid, the levels and the colormap.
+
+        Returns
+        -------
+        tuple
+            RGBA image with shape (lat, lon, 4), its extent as [lon_min, lon_max, lat_min, lat_max]
+            and a mappable with the discrete colormap for the colorbar.
+        """
+        depth = self.depth
+        cache_file = None
+        if self.raster_cache_dir is not None:
+            key = repr((_grid_hash(self.lon, self.lat, np.ma.masked_invalid(depth)), self.contour_levels, self.vmin)).encode()
+            key += self.cmap(np.arange(self.cmap.N)).tobytes() + np.array([self.cmap.get_under(), self.cmap.get_over()]).tobytes()
+            cache_file = Path(self.raster_cache_dir) / f'bathy_{hashlib.sha1(key).hexdigest()}.npz'
+
+        if cache_file is not None and cache_file.exists():
+            with np.load(cache_file) as npz:
+                rgba, levels = npz['rgba'], npz['levels']
+            cmap, norm = self._get_level_cmap(levels)
+        else:
+            levels = get_contour_levels(depth, self.contour_levels, extend='both')
+            cmap, norm = self._get_level_cmap(levels)
+            rgba = cmap(norm(np.ma.masked_invalid(depth)), bytes=True)
+            if cache_file is not None:
+                cache_file.parent.mkdir(parents=True, exist_ok=True)
+                # Write to a temporary file first so a concurrent reader never sees a partial cache
+                temp_file = cache_file.with_suffix(f'.{os.getpid()}.tmp.npz')
+                np.savez(temp_file, rgba=rgba, levels=levels)
+                os.replace(temp_file, cache_file)
+
+        # Cells are centered on the coordinates
+        dlon = (self.lon[-1] - self.lon[0]) / max(len(self.lon) - 1, 1)
+        dlat = (self.lat[-1] - self.lat[0]) / max(len(self.lat) - 1, 1)
+        extent = [self.lon[0] - dlon / 2, self.lon[-1] + dlon / 2, self.lat[0] - dlat / 2, self.lat[-1] + dlat / 2]
+        return rgba, extent, ScalarMappable(norm=norm, cmap=cmap)
+
+    def _get_level_cmap(self, levels: np.ndarray):
+        """
+        Build the discrete colormap and norm that color each contour band like ``contourf`` with ``extend='both'``.
+
+        Parameters
+        ----------
+        levels : np.ndarray
+            Contour levels
+
+        Returns
+        -------
+        tuple
+            ListedColormap with one color per band, including the bands below and above the levels, and its BoundaryNorm
+        """
+        # contourf colors each band by its midpoint, the open ended bands use the under and over colors
+        extended = np.concatenate([[-1e250], levels, [1e250]])
+        layers = 0.5 * (extended[:-1] + extended[1:])
+        norm = Normalize(vmin=self.vmin, vmax=levels.max())
+        colors = self.cmap(norm(layers))
+        return from_levels_and_colors(levels, colors, extend='both')
+
+    def get_meshgrid(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Build 2D longitude and latitude grids matching the depth grid.
+
+        Only consumers that need full grids, such as 3D meshes, should build them,
+        2D plots use the 1D coordinates directly.
+
+        Returns
+        -------
+        tuple of np.ndarray
+            Longitude and latitude grids with the shape of the depth grid.
+        """
+        return np.meshgrid(self.lon, self.lat)
 
     def add_colorbar(self, fig: matplotlib.figure.Figure, divider, mappable: matplotlib.axes.Axes, nrows: int) -> None:
         """
@@ -231,3 +373,65 @@ class Bathy:
             self.cbar.ax.locator_params(nbins=self.cbar_nbins)
             self.cbar.ax.invert_yaxis()
             return self.cbar
+
+
+# Bathymetry grids shared by every Bathy, keyed by bounds, resolution and vertical scalar
+bathy_cache = ArrayCache()
+
+SEAFLOOR_PATH = Path(__file__).parent.parent.joinpath('seafloor_data/seafloor_data.nc')
+
+
+def get_user_cache_dir() -> Path:
+    """
+    Get the per-user cache directory of gerg_plotting.
+
+    Returns
+    -------
+    Path
+        ``%LOCALAPPDATA%/gerg_plotting`` on Windows, otherwise ``$XDG_CACHE_HOME/gerg_plotting``,
+        defaulting to ``~/.cache/gerg_plotting``
+    """
+    base = os.environ.get('LOCALAPPDATA') if os.name == 'nt' else os.environ.get('XDG_CACHE_HOME')
+    return Path(base or Path.home() / '.cache') / 'gerg_plotting'
+
+
+@lru_cache(maxsize=1)
+def get_seafloor_store() -> TilePyramid:
+    """
+    Get the tiled overview pyramid of the seafloor data, building it from the NetCDF file on first use.
+
+    The pyramid is written to the user cache directory, or to the temporary directory if that is not writable,
+    and is rebuilt when the NetCDF file changes.
+
+    Returns
+    -------
+    TilePyramid
+        Pyramid of the seafloor elevation
+
+    Raises
+    ------
+    OSError
+        If the pyramid cannot be written to any of the locations
+    """
+    stat = SEAFLOOR_PATH.stat()
+    source = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    locations = [get_user_cache_dir() / 'seafloor_tiles', Path(tempfile.gettempdir()) / 'gerg_plotting_seafloor_tiles']
+    for path in locations:
+        try:
+            pyramid = TilePyramid.open(path)
+        except FileNotFoundError:
+            continue
+        if pyramid.attrs.get('source') == source:
+            return pyramid
+    for path in locations:
+        try:
+            if path.exists():
+                # The pyramid is out of date or from an older layout
+                shutil.rmtree(path)
+            with xr.open_dataset(SEAFLOOR_PATH) as ds:
+                elevation = ds['elevation'].transpose('lat', 'lon')
+                return TilePyramid.build(elevation, ds['lat'].values, ds['lon'].values, path, attrs={'source': source})
+        except OSError:
+            # Read-only or full file systems raise PermissionError or other OSErrors such as EROFS
+            continue
+    raise OSError(f'Could not write the seafloor tiles to any of {locations}')
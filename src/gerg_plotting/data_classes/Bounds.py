@@ -2,6 +2,7 @@ from attrs import define,field,validators,asdict
 from pprint import pformat
 
 from gerg_plotting.modules.validations import lat_min_smaller_than_max,lon_min_smaller_than_max
+from gerg_plotting.modules.utilities import get_field_set
 
 @define
 class Bounds:
@@ -60,7 +61,7 @@ class Bounds:
         bool
             True if the attribute exists, False otherwise.
         """
-        return key in asdict(self).keys()
+        return key in get_field_set(type(self))
 
     def __getitem__(self, key: str) -> float | int | None:
         """
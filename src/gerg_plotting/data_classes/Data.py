@@ -1,21 +1,25 @@
 import math
 import numpy as np
-from attrs import define,field,asdict
+from attrs import define,field,asdict,evolve
 from pprint import pformat
 import cmocean
-from typing import Iterable
+from typing import Iterable,ClassVar
 from scipy.signal import welch
 import matplotlib.dates as mdates
 import copy
+import json
+import matplotlib
 
 
 from gerg_plotting.modules.calculations import rotate_vector
 from gerg_plotting.modules.filters import filter_nan
-from gerg_plotting.modules.utilities import calculate_pad
+from gerg_plotting.modules.utilities import calculate_pad,get_field_names,get_field_set,is_lazy_array,to_numpy_array,public_asdict
 
 
 from gerg_plotting.data_classes.bounds import Bounds
 from gerg_plotting.data_classes.variable import Variable
+from gerg_plotting.data_classes.column_store import ColumnStore
+from gerg_plotting.data_classes.array_cache import ArrayCache
 
 
 @define(slots=False,repr=False)
@@ -59,6 +63,22 @@ class Data:
         Turbidity data, dimensionless, with optional colormap and range specifications.
     bounds : Bounds
         Spatial bounds of the data.
+    columnar : bool, optional
+        If True, row-aligned variables are packed into a contiguous ColumnStore so that
+        row selection returns views and all variables are guaranteed to share length.
+        Defaults to False.
+    float_dtype : str or np.dtype, optional
+        dtype applied to every numeric variable except time, for example 'float32' to halve memory
+        and speed up the numpy reductions over the data. float32 keeps latitude and longitude to
+        about a meter. Defaults to None, which keeps the dtype of the input data.
+    max_rows : int, optional
+        Keep only the newest ``max_rows`` rows, older rows are evicted on initialization and by ``append``,
+        turning the Data into a fixed-size window for live displays. Defaults to None, no limit.
+    max_span : np.timedelta64 or datetime.timedelta, optional
+        Keep only the rows whose time is within ``max_span`` of the newest time, requires time data.
+        Rows are evicted from the start, so times are expected in ascending order, out of order rows
+        after the first row inside the span are kept. NaT times are ignored when finding the newest time.
+        Defaults to None, no limit.
     """
     # Dims
     lat: Iterable|Variable|None = field(default=None)
@@ -83,6 +103,19 @@ class Data:
     # Custom variables dictionary to hold dynamically added variables
     custom_variables: dict = field(factory=dict)
 
+    # Columnar backing store for row-aligned variables
+    columnar: bool = field(default=False)
+
+    # dtype policy for numeric variables
+    float_dtype: str|np.dtype|None = field(default=None)
+
+    # Window of rows kept when appending
+    max_rows: int|None = field(default=None)
+    max_span: np.timedelta64|None = field(default=None)
+
+    # Fields that configure the object rather than hold variables
+    _config_fields: ClassVar[tuple[str,...]] = ('custom_variables','columnar','float_dtype','max_rows','max_span')
+
 
     def __attrs_post_init__(self) -> None:
         """
@@ -93,6 +126,15 @@ class Data:
         self._init_dims()
         self._format_datetime()
         self._init_variables()  # Init variables
+        self._apply_float_dtype()
+        self._column_store = None
+        self._append_buffers = {}  # Preallocated arrays that appended variables are views into
+        self._auto_bounds = None  # (bounds, padding) of bounds set by detect_bounds, extended by append
+        self._derived = ArrayCache()  # Memoized derived values keyed by the data versions they were calculated from
+        self._derived_vars = {}  # (data version, memoized value) of the variables set to derived values, such as speed
+        self._evict_rows()
+        if self.columnar:
+            self._get_column_store()
 
 
     def _init_variables(self) -> None:
@@ -113,24 +155,74 @@ class Data:
         self._init_variable(var='turbidity', cmap=cmocean.cm.turbid, units=None, vmin=None, vmax=None)
 
 
+    def get_derived(self, name:str, sources:list[str], calculate) -> object:
+        """
+        Get a value derived from variables, such as density from salinity and temperature.
+
+        The value is memoized with the data versions of the source variables and only recalculated
+        once one of them has new data, for example after ``append`` or assigning data.
+        Data changed in place is detected once it is reassigned (``variable.data = variable.data``).
+        The memoized values are held in a least recently used ``ArrayCache`` and are read-only.
+
+        Parameters
+        ----------
+        name : str
+            Name of the derived value
+        sources : list[str]
+            Names of the variables the value is calculated from
+        calculate : callable
+            Function called with the data of the source variables, in order, to calculate the value,
+            returning an array or a tuple of arrays
+
+        Returns
+        -------
+        object
+            The derived value
+        """
+        variables = [self[var] for var in sources]
+        key = (name, tuple(sources), tuple(variable.version for variable in variables))
+        entry = self._derived.get(key)
+        if entry is None:
+            value = calculate(*(variable.data for variable in variables))
+            # The last item of an entry tells whether the value is a tuple of arrays or a single array
+            entry = self._derived.put(key, (*value, True) if isinstance(value, tuple) else (value, False))
+        return entry[:-1] if entry[-1] else entry[0]
+
+
+    def _is_derived(self, var:str) -> bool:
+        """Checks if a variable still holds the derived value it was set to."""
+        entry = self._derived_vars.get(var)
+        return self[var] is not None and entry is not None and entry[0] == self[var].version
+
+
     def calculate_speed(self,include_w:bool=False) -> None:
         """
         Calculate the speed from velocity components.
 
+        A speed calculated earlier is recalculated when the velocity components have changed since.
+
         Parameters
         ----------
         include_w : bool, optional
             If True, includes the vertical velocity (w-component) in the speed calculation.
             Defaults to False.
         """
-        if self.speed is None:
+        if self.speed is None or self._is_derived('speed'):
             if include_w:
                 if self.check_for_vars(['u','v','w']):
-                    self.speed = np.sqrt(self.u.data**2 + self.v.data**2 + self.w.data**2)
-                    self._init_variable(var='speed', cmap=cmocean.cm.speed, units="m/s", vmin=None, vmax=None)  
+                    self._set_derived_speed(['u','v','w'])
             if self.check_for_vars(['u','v']):
-                self.speed = np.sqrt(self.u.data**2 + self.v.data**2)
-                self._init_variable(var='speed', cmap=cmocean.cm.speed, units="m/s", vmin=None, vmax=None)
+                self._set_derived_speed(['u','v'])
+
+
+    def _set_derived_speed(self, components:list[str]) -> None:
+        """Sets speed to a writable copy of the memoized magnitude of the velocity components, keeping the speed Variable if it is unchanged."""
+        speed = self.get_derived('speed', components, lambda *values: np.sqrt(sum(value**2 for value in values)))
+        if not self._is_derived('speed') or self._derived_vars['speed'][1] is not speed:
+            # The memoized array is read-only and shared, the speed Variable gets its own copy
+            self.speed = speed.copy()
+            self._init_variable(var='speed', cmap=cmocean.cm.speed, units="m/s", vmin=None, vmax=None)
+            self._derived_vars['speed'] = (self.speed.version, speed)
 
 
     def calcluate_PSD(self,sampling_freq,segment_length,theta_rad=None) -> tuple[np.ndarray,np.ndarray,np.ndarray]|tuple[np.ndarray,np.ndarray,np.ndarray,np.ndarray]:
@@ -200,13 +292,13 @@ class Data:
 
     def _has_var(self, key) -> bool:
         """Checks if a variable exists in the instrument."""
-        return key in asdict(self).keys() or key in self.custom_variables
+        return key in get_field_set(type(self)) or key in self.custom_variables
     
 
     def get_vars(self,have_data:bool|None=None) -> list:
         """Gets a list of all available variables."""
-        vars = list(asdict(self).keys()) + list(self.custom_variables.keys())
-        vars = [var for var in vars if var!='custom_variables']
+        vars = [var for var in get_field_names(type(self)) if var not in self._config_fields]
+        vars += list(self.custom_variables.keys())
         # Skip checking if have_data is None
         if have_data is None:
             return vars
@@ -221,26 +313,18 @@ class Data:
     def __getitem__(self, key) -> Variable:
         """Allows accessing standard and custom variables via indexing."""
         if isinstance(key,slice):
-            self_copy = self.copy()
-            for var_name in self.get_vars():
-                if isinstance(self_copy[var_name],Variable):
-                    self_copy[var_name].data = self.slice_var(var=var_name,slice=key)
-            return self_copy
-        elif isinstance(key,list):
-            self_copy = self.copy()
-            for var_name in self.get_vars():
-                if isinstance(self_copy[var_name],Variable):
-                    self_copy[var_name].data = self[var_name].data[key]
-            return self_copy
+            return self._take_rows(key)
+        elif isinstance(key,(list,np.ndarray)):
+            return self._take_rows(np.asarray(key))
         elif self._has_var(key):
             return getattr(self, key, self.custom_variables.get(key))
-        raise KeyError(f"Variable '{key}' not found. Must be one of {self.get_vars()}, a slice, or list of indices")    
+        raise KeyError(f"Variable '{key}' not found. Must be one of {self.get_vars()}, a slice, list of indices or boolean mask")    
 
 
     def __setitem__(self, key, value) -> None:
         """Allows setting standard and custom variables via indexing."""
         if self._has_var(key):
-            if key in asdict(self):
+            if key in get_field_set(type(self)):
                 setattr(self, key, value)
             else:
                 self.custom_variables[key] = value
@@ -248,9 +332,364 @@ class Data:
             raise KeyError(f"Variable '{key}' not found. Must be one of {self.get_vars()}")
 
 
+    def _row_length(self) -> int|None:
+        """Gets the number of rows from the first standard variable with data."""
+        for var_name in self.get_vars(have_data=True):
+            if var_name not in self.custom_variables:
+                return len(self[var_name].data)
+        return None
+
+
+    def _get_column_store(self) -> ColumnStore:
+        """
+        Get the columnar store backing the row-aligned variables.
+
+        The store is (re)built whenever a variable was added or its data reassigned
+        since the last build, and each Variable's data is then pointed at its column view.
+        Custom variables whose length differs from the standard variables (such as PSD results)
+        are not row-aligned and are left out of the store, as are memory-mapped and chunked
+        variables, which would otherwise be loaded into memory.
+
+        Returns
+        -------
+        ColumnStore
+            Store holding every row-aligned variable
+
+        Raises
+        ------
+        ValueError
+            If the standard variables do not all share the same length
+        """
+        n_rows = self._row_length()
+        row_vars = [var_name for var_name in self.get_vars(have_data=True)
+                    if (var_name not in self.custom_variables or len(self[var_name].data) == n_rows)
+                    and not is_lazy_array(self[var_name].data)]
+        store = self._column_store
+        if store is not None and len(store.columns) == len(row_vars) and \
+                all(store.owns(var_name, self[var_name].data) for var_name in row_vars):
+            return store
+        store = ColumnStore.from_arrays({var_name: self[var_name].data for var_name in row_vars})
+        for var_name in row_vars:
+            self[var_name].data = store.columns[var_name]
+        self._column_store = store
+        return store
+
+
+    def _take_rows(self, key) -> 'Data':
+        """
+        Select rows without deep copying the whole object.
+
+        The new Data shares colormaps, units, limits and labels with this one.
+        Slices give numpy views, while index arrays and boolean masks gather each variable once,
+        or each block of the column store once when the data is columnar.
+
+        Parameters
+        ----------
+        key : slice | np.ndarray
+            Slice, integer index array or boolean mask selecting rows
+
+        Returns
+        -------
+        Data
+            New Data holding the selected rows
+        """
+        store = self._get_column_store().take(key) if self.columnar else None
+        standard, custom = {}, {}
+        for var_name in self.get_vars(have_data=True):
+            variable = self[var_name]
+            if store is not None and var_name in store:
+                data = store.columns[var_name]
+            else:
+                data = variable.data[key]
+            # Carry the source limits over so subsets share a color scale without recomputing it,
+            # lazy sources only carry limits already known since computing them reads the whole source
+            if is_lazy_array(variable.data):
+                limits = variable._limits or (None, None)
+                vmin = limits[0] if variable._vmin is None else variable._vmin
+                vmax = limits[1] if variable._vmax is None else variable._vmax
+            else:
+                vmin, vmax = variable.vmin, variable.vmax
+            variable = evolve(variable, data=data, vmin=vmin, vmax=vmax)
+            if var_name in self.custom_variables:
+                custom[var_name] = variable
+            else:
+                standard[var_name] = variable
+        data = Data(**standard, bounds=copy.copy(self.bounds), float_dtype=self.float_dtype,
+                    max_rows=self.max_rows, max_span=self.max_span)
+        for variable in custom.values():
+            data.add_custom_variable(variable)
+        if store is not None:
+            data.columnar = True
+            data._column_store = store
+        return data
+
+
+    def append(self, other:'Data|dict') -> None:
+        """
+        Append rows to every row-aligned variable in amortized O(rows appended) time.
+
+        Each variable is backed by a buffer whose capacity doubles when full,
+        so the data of a variable is a view of the filled part of its buffer.
+        Color limits that were not set are tracked with a quantile sketch fed only the new rows,
+        and bounds set by ``detect_bounds`` are extended to cover the new rows.
+        Columnar data rebuilds its column store on the next row selection.
+
+        When ``max_rows`` or ``max_span`` is set the oldest rows are evicted afterwards,
+        the buffers then work as ring buffers that keep the window contiguous and memory constant.
+        The color limits of windowed data are computed from the rows in the window.
+
+        Parameters
+        ----------
+        other : Data | dict
+            Data, or arrays keyed by variable name, holding the rows to append for every row-aligned variable.
+            When there are no row-aligned variables yet, its variables become the initial ones.
+
+        Raises
+        ------
+        ValueError
+            If the new rows do not cover exactly the row-aligned variables or their lengths differ
+        """
+        if isinstance(other, Data):
+            batch = {var_name: other[var_name].data for var_name in other.get_vars(have_data=True)}
+        else:
+            batch = {var_name: to_numpy_array(values) for var_name, values in other.items()}
+        n_rows = self._row_length()
+        row_vars = [var_name for var_name in self.get_vars(have_data=True) if len(self[var_name].data) == n_rows]
+        if not row_vars:
+            # Nothing to append to yet, the new rows become the initial variables
+            self._set_initial_rows(other if isinstance(other, Data) else batch)
+            return
+        if set(batch) != set(row_vars):
+            raise ValueError(f"Appended variables {sorted(batch)} must match the row-aligned variables {sorted(row_vars)}")
+        lengths = {len(values) for values in batch.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"All appended variables must have the same length, got {lengths}")
+
+        windowed = self.max_rows is not None or self.max_span is not None
+        for var_name in row_vars:
+            variable = self[var_name]
+            values = np.asarray(batch[var_name])
+            if var_name == 'time':
+                values = values.astype('datetime64[ns]', copy=False)
+            elif self.float_dtype is not None and values.dtype.kind in 'fiu':
+                values = values.astype(self.float_dtype, copy=False)
+            # Seed the sketch with the existing rows once, then only the new rows are fed to it
+            if var_name != 'time' and not windowed and variable.sketch is None and (variable._vmin is None or variable._vmax is None):
+                variable.update_sketch(np.asarray(variable.data))
+            # Reassigning the data drops the sketch, keep it since it is extended with the new rows
+            sketch = variable.sketch
+            variable.data = self._append_to_buffer(var_name, variable.data, values)
+            if sketch is not None:
+                variable._sketch = sketch
+                variable.update_sketch(values)
+            self._extend_auto_bounds(var_name, values)
+        self._evict_rows()
+
+
+    def _set_initial_rows(self, other:'Data|dict') -> None:
+        """
+        Take the variables of the first appended rows when there are no row-aligned variables yet.
+
+        Parameters
+        ----------
+        other : Data | dict
+            Data, or arrays keyed by standard variable name, holding the first rows
+
+        Raises
+        ------
+        ValueError
+            If the new rows name an unknown variable or their lengths differ
+        """
+        if not isinstance(other, Data):
+            standard_vars = [var_name for var_name in self.get_vars() if var_name not in self.custom_variables]
+            unknown = set(other) - set(standard_vars)
+            if unknown:
+                raise ValueError(f"Appended variables {sorted(unknown)} must be one of {standard_vars}")
+            other = Data(**other)
+        lengths = {len(other[var_name].data) for var_name in other.get_vars(have_data=True)}
+        if len(lengths) > 1:
+            raise ValueError(f"All appended variables must have the same length, got {lengths}")
+        variables = []
+        for var_name in other.get_vars(have_data=True):
+            # Copy the Variable so the two Data do not share limits, the data is only read
+            variable = evolve(other[var_name], data=other[var_name].data)
+            if var_name in other.custom_variables:
+                self.add_custom_variable(variable, exist_ok=True)
+            else:
+                self[var_name] = variable
+                variables.append(variable)
+            self._extend_auto_bounds(var_name, np.asarray(variable.data))
+        self._apply_float_dtype(variables)
+        self._evict_rows()
+
+
+    def _append_to_buffer(self, var_name:str, data:np.ndarray, values:np.ndarray) -> np.ndarray:
+        """
+        Write rows after the data of a variable, growing its buffer geometrically when full.
+
+        Data that starts part way into its buffer, after rows were evicted, is moved back
+        to the start of the buffer when the buffer end is reached and the buffer is at most half full.
+
+        Parameters
+        ----------
+        var_name : str
+            Name of the variable
+        data : np.ndarray
+            Current data of the variable
+        values : np.ndarray
+            Rows to append
+
+        Returns
+        -------
+        np.ndarray
+            View of the buffer holding the data followed by the new rows
+        """
+        n_rows, n_new = len(data), len(values)
+        buffer = self._append_buffers.get(var_name)
+        dtype = np.result_type(data.dtype, values.dtype)
+        # The data may have been reassigned since the last append, then the buffer is stale
+        owned = buffer is not None and data.base is buffer and buffer.dtype == dtype
+        start = (data.ctypes.data - buffer.ctypes.data) // buffer.itemsize if owned else 0
+        if owned and start + n_rows + n_new > len(buffer) and 2 * (n_rows + n_new) <= len(buffer):
+            # Compact the window to the start of the buffer
+            buffer[:n_rows] = data
+            start = 0
+        elif not owned or start + n_rows + n_new > len(buffer):
+            buffer = np.empty(max(2 * (n_rows + n_new), 16), dtype=dtype)
+            buffer[:n_rows] = data
+            start = 0
+            self._append_buffers[var_name] = buffer
+        buffer[start + n_rows:start + n_rows + n_new] = values
+        return buffer[start:start + n_rows + n_new]
+
+
+    def _evict_rows(self) -> None:
+        """
+        Drop the oldest rows beyond the ``max_rows`` and ``max_span`` window.
+
+        Raises
+        ------
+        ValueError
+            If ``max_span`` is set and the data has no time
+        """
+        if self.max_rows is None and self.max_span is None:
+            return
+        n_rows = self._row_length()
+        if not n_rows:
+            return
+        n_drop = 0
+        if self.max_rows is not None:
+            n_drop = max(n_rows - self.max_rows, 0)
+        if self.max_span is not None:
+            if self.time is None:
+                raise ValueError('max_span requires time data')
+            times = np.asarray(self.time.data)
+            valid = ~np.isnat(times)
+            if valid.any():
+                cutoff = times[valid].max() - np.timedelta64(self.max_span)
+                # Drop the rows before the first one inside the span, the newest time is always inside it
+                n_drop = max(n_drop, int(np.argmax(valid & (times >= cutoff))))
+        if n_drop == 0:
+            return
+        for var_name in self.get_vars(have_data=True):
+            if len(self[var_name].data) == n_rows:
+                self[var_name].data = self[var_name].data[n_drop:]
+
+
+    def _extend_auto_bounds(self, var_name:str, values:np.ndarray) -> None:
+        """Extend bounds set by ``detect_bounds`` to cover appended lat, lon or depth values."""
+        if self._auto_bounds is None or self._auto_bounds[0] is not self.bounds or len(values) == 0:
+            return
+        if np.all(np.isnan(values)):
+            return
+        bounds, padding = self._auto_bounds
+        names = {'lat': ('lat_min', 'lat_max'), 'lon': ('lon_min', 'lon_max'), 'depth': ('depth_top', 'depth_bottom')}
+        if var_name not in names:
+            return
+        # Depth bounds are not padded
+        start, stop = calculate_pad(values, pad=0 if var_name == 'depth' else padding)
+        lower, upper = names[var_name]
+        changes = {lower: start if bounds[lower] is None else min(bounds[lower], start),
+                   upper: stop if bounds[upper] is None else max(bounds[upper], stop)}
+        self.bounds = evolve(bounds, **changes)
+        self._auto_bounds = (self.bounds, padding)
+
+
+    def to_npz(self, filename:str) -> None:
+        """
+        Save all variables and their metadata to an uncompressed ``.npz`` file.
+
+        Colormaps are stored by name, so only registered matplotlib and cmocean colormaps round-trip.
+        Memory-mapped and chunked variables are loaded to be written.
+
+        Parameters
+        ----------
+        filename : str
+            Path of the file to write
+        """
+        arrays, variables = {}, {}
+        for var_name in self.get_vars(have_data=True):
+            variable = self[var_name]
+            arrays[var_name] = np.asarray(variable.data)
+            variables[var_name] = {
+                'cmap': _get_cmap_name(variable.cmap),
+                'units': variable.units,
+                'vmin': _to_json_number(variable._vmin),
+                'vmax': _to_json_number(variable._vmax),
+                'limits': None if variable._limits is None else [_to_json_number(limit) for limit in variable._limits],
+                'label': variable.label,
+                'custom': var_name in self.custom_variables,
+            }
+        metadata = {
+            'variables': variables,
+            'bounds': None if self.bounds is None else {key: _to_json_number(value) for key, value in asdict(self.bounds).items()},
+            'columnar': self.columnar,
+            'float_dtype': None if self.float_dtype is None else np.dtype(self.float_dtype).name,
+            'max_rows': self.max_rows,
+            'max_span': None if self.max_span is None else int(np.timedelta64(self.max_span, 'ns').astype('int64')),
+        }
+        np.savez(filename, __metadata__=np.array(json.dumps(metadata)), **arrays)
+
+
+    @classmethod
+    def from_npz(cls, filename:str) -> 'Data':
+        """
+        Load a Data object written by ``to_npz``.
+
+        Parameters
+        ----------
+        filename : str
+            Path of the ``.npz`` file
+
+        Returns
+        -------
+        Data
+            Data with the saved variables, metadata, bounds and configuration
+        """
+        with np.load(filename, allow_pickle=False) as npz:
+            metadata = json.loads(str(npz['__metadata__']))
+            standard, custom = {}, []
+            for var_name, attrs in metadata['variables'].items():
+                variable = Variable(data=npz[var_name], name=var_name, cmap=_get_cmap(attrs['cmap']),
+                                    units=attrs['units'], vmin=attrs['vmin'], vmax=attrs['vmax'], label=attrs['label'])
+                if attrs['limits'] is not None:
+                    variable._limits = tuple(attrs['limits'])  # Saved limits skip the percentile computation
+                if attrs['custom']:
+                    custom.append(variable)
+                else:
+                    standard[var_name] = variable
+        bounds = None if metadata['bounds'] is None else Bounds(**metadata['bounds'])
+        max_span = metadata.get('max_span')
+        data = cls(**standard, bounds=bounds, columnar=metadata['columnar'], float_dtype=metadata['float_dtype'],
+                   max_rows=metadata.get('max_rows'), max_span=None if max_span is None else np.timedelta64(max_span, 'ns'))
+        for variable in custom:
+            data.add_custom_variable(variable)
+        return data
+
+
     def __repr__(self) -> None:
         '''Pretty printing'''
-        return pformat(asdict(self),width=1)
+        return pformat(public_asdict(self),width=1)
     
 
     def _repr_html_(self) -> str:
@@ -289,7 +728,29 @@ class Data:
         """Format datetime data as numpy datetime64 objects."""
         if self.time is not None:
             if self.time.data is not None:
-                self.time.data = self.time.data.astype('datetime64[ns]')
+                self.time.data = self.time.data.astype('datetime64[ns]', copy=False)
+
+    def _apply_float_dtype(self, variables:list|None=None) -> None:
+        """
+        Cast numeric variables, except time, to the float_dtype policy.
+
+        Memory-mapped variables are left as they are, since casting them would load them into memory.
+
+        Parameters
+        ----------
+        variables : list, optional
+            Variables to cast, defaults to all variables with data
+        """
+        if self.float_dtype is None:
+            return
+        if variables is None:
+            variables = [self[var_name] for var_name in self.get_vars(have_data=True)]
+        for variable in variables:
+            if variable.name == 'time' or isinstance(variable.data, np.memmap):
+                continue
+            if variable.data.dtype.kind in 'fiu':
+                variable.data = variable.data.astype(self.float_dtype, copy=False)
+
 
     def _init_variable(self, var: str, cmap, units, vmin, vmax) -> None:
         """
@@ -415,6 +876,7 @@ class Data:
                 depth_bottom=depth_bottom,
                 depth_top=depth_top
             )
+            self._auto_bounds = (self.bounds, bounds_padding)
 
         return self.bounds
 
@@ -444,6 +906,7 @@ class Data:
             raise AttributeError(f"The variable '{variable.name}' already exists.")
         else:
             # Add to custom_variables and dynamically create the attribute
+            self._apply_float_dtype([variable])
             self.custom_variables[variable.name] = variable
             setattr(self, variable.name, variable)
 
@@ -460,4 +923,26 @@ class Data:
         if variable_name in self.custom_variables:
             del self.custom_variables[variable_name]
         else:
-            raise KeyError(f"Variable '{variable_name}' not found in custom variables. Must be one of {self.custom_variables.keys()}")
\ No newline at end of file
+            raise KeyError(f"Variable '{variable_name}' not found in custom variables. Must be one of {self.custom_variables.keys()}")
+
+
+def _to_json_number(value):
+    """Convert numpy scalars to Python numbers so they can be written as JSON."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _get_cmap_name(cmap) -> str|None:
+    """Registry name of a colormap, cmocean colormaps are prefixed with 'cmo.' as matplotlib registers them."""
+    name = getattr(cmap, 'name', None)
+    if name is not None and cmocean.cm.cmap_d.get(name) is cmap:
+        return f'cmo.{name}'
+    return name
+
+
+def _get_cmap(name:str|None):
+    """Look up a colormap saved by name in cmocean's or matplotlib's registry, None if it is not registered."""
+    if name is None:
+        return None
+    if name.startswith('cmo.') and name[4:] in cmocean.cm.cmap_d:
+        return cmocean.cm.cmap_d[name[4:]]
+    return matplotlib.colormaps[name] if name in matplotlib.colormaps else None
@@ -1,12 +1,27 @@
-from attrs import define,field,asdict
+from attrs import define,field,setters
 from matplotlib.colors import Colormap
-from typing import Iterable
+from typing import Iterable,ClassVar
 import numpy as np
 from pprint import pformat
 from datetime import datetime
+import itertools
 
 from gerg_plotting.modules.validations import is_flat_numpy_array
-from gerg_plotting.modules.utilities import to_numpy_array
+from gerg_plotting.modules.utilities import to_numpy_array,get_field_names,get_field_set,is_lazy_array,iter_chunks
+from gerg_plotting.modules.calculations import get_percentile_limits
+from gerg_plotting.data_classes.quantile_sketch import QuantileSketch
+
+
+# Process-wide source of data version stamps, so no two data assignments share a version
+_versions = itertools.count()
+
+
+def _reset_limits(instance, attribute, value):
+    """Clear the cached color limits and the quantile sketch describing the old data and stamp a new version when the data of a Variable is reassigned."""
+    instance._limits = None
+    instance._sketch = None
+    instance._version = next(_versions)
+    return value
 
 
 @define
@@ -28,9 +43,9 @@ class Variable():
     units : str, optional
         Units of measurement
     vmin : float, optional
-        Minimum value for visualization scaling
+        Minimum value for visualization scaling, computed lazily from the data if not set
     vmax : float, optional
-        Maximum value for visualization scaling
+        Maximum value for visualization scaling, computed lazily from the data if not set
     label : str, optional
         Custom label for plotting
 
@@ -50,19 +65,110 @@ class Variable():
         Maximum value for visualization
     label : str
         Display label for plots
+    approx_limits_threshold : int or None
+        Class-level setting, when set, vmin and vmax of arrays with more elements than this
+        are approximated from an evenly strided sample of about this many elements
+    sketch : QuantileSketch or None
+        Streaming quantile sketch built with ``update_sketch`` or ``merge_sketch``,
+        when set it is used instead of the data to compute vmin and vmax
+    version : int
+        Stamp of the data, renewed whenever data is assigned, reassign data changed in place
+        (``variable.data = variable.data``) to renew it
     """
-    data:np.ndarray = field(converter=to_numpy_array,validator=is_flat_numpy_array)
+    data:np.ndarray = field(converter=to_numpy_array,validator=is_flat_numpy_array,
+                            on_setattr=[setters.convert,setters.validate,_reset_limits])
     name:str
     cmap:Colormap = field(default=None)
     units:str = field(default=None)  # Turn off units by passing/assigning to None
-    vmin:float = field(default=None)
-    vmax:float = field(default=None)
+    _vmin:float = field(default=None)  # Passed as vmin, None means computed from the data
+    _vmax:float = field(default=None)  # Passed as vmax, None means computed from the data
     label:str = field(default=None)  # Set label to be used on figure and axes, use if desired
+    _limits:tuple = field(default=None,init=False,repr=False,eq=False)  # Cached (vmin, vmax) computed from the data
+    _sketch:QuantileSketch = field(default=None,init=False,repr=False,eq=False)  # Streaming quantile sketch, used for the limits when set
+    _version:int = field(factory=lambda: next(_versions),init=False,repr=False,eq=False)  # Stamp of the data, renewed when it is assigned
+
+    approx_limits_threshold: ClassVar[int|None] = None
+
+
+    @property
+    def vmin(self) -> float|None:
+        """Minimum value for visualization, the 1st percentile of the data unless set."""
+        if self._vmin is None:
+            return self._get_auto_limits()[0]
+        return self._vmin
+
+    @vmin.setter
+    def vmin(self, value) -> None:
+        self._vmin = value
+
+    @property
+    def vmax(self) -> float|None:
+        """Maximum value for visualization, the 99th percentile of the data unless set."""
+        if self._vmax is None:
+            return self._get_auto_limits()[1]
+        return self._vmax
+
+    @vmax.setter
+    def vmax(self, value) -> None:
+        self._vmax = value
+
+    @property
+    def version(self) -> int:
+        """Stamp of the data, renewed whenever data is assigned."""
+        return self._version
+
+    @property
+    def sketch(self) -> QuantileSketch|None:
+        """Streaming quantile sketch used for the color limits, if any."""
+        return self._sketch
 
+    def _get_auto_limits(self) -> tuple:
+        """Compute the color limits from the sketch or the data on first use and cache them."""
+        if self.name == 'time':  # do not calculate vmin and vmax for time
+            return None, None
+        if self._limits is None:
+            if self._sketch is not None:
+                self._limits = tuple(self._sketch.quantile([0.01, 0.99]))
+            elif is_lazy_array(self.data):
+                # Stream memory-mapped or chunked data through a sketch instead of loading it
+                sketch = QuantileSketch()
+                for chunk in iter_chunks(self.data):
+                    sketch.update(chunk)
+                self._limits = tuple(sketch.quantile([0.01, 0.99]))
+            else:
+                self._limits = get_percentile_limits(self.data, sample_size=self.approx_limits_threshold)
+        return self._limits
 
-    def __attrs_post_init__(self) -> None:
-        """Inittializes vmin and vmax if not set"""
-        self.get_vmin_vmax()
+    def update_sketch(self, values) -> None:
+        """
+        Feed a chunk of values to the quantile sketch used for the color limits.
+
+        Lets vmin and vmax be computed in one streaming pass over data that is read in chunks,
+        for example from memory-mapped files, with bounded memory.
+
+        Parameters
+        ----------
+        values : array_like
+            Chunk of values
+        """
+        if self._sketch is None:
+            self._sketch = QuantileSketch()
+        self._sketch.update(values)
+        self._limits = None
+
+    def merge_sketch(self, sketch: QuantileSketch) -> None:
+        """
+        Merge a quantile sketch, for example one built from another file, into the sketch used for the color limits.
+
+        Parameters
+        ----------
+        sketch : QuantileSketch
+            Sketch to merge
+        """
+        if self._sketch is None:
+            self._sketch = QuantileSketch(k=sketch.k)
+        self._sketch.merge(sketch)
+        self._limits = None
 
 
     def _has_var(self, key):
@@ -79,7 +185,7 @@ class Variable():
         bool
             True if attribute exists
         """
-        return key in asdict(self).keys()
+        return key in get_field_set(type(self))
     
 
     def __getitem__(self, key):
@@ -114,8 +220,9 @@ class Variable():
         attrs = self.get_attrs()
         attrs.remove('data')
         
-        # Calculate width needed for data column
-        sample_data = [self._format_value(x) for x in self.data[:5]]
+        # Calculate width needed for data column, only reading the values that are shown
+        head = np.asarray(self.data[:5])
+        sample_data = [self._format_value(x) for x in head]
         max_data_width = max(len(str(x)) for x in sample_data) if sample_data else 0
         # Add padding and constrain between min and max values
         data_width = min(max(max_data_width * 8, 100), 200)  # Min 100px, Max 200px
@@ -144,11 +251,11 @@ class Variable():
         html += f'''<tr><td colspan="2" style="text-align:center"><strong>Data</strong></td></tr>'''
         
         # Add data values with indices
-        for i in range(min(5, len(self.data))):
+        for i in range(len(head)):
             html += f'''
             <tr>
                 <td style="padding-right:10px;width:80px;white-space:nowrap;overflow:hidden;text-overflow:ellipsis"><strong>{i}</strong></td>
-                <td style="text-align:left;width:{data_width}px;white-space:nowrap;overflow:hidden;text-overflow:ellipsis">{self._format_value(self.data[i])}</td>
+                <td style="text-align:left;width:{data_width}px;white-space:nowrap;overflow:hidden;text-overflow:ellipsis">{self._format_value(head[i])}</td>
             </tr>
             '''
         
@@ -161,7 +268,7 @@ class Variable():
 
     def __repr__(self) -> None:
         '''Pretty printing'''
-        return pformat(asdict(self), indent=1,width=2,compact=True,depth=1)
+        return pformat({attr: getattr(self, attr) for attr in self.get_attrs()}, indent=1,width=2,compact=True,depth=1)
 
 
     def get_attrs(self) -> list:
@@ -173,7 +280,7 @@ class Variable():
         list
             List of attribute names
         """
-        return list(asdict(self).keys())
+        return list(get_field_names(type(self)))
     
 
     def get_vmin_vmax(self,ignore_existing:bool=False) -> None:
@@ -182,17 +289,20 @@ class Variable():
 
         Uses 1st and 99th percentiles of the data to set visualization bounds,
         excluding time variables.
+        The percentiles are otherwise computed on first access of vmin or vmax,
+        and recomputed after the data is reassigned.
 
         Parameters
         ----------
         ignore_existing : bool, optional
-            If True, recalculate bounds even if they exist
+            If True, recalculate bounds from the data even if they exist or a quantile sketch is set
         """
-        if self.name != 'time':  # do not calculate vmin and vmax for time
-            if self.vmin is None or ignore_existing:
-                self.vmin = np.nanpercentile(self.data, 1)  # 1st percentile (lower 1%)
-            if self.vmax is None or ignore_existing:
-                self.vmax = np.nanpercentile(self.data, 99)  # 99th percentile (upper 1%)
+        if ignore_existing:
+            self._vmin = None
+            self._vmax = None
+            self._limits = None
+            self._sketch = None
+        self._get_auto_limits()
 
     def reset_label(self) -> None:
         """Reset the label to the variable name."""
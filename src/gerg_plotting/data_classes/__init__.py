@@ -3,3 +3,4 @@ from gerg_plotting.data_classes.bathy import Bathy
 from gerg_plotting.data_classes.variable import Variable
 from gerg_plotting.data_classes.bounds import Bounds
 from gerg_plotting.data_classes.data import Data
+from gerg_plotting.data_classes.quantile_sketch import QuantileSketch
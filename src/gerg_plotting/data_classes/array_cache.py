@@ -0,0 +1,152 @@
+import copy
+import threading
+from collections import OrderedDict
+import numpy as np
+from attrs import define,field
+
+
+@define
+class ArrayCache:
+    """
+    Memory-capped least recently used cache of numpy arrays.
+
+    Entries are tuples of arrays that are made read-only when stored, so every consumer
+    can share them without copying. When the total size of the entries exceeds ``max_bytes``
+    the least recently used entries are evicted.
+
+    Attributes
+    ----------
+    max_bytes : int
+        Maximum total size of the cached arrays in bytes, default is 256 MiB
+    hits : int
+        Number of lookups that found an entry
+    misses : int
+        Number of lookups that did not find an entry
+    evictions : int
+        Number of entries evicted to stay under ``max_bytes``
+    """
+    max_bytes: int = field(default=256 * 2**20)
+    hits: int = field(default=0)
+    misses: int = field(default=0)
+    evictions: int = field(default=0)
+    _entries: OrderedDict = field(factory=OrderedDict, init=False, repr=False, eq=False)
+    _nbytes: int = field(default=0, init=False)
+    _lock: threading.Lock = field(factory=threading.Lock, init=False, repr=False, eq=False)
+
+
+    @property
+    def nbytes(self) -> int:
+        """Total size of the cached arrays in bytes."""
+        return self._nbytes
+
+
+    def __len__(self) -> int:
+        """Number of cached entries."""
+        return len(self._entries)
+
+
+    def get(self, key) -> tuple|None:
+        """
+        Look up an entry and mark it as most recently used.
+
+        Parameters
+        ----------
+        key : hashable
+            Key of the entry
+
+        Returns
+        -------
+        tuple or None
+            The cached arrays, or None if the key is not cached
+        """
+        with self._lock:
+            arrays = self._entries.get(key)
+            if arrays is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return arrays
+
+
+    def put(self, key, arrays:tuple) -> tuple:
+        """
+        Store read-only arrays under a key, evicting the least recently used entries when over ``max_bytes``.
+
+        Entries larger than ``max_bytes`` on their own are not stored.
+
+        Parameters
+        ----------
+        key : hashable
+            Key of the entry
+        arrays : tuple
+            Arrays to cache, they are made read-only
+
+        Returns
+        -------
+        tuple
+            The arrays as stored
+        """
+        for array in arrays:
+            if isinstance(array, np.ndarray):
+                array.flags.writeable = False
+        nbytes = self._entry_nbytes(arrays)
+        if nbytes > self.max_bytes:
+            return arrays
+        with self._lock:
+            if key in self._entries:
+                self._nbytes -= self._entry_nbytes(self._entries.pop(key))
+            self._entries[key] = arrays
+            self._nbytes += nbytes
+            while self._nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._nbytes -= self._entry_nbytes(evicted)
+                self.evictions += 1
+        return arrays
+
+
+    @staticmethod
+    def _entry_nbytes(arrays:tuple) -> int:
+        """Total size of the arrays of an entry."""
+        return sum(array.nbytes for array in arrays if isinstance(array, np.ndarray))
+
+
+    def info(self) -> dict:
+        """
+        Get the statistics of the cache.
+
+        Returns
+        -------
+        dict
+            Hits, misses, evictions, number of entries, size in bytes and the size cap
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'entries': len(self), 'nbytes': self.nbytes, 'max_bytes': self.max_bytes}
+
+
+    def clear(self) -> None:
+        """Remove every entry and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+
+    def __getstate__(self) -> dict:
+        """Pickle the size cap only, locks cannot be pickled and the entries are cheap to recompute."""
+        return {'max_bytes': self.max_bytes}
+
+
+    def __setstate__(self, state:dict) -> None:
+        """Restore an empty cache with a lock of its own."""
+        self.__init__(max_bytes=state['max_bytes'])
+
+
+    def __deepcopy__(self, memo) -> 'ArrayCache':
+        """Copy the entries into a new cache with a lock of its own, the statistics start over."""
+        cache = ArrayCache(max_bytes=self.max_bytes)
+        with self._lock:
+            entries = copy.deepcopy(self._entries, memo)
+        for key, arrays in entries.items():
+            cache.put(key, arrays)
+        return cache
@@ -0,0 +1,124 @@
+import numpy as np
+from attrs import define,field
+
+
+@define
+class ColumnStore:
+    """
+    Contiguous columnar storage for the row-aligned variables of a Data object.
+
+    Columns that share a dtype are packed into one 2D block of shape (n_columns, n_rows),
+    so every column is a contiguous view into its block and all columns are guaranteed
+    to share the same number of rows.
+    Selecting rows with a slice returns views, while selecting rows with an index array
+    or a boolean mask gathers each block once instead of once per column.
+
+    Attributes
+    ----------
+    blocks : dict
+        2D arrays keyed by dtype, one row per column
+    layout : dict
+        Column names stored in each block, keyed by dtype
+    columns : dict
+        Views into ``blocks`` keyed by column name
+    """
+    blocks: dict = field(factory=dict)
+    layout: dict = field(factory=dict)
+    columns: dict = field(factory=dict)
+
+
+    @classmethod
+    def from_arrays(cls, arrays: dict) -> 'ColumnStore':
+        """
+        Pack flat arrays into contiguous blocks grouped by dtype.
+
+        Parameters
+        ----------
+        arrays : dict
+            Flat numpy arrays keyed by column name
+
+        Returns
+        -------
+        ColumnStore
+            Store holding a packed copy of the arrays
+
+        Raises
+        ------
+        ValueError
+            If the arrays do not all have the same length
+        """
+        lengths = {name: len(values) for name, values in arrays.items()}
+        if len(set(lengths.values())) > 1:
+            raise ValueError(f"All columns must have the same length, got {lengths}")
+        n_rows = next(iter(lengths.values()), 0)
+
+        # Group the columns by dtype so each group can share one block
+        layout = {}
+        for name, values in arrays.items():
+            layout.setdefault(values.dtype, []).append(name)
+
+        blocks = {}
+        for dtype, names in layout.items():
+            block = np.empty((len(names), n_rows), dtype=dtype)
+            for idx, name in enumerate(names):
+                block[idx] = arrays[name]
+            blocks[dtype] = block
+
+        return cls(blocks=blocks, layout=layout, columns=cls._column_views(blocks, layout))
+
+
+    @staticmethod
+    def _column_views(blocks: dict, layout: dict) -> dict:
+        """Create the per-column views into each block."""
+        return {name: blocks[dtype][idx] for dtype, names in layout.items() for idx, name in enumerate(names)}
+
+
+    def __len__(self) -> int:
+        """Number of rows shared by all columns."""
+        if not self.blocks:
+            return 0
+        return next(iter(self.blocks.values())).shape[1]
+
+
+    def __contains__(self, name) -> bool:
+        """Checks if a column exists in the store."""
+        return name in self.columns
+
+
+    def owns(self, name: str, values: np.ndarray) -> bool:
+        """
+        Check that an array is still the stored view for a column.
+
+        Parameters
+        ----------
+        name : str
+            Name of the column
+        values : np.ndarray
+            Array currently assigned to the variable
+
+        Returns
+        -------
+        bool
+            True if the array is the column view held by this store
+        """
+        if name not in self.columns or values is not self.columns[name]:
+            return False
+        return np.may_share_memory(values, self.blocks[values.dtype])
+
+
+    def take(self, key) -> 'ColumnStore':
+        """
+        Select rows from every column at once.
+
+        Parameters
+        ----------
+        key : slice | np.ndarray
+            Slice, integer index array or boolean mask selecting rows
+
+        Returns
+        -------
+        ColumnStore
+            New store whose columns are views for slices, or one gathered copy per block otherwise
+        """
+        blocks = {dtype: block[:, key] for dtype, block in self.blocks.items()}
+        return ColumnStore(blocks=blocks, layout=self.layout, columns=self._column_views(blocks, self.layout))
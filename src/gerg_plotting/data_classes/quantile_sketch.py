@@ -0,0 +1,140 @@
+import math
+import numpy as np
+from attrs import define,field
+
+
+@define
+class QuantileSketch:
+    """
+    Mergeable streaming quantile sketch (KLL) with bounded memory.
+
+    Values are fed in chunks with ``update`` and sketches built from different files can be
+    combined with ``merge``, so quantiles of data that never fits in memory at once
+    can be estimated in a single pass.
+    Memory grows only with the logarithm of the number of values seen.
+
+    Attributes
+    ----------
+    k : int
+        Accuracy parameter, larger values give more accurate quantiles at the cost of memory, default is 200
+    seed : int or None
+        Seed for the random compaction offsets, default is 0 for reproducible results
+    compactors : list
+        Sorted buffers of retained values, values at level ``h`` carry a weight of ``2**h``
+    count : int
+        Number of non-NaN values fed to the sketch
+    """
+    k: int = field(default=200)
+    seed: int | None = field(default=0)
+    compactors: list = field(factory=list)
+    count: int = field(default=0)
+    _rng: np.random.Generator = field(init=False, repr=False, eq=False)
+
+
+    def __attrs_post_init__(self) -> None:
+        """Initialize the random generator used for compaction."""
+        self._rng = np.random.default_rng(self.seed)
+
+
+    @property
+    def size(self) -> int:
+        """Number of values retained by the sketch."""
+        return sum(len(compactor) for compactor in self.compactors)
+
+
+    def _capacity(self, level: int) -> int:
+        """Capacity of a level, shrinking geometrically below the top level."""
+        depth = len(self.compactors) - level - 1
+        return max(2, math.ceil(self.k * (2 / 3) ** depth))
+
+
+    def _compress(self) -> None:
+        """Compact every level that is over capacity, promoting half of its values."""
+        level = 0
+        while level < len(self.compactors):
+            if len(self.compactors[level]) > self._capacity(level):
+                if level + 1 == len(self.compactors):
+                    self.compactors.append(np.empty(0))
+                values = np.sort(self.compactors[level])
+                # An odd value out stays at this level
+                keep = values[len(values) - len(values) % 2:]
+                offset = self._rng.integers(2)
+                promoted = values[offset:len(values) - len(keep):2]
+                self.compactors[level] = keep
+                self.compactors[level + 1] = np.concatenate([self.compactors[level + 1], promoted])
+            level += 1
+
+
+    def update(self, values) -> 'QuantileSketch':
+        """
+        Feed a chunk of values to the sketch, NaNs are ignored.
+
+        Parameters
+        ----------
+        values : array_like
+            Chunk of values
+
+        Returns
+        -------
+        QuantileSketch
+            The updated sketch
+        """
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return self
+        if not self.compactors:
+            self.compactors.append(np.empty(0))
+        self.compactors[0] = np.concatenate([self.compactors[0], values])
+        self.count += values.size
+        self._compress()
+        return self
+
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        """
+        Merge another sketch into this one.
+
+        Parameters
+        ----------
+        other : QuantileSketch
+            Sketch built from other values, for example another file
+
+        Returns
+        -------
+        QuantileSketch
+            The merged sketch
+        """
+        for level, compactor in enumerate(other.compactors):
+            if level == len(self.compactors):
+                self.compactors.append(np.empty(0))
+            self.compactors[level] = np.concatenate([self.compactors[level], compactor])
+        self.count += other.count
+        self._compress()
+        return self
+
+
+    def quantile(self, q) -> float | np.ndarray:
+        """
+        Estimate quantiles of all values fed to the sketch.
+
+        Parameters
+        ----------
+        q : float or array_like
+            Quantile or quantiles to estimate, between 0 and 1
+
+        Returns
+        -------
+        float or np.ndarray
+            Estimated quantile values, NaN if the sketch is empty
+        """
+        q = np.asarray(q, dtype=float)
+        if self.count == 0:
+            return np.full(q.shape, np.nan) if q.ndim else np.nan
+        values = np.concatenate(self.compactors)
+        weights = np.concatenate([np.full(len(compactor), 2 ** level) for level, compactor in enumerate(self.compactors)])
+        order = np.argsort(values)
+        values, cumulative = values[order], np.cumsum(weights[order])
+        idx = np.searchsorted(cumulative, q * cumulative[-1], side='left')
+        result = values[np.clip(idx, 0, len(values) - 1)]
+        return result if q.ndim else float(result)
@@ -0,0 +1,313 @@
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+from pathlib import Path
+from attrs import define,field
+
+from gerg_plotting.modules.calculations import coarsen_mean
+
+
+@define
+class TileStore:
+    """
+    Tiled, memory-mapped store for a 2D grid such as bathymetry.
+
+    The grid is split into square tiles saved as ``.npy`` files in a directory,
+    with the coordinates and a ``metadata.json`` file next to them.
+    Tiles are opened as read-only memory maps, so a query only reads the tiles
+    that intersect the requested bounds and repeated queries share the OS page cache.
+
+    Attributes
+    ----------
+    path : Path
+        Directory holding the tiles
+    lat : np.ndarray
+        Ascending latitude coordinates of the grid rows
+    lon : np.ndarray
+        Ascending longitude coordinates of the grid columns
+    tile_size : int
+        Number of rows and columns in each tile, default is 256
+    attrs : dict
+        Extra metadata saved with the store, for example a description of the source
+    """
+    path: Path = field(converter=Path)
+    lat: np.ndarray
+    lon: np.ndarray
+    tile_size: int = field(default=256)
+    attrs: dict = field(factory=dict)
+    _tiles: dict = field(factory=dict, init=False, repr=False, eq=False)  # Opened memory maps keyed by tile index
+
+
+    @classmethod
+    def build(cls, values, lat, lon, path, tile_size:int=256, attrs:dict|None=None) -> 'TileStore':
+        """
+        Write a 2D grid to a new tile store.
+
+        The store is written to a temporary directory first and then moved into place,
+        so a reader never sees a partially written store.
+
+        Parameters
+        ----------
+        values : array_like
+            2D grid with shape (len(lat), len(lon)), may be a lazily loaded xarray DataArray
+        lat : array_like
+            Latitude coordinates of the rows, ascending or descending
+        lon : array_like
+            Longitude coordinates of the columns, ascending or descending
+        path : str or Path
+            Directory to write the store to
+        tile_size : int, optional
+            Number of rows and columns in each tile, default is 256
+        attrs : dict, optional
+            Extra metadata saved with the store
+
+        Returns
+        -------
+        TileStore
+            The opened store
+        """
+        path = Path(path)
+        lat, lon = np.asarray(lat), np.asarray(lon)
+        # Store ascending coordinates so bounds queries are binary searches
+        if len(lat) > 1 and lat[0] > lat[-1]:
+            values, lat = values[::-1], lat[::-1]
+        if len(lon) > 1 and lon[0] > lon[-1]:
+            values, lon = values[:, ::-1], lon[::-1]
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = Path(tempfile.mkdtemp(prefix=f'.{path.name}.', dir=path.parent))
+        for i in range(0, len(lat), tile_size):
+            for j in range(0, len(lon), tile_size):
+                tile = np.ascontiguousarray(values[i:i + tile_size, j:j + tile_size])
+                np.save(temp_path / f'{i // tile_size}_{j // tile_size}.npy', tile)
+        np.save(temp_path / 'lat.npy', lat)
+        np.save(temp_path / 'lon.npy', lon)
+        with open(temp_path / 'metadata.json', 'w') as f:
+            json.dump({'tile_size': tile_size, 'attrs': attrs or {}}, f)
+        try:
+            os.replace(temp_path, path)
+        except OSError:
+            # Another process finished building the same store first
+            shutil.rmtree(temp_path, ignore_errors=True)
+        return cls.open(path)
+
+
+    @classmethod
+    def open(cls, path) -> 'TileStore':
+        """
+        Open an existing tile store.
+
+        Parameters
+        ----------
+        path : str or Path
+            Directory holding the store
+
+        Returns
+        -------
+        TileStore
+            The opened store
+
+        Raises
+        ------
+        FileNotFoundError
+            If the directory does not hold a complete store
+        """
+        path = Path(path)
+        with open(path / 'metadata.json') as f:
+            metadata = json.load(f)
+        return cls(path=path, lat=np.load(path / 'lat.npy'), lon=np.load(path / 'lon.npy'),
+                   tile_size=metadata['tile_size'], attrs=metadata['attrs'])
+
+
+    def _tile(self, i:int, j:int) -> np.ndarray:
+        """Get the memory map of a tile, opening it on first use."""
+        if (i, j) not in self._tiles:
+            self._tiles[(i, j)] = np.load(self.path / f'{i}_{j}.npy', mmap_mode='r')
+        return self._tiles[(i, j)]
+
+
+    def read(self, lat_min=None, lat_max=None, lon_min=None, lon_max=None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Read the part of the grid inside the bounds, the bounds are inclusive and None leaves a side open.
+
+        Parameters
+        ----------
+        lat_min, lat_max, lon_min, lon_max : float or None
+            Bounds of the query
+
+        Returns
+        -------
+        tuple of np.ndarray
+            Latitude, longitude and the 2D grid values inside the bounds
+        """
+        row_start = 0 if lat_min is None else int(np.searchsorted(self.lat, lat_min, side='left'))
+        row_stop = len(self.lat) if lat_max is None else int(np.searchsorted(self.lat, lat_max, side='right'))
+        col_start = 0 if lon_min is None else int(np.searchsorted(self.lon, lon_min, side='left'))
+        col_stop = len(self.lon) if lon_max is None else int(np.searchsorted(self.lon, lon_max, side='right'))
+        row_stop, col_stop = max(row_start, row_stop), max(col_start, col_stop)
+
+        size = self.tile_size
+        result = None
+        # Copy the intersecting part of each tile that overlaps the query
+        for i in range(row_start // size, -(-row_stop // size)):
+            for j in range(col_start // size, -(-col_stop // size)):
+                tile = self._tile(i, j)
+                if result is None:
+                    result = np.empty((row_stop - row_start, col_stop - col_start), dtype=tile.dtype)
+                rows = slice(max(row_start, i * size), min(row_stop, (i + 1) * size))
+                cols = slice(max(col_start, j * size), min(col_stop, (j + 1) * size))
+                result[rows.start - row_start:rows.stop - row_start, cols.start - col_start:cols.stop - col_start] = \
+                    tile[rows.start - i * size:rows.stop - i * size, cols.start - j * size:cols.stop - j * size]
+        if result is None:
+            result = np.empty((row_stop - row_start, col_stop - col_start), dtype=self._tile(0, 0).dtype)
+        return self.lat[row_start:row_stop], self.lon[col_start:col_stop], result
+
+
+@define
+class TilePyramid:
+    """
+    Multi-resolution stack of tile stores built from one 2D grid.
+
+    Level 0 holds the full resolution grid and every following level averages 2x2 blocks
+    of the level before it, so level ``k`` is coarsened by a factor of ``2**k``.
+    Choosing the level from the requested bounds and output size means large extents
+    read a few coarse tiles instead of the whole full resolution grid.
+
+    Attributes
+    ----------
+    path : Path
+        Directory holding one subdirectory per level
+    levels : list[TileStore]
+        Stores ordered from full to coarsest resolution
+    attrs : dict
+        Extra metadata saved with the pyramid, for example a description of the source
+    """
+    path: Path = field(converter=Path)
+    levels: list = field(factory=list)
+    attrs: dict = field(factory=dict)
+
+
+    @classmethod
+    def build(cls, values, lat, lon, path, tile_size:int=256, min_size:int=256, attrs:dict|None=None) -> 'TilePyramid':
+        """
+        Write a 2D grid and its overviews to a new pyramid.
+
+        Levels are added until the larger dimension of a level is at most ``min_size``.
+
+        Parameters
+        ----------
+        values : array_like
+            2D grid with shape (len(lat), len(lon)), may be a lazily loaded xarray DataArray
+        lat : array_like
+            Latitude coordinates of the rows
+        lon : array_like
+            Longitude coordinates of the columns
+        path : str or Path
+            Directory to write the pyramid to
+        tile_size : int, optional
+            Number of rows and columns in each tile, default is 256
+        min_size : int, optional
+            Size of the larger dimension at which to stop adding levels, default is 256
+        attrs : dict, optional
+            Extra metadata saved with the pyramid
+
+        Returns
+        -------
+        TilePyramid
+            The opened pyramid
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = Path(tempfile.mkdtemp(prefix=f'.{path.name}.', dir=path.parent))
+        store = TileStore.build(values, lat, lon, temp_path / 'level_0', tile_size=tile_size)
+        n_levels = 1
+        while max(len(store.lat), len(store.lon)) > min_size and min(len(store.lat), len(store.lon)) >= 2:
+            lat, lon, values = store.read()
+            values = coarsen_mean(coarsen_mean(values, 2, axis=0), 2, axis=1)
+            store = TileStore.build(values, coarsen_mean(lat, 2), coarsen_mean(lon, 2),
+                                    temp_path / f'level_{n_levels}', tile_size=tile_size)
+            n_levels += 1
+        with open(temp_path / 'metadata.json', 'w') as f:
+            json.dump({'n_levels': n_levels, 'attrs': attrs or {}}, f)
+        try:
+            os.replace(temp_path, path)
+        except OSError:
+            # Another process finished building the same pyramid first
+            shutil.rmtree(temp_path, ignore_errors=True)
+        return cls.open(path)
+
+
+    @classmethod
+    def open(cls, path) -> 'TilePyramid':
+        """
+        Open an existing pyramid.
+
+        Parameters
+        ----------
+        path : str or Path
+            Directory holding the pyramid
+
+        Returns
+        -------
+        TilePyramid
+            The opened pyramid
+
+        Raises
+        ------
+        FileNotFoundError
+            If the directory does not hold a complete pyramid
+        """
+        path = Path(path)
+        with open(path / 'metadata.json') as f:
+            metadata = json.load(f)
+        if 'n_levels' not in metadata:
+            raise FileNotFoundError(f'{path} does not hold a tile pyramid')
+        levels = [TileStore.open(path / f'level_{level}') for level in range(metadata['n_levels'])]
+        return cls(path=path, levels=levels, attrs=metadata['attrs'])
+
+
+    def select_level(self, lat_min=None, lat_max=None, lon_min=None, lon_max=None, target_size:int=1000) -> int:
+        """
+        Choose the coarsest level that still has at least ``target_size`` cells across the bounds.
+
+        Parameters
+        ----------
+        lat_min, lat_max, lon_min, lon_max : float or None
+            Bounds of the query
+        target_size : int, optional
+            Number of cells wanted across the larger dimension of the bounds, for example the width of the figure in pixels
+
+        Returns
+        -------
+        int
+            Index of the level to read
+        """
+        full = self.levels[0]
+        n_rows = np.count_nonzero((full.lat >= (-np.inf if lat_min is None else lat_min)) & (full.lat <= (np.inf if lat_max is None else lat_max)))
+        n_cols = np.count_nonzero((full.lon >= (-np.inf if lon_min is None else lon_min)) & (full.lon <= (np.inf if lon_max is None else lon_max)))
+        n_cells = max(n_rows, n_cols)
+        level = 0
+        while level + 1 < len(self.levels) and n_cells / 2 ** (level + 1) >= target_size:
+            level += 1
+        return level
+
+
+    def read(self, lat_min=None, lat_max=None, lon_min=None, lon_max=None, level:int=0) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Read the part of a level inside the bounds, the bounds are inclusive and None leaves a side open.
+
+        Parameters
+        ----------
+        lat_min, lat_max, lon_min, lon_max : float or None
+            Bounds of the query
+        level : int, optional
+            Level to read, default is 0, the full resolution
+
+        Returns
+        -------
+        tuple of np.ndarray
+            Latitude, longitude and the 2D grid values inside the bounds
+        """
+        return self.levels[level].read(lat_min=lat_min, lat_max=lat_max, lon_min=lon_min, lon_max=lon_max)
@@ -33,42 +33,98 @@ def get_center_of_mass(lon: np.ndarray, lat: np.ndarray, pressure: np.ndarray) -
     )
 
 
-def get_sigma_theta(salinity, temperature, cnt=False) -> tuple[np.ndarray,np.ndarray,np.ndarray]|tuple[np.ndarray,np.ndarray,np.ndarray,np.ndarray]:
+def get_percentile_limits(values, percentiles=(1, 99), sample_size: int | None = None) -> tuple[float, float]:
+    """
+    Compute lower and upper percentiles of an array in a single pass, ignoring NaNs.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Array to compute the percentiles of
+    percentiles : tuple, optional
+        Lower and upper percentiles, default is (1, 99)
+    sample_size : int or None, optional
+        If set and the array has more elements, the percentiles are approximated
+        from an evenly strided sample of about this many elements
+
+    Returns
+    -------
+    tuple[float, float]
+        The lower and upper percentile values
+    """
+    if sample_size is not None and values.size > sample_size:
+        step = -(-values.size // sample_size)  # Ceiling division
+        values = values[::step]
+    lower, upper = np.nanpercentile(values, percentiles)
+    return lower, upper
+
+
+def coarsen_mean(values: np.ndarray, factor: int, axis: int = 0) -> np.ndarray:
+    """
+    Average non-overlapping blocks of ``factor`` elements along an axis, ignoring NaNs.
+
+    Trailing elements that do not fill a whole block are dropped,
+    matching ``xarray``'s ``coarsen(..., boundary='trim').mean()``.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Array to coarsen
+    factor : int
+        Number of elements averaged into each block
+    axis : int, optional
+        Axis to coarsen along, default is 0
+
+    Returns
+    -------
+    np.ndarray
+        Coarsened array
+    """
+    values = np.moveaxis(np.asarray(values), axis, 0)
+    n_blocks = values.shape[0] // factor
+    blocks = values[:n_blocks * factor].reshape((n_blocks, factor) + values.shape[1:])
+    with np.errstate(invalid='ignore'):
+        # Blocks that are all NaN average to NaN without a warning
+        sums = np.nansum(blocks, axis=1)
+        counts = np.sum(~np.isnan(blocks), axis=1)
+        result = (sums / counts).astype(np.result_type(values.dtype, np.float32), copy=False)
+    return np.moveaxis(result, 0, axis)
+
+
+def get_sigma_theta(salinity, temperature, cnt=False, grid_size: int = 200) -> tuple[np.ndarray,np.ndarray,np.ndarray]|tuple[np.ndarray,np.ndarray,np.ndarray,np.ndarray]:
     """
     Computes sigma_theta on a grid of temperature and salinity data.
+
+    The grid spans the range of the data padded by one unit on each side with ``grid_size`` points
+    along each axis, independent of the number of data points, which is plenty for smooth isopycnal contours.
+    Only salinity and temperature pairs where both values are present set the range.
     
     Args:
         salinity (np.ndarray): Array of salinity values.
         temperature (np.ndarray): Array of temperature values.
         cnt (bool): Whether to return a linear range of sigma_theta values.
+        grid_size (int): Number of grid points along each axis, default is 200.
     
     Returns:
         tuple: Meshgrid of salinity and temperature, calculated sigma_theta, 
                and optionally a linear range of sigma_theta values.
     """
-    # Determine target sample size
-    num_points = len(temperature)
-    target_points = min(10_000, num_points)
-    downsample_factor = max(1, num_points // target_points)
-
-    # Downsample if necessary
-    salinity = salinity[::downsample_factor]
-    temperature = temperature[::downsample_factor]
+    salinity, temperature = np.asarray(salinity, dtype=float), np.asarray(temperature, dtype=float)
 
-    # Remove NaNs from the arrays
-    salinity, temperature = salinity[~np.isnan(salinity)], temperature[~np.isnan(temperature)]
+    # Skip pairs with a NaN in either array so the values stay aligned, without copying the valid pairs
+    valid = ~(np.isnan(salinity) | np.isnan(temperature))
 
     # Calculate grid boundaries and mesh
-    mint, maxt = np.min(temperature), np.max(temperature)
-    mins, maxs = np.min(salinity), np.max(salinity)
-    tempL, salL = np.linspace(mint - 1, maxt + 1, target_points), np.linspace(mins - 1, maxs + 1, target_points)
+    mint, maxt = np.min(temperature, where=valid, initial=np.inf), np.max(temperature, where=valid, initial=-np.inf)
+    mins, maxs = np.min(salinity, where=valid, initial=np.inf), np.max(salinity, where=valid, initial=-np.inf)
+    tempL, salL = np.linspace(mint - 1, maxt + 1, grid_size), np.linspace(mins - 1, maxs + 1, grid_size)
     Tg, Sg = np.meshgrid(tempL, salL)
 
     # Calculate density
     sigma_theta = gsw.sigma0(Sg, Tg)
 
     # Optionally, return a linear range of sigma_theta values
-    return (Sg, Tg, sigma_theta, np.linspace(sigma_theta.min(), sigma_theta.max(), target_points)) if cnt else (Sg, Tg, sigma_theta)
+    return (Sg, Tg, sigma_theta, np.linspace(sigma_theta.min(), sigma_theta.max(), grid_size)) if cnt else (Sg, Tg, sigma_theta)
 
 
 def get_density(salinity, temperature) -> np.ndarray:
@@ -0,0 +1,163 @@
+# contours.py
+
+import hashlib
+import os
+from numbers import Integral
+from pathlib import Path
+import numpy as np
+import matplotlib as mpl
+from matplotlib.colors import LogNorm
+from matplotlib.contour import ContourSet
+from matplotlib.path import Path as MplPath
+import contourpy
+
+from gerg_plotting.data_classes.array_cache import ArrayCache
+from gerg_plotting.modules.plotting import get_contour_levels
+
+
+# Process-wide cache of contour paths shared by every figure
+contour_cache = ArrayCache()
+
+# Bounds of the extended regions of filled contours, as used by matplotlib
+_EXTEND_LOWER, _EXTEND_UPPER = -1e250, 1e250
+
+
+def _get_grid(args) -> tuple:
+    """Split ``[X, Y,] Z [, levels]`` into the coordinates, the grid with invalid values masked and the levels if given."""
+    if len(args) in (1, 2):
+        z, *rest = args
+        z = np.ma.asarray(z)
+        x, y = np.arange(z.shape[1]), np.arange(z.shape[0])
+    elif len(args) in (3, 4):
+        x, y, z, *rest = args
+        x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    else:
+        raise TypeError(f'cached_contour takes from 1 to 4 positional arguments but {len(args)} were given')
+    z = np.ma.masked_invalid(z, copy=False)
+    return x, y, z, rest[0] if rest else None
+
+
+def _grid_hash(x, y, z) -> str:
+    """Hash of the coordinates, values and mask of a grid."""
+    grid_hash = hashlib.sha1()
+    for array in (x, y, z.filled(np.nan), np.ma.getmaskarray(z)):
+        array = np.ascontiguousarray(array)
+        grid_hash.update(repr((array.shape, array.dtype.str)).encode())
+        grid_hash.update(array.tobytes())
+    return grid_hash.hexdigest()
+
+
+def _trace_contours(x, y, z, levels, filled, extend, algorithm, corner_mask) -> tuple:
+    """Trace the contour lines at each level, or the filled regions between levels, as pairs of vertices and codes."""
+    generator = contourpy.contour_generator(x, y, z, name=algorithm, corner_mask=corner_mask,
+                                            line_type=contourpy.LineType.SeparateCode,
+                                            fill_type=contourpy.FillType.OuterCode)
+    if filled:
+        bounds = [_EXTEND_LOWER] * (extend in ('min', 'both')) + list(levels) + [_EXTEND_UPPER] * (extend in ('max', 'both'))
+        lowers, uppers = np.array(bounds[:-1]), np.array(bounds[1:])
+        if float(z.min()) == lowers[0]:
+            # Include the minimum in the lowest region
+            lowers[0] -= 1
+        regions = map(generator.filled, lowers, uppers)
+    else:
+        regions = map(generator.lines, levels)
+    arrays = []
+    for vertices, codes in regions:
+        arrays.append(np.concatenate(vertices) if len(vertices) else np.empty((0, 2)))
+        arrays.append(np.concatenate(codes) if len(codes) else np.empty(0, dtype=MplPath.code_type))
+    return tuple(arrays)
+
+
+def _get_contours(x, y, z, levels, filled, extend, algorithm, corner_mask, cache_dir) -> tuple:
+    """Get the vertices and codes of the contours from the cache, or trace and cache them."""
+    key = repr((_grid_hash(x, y, z), filled, extend, algorithm, corner_mask)).encode() + np.asarray(levels, dtype=float).tobytes()
+    key = hashlib.sha1(key).hexdigest()
+    arrays = contour_cache.get(key)
+    cache_file = None if cache_dir is None else Path(cache_dir) / f'contour_{key}.npz'
+    if arrays is None and cache_file is not None and cache_file.exists():
+        with np.load(cache_file) as npz:
+            arrays = contour_cache.put(key, tuple(npz[f'arr_{i}'] for i in range(len(npz.files))))
+    if arrays is None:
+        arrays = contour_cache.put(key, _trace_contours(x, y, z, levels, filled, extend, algorithm, corner_mask))
+        if cache_file is not None:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so a concurrent reader never sees a partial cache
+            temp_file = cache_file.with_suffix(f'.{os.getpid()}.tmp.npz')
+            np.savez(temp_file, *arrays)
+            os.replace(temp_file, cache_file)
+    return arrays
+
+
+def cached_contour(ax, *args, filled: bool = False, cache_dir=None, **kwargs) -> ContourSet:
+    """
+    Draw contours like ``ax.contour`` or ``ax.contourf``, reusing cached contour paths.
+
+    The paths are traced with contourpy and cached in ``contour_cache`` keyed by a hash of the grid, the levels
+    and the contouring options, so drawing the same grid again, for example the bathymetry of one region on many maps,
+    skips tracing the contours. When ``cache_dir`` is given the paths are also saved to disk and reused by later runs.
+
+    Parameters
+    ----------
+    ax : matplotlib.axes.Axes
+        Axes to draw on, may be a cartopy GeoAxes
+    *args
+        ``[X, Y,] Z [, levels]`` as passed to ``contour``
+    filled : bool, optional
+        Whether to draw filled contours like ``contourf``, default is False
+    cache_dir : str or None, optional
+        Directory where contour paths are cached between runs, default is None for no on-disk cache
+    **kwargs
+        Keyword arguments passed to ``contour``, for example levels, cmap or transform
+
+    Returns
+    -------
+    matplotlib.contour.ContourSet
+        The drawn contours
+    """
+    if isinstance(kwargs.get('norm'), LogNorm) or 'locator' in kwargs:
+        # Logarithmic levels are left to matplotlib
+        return ax.contourf(*args, **kwargs) if filled else ax.contour(*args, **kwargs)
+    x, y, z, levels = _get_grid(args)
+    extend = kwargs.get('extend', 'neither')
+    levels = kwargs.pop('levels', levels)
+    if levels is None or isinstance(levels, Integral):
+        levels = get_contour_levels(z, 7 if levels is None else levels, extend)
+    else:
+        levels = np.asarray(levels, dtype=float)
+    algorithm = kwargs.pop('algorithm', None) or mpl.rcParams['contour.algorithm']
+    corner_mask = kwargs.pop('corner_mask', None)
+    if corner_mask is None:
+        # mpl2005 does not support corner masking
+        corner_mask = False if algorithm == 'mpl2005' else mpl.rcParams['contour.corner_mask']
+    arrays = _get_contours(x, y, z, levels, filled, extend, algorithm, corner_mask, cache_dir)
+    paths = [MplPath(vertices, codes if len(codes) else None) for vertices, codes in zip(arrays[::2], arrays[1::2])]
+
+    # ContourSet takes the contours between the levels, the extended regions of filled contours are added after
+    start = 1 if filled and extend in ('min', 'both') else 0
+    inner = paths[start:start + len(levels) - filled]
+    if not any(len(path.vertices) for path in inner):
+        # Nothing to draw within the levels, matplotlib handles and warns about this case
+        kwargs.update(levels=levels, algorithm=algorithm, corner_mask=corner_mask)
+        return ax.contourf(x, y, z, **kwargs) if filled else ax.contour(x, y, z, **kwargs)
+    if hasattr(ax, 'projection'):
+        # GeoAxes draw in their projection unless told otherwise, like GeoAxes.contour
+        kwargs.setdefault('transform', ax.projection)
+    # ContourSet updates the data limits from the contours before they are transformed, they are set below instead
+    datalim, ignore_existing = ax.dataLim.frozen(), ax.ignore_existing_data_limits
+    contour_set = ContourSet(ax, levels, [[path.vertices] for path in inner], [[path.codes] for path in inner],
+                             filled=filled, **kwargs)
+    ax.dataLim.set(datalim)
+    ax.ignore_existing_data_limits = ignore_existing
+    contour_set.set_paths(paths)
+
+    # Set the data limits from the grid, or from the projected paths on GeoAxes like GeoAxes.contour
+    if hasattr(ax, 'projection'):
+        datalim = contour_set.get_datalim(ax.transData)
+        mins, maxs = (datalim.xmin, datalim.ymin), (datalim.xmax, datalim.ymax)
+    else:
+        mins, maxs = (np.min(x), np.min(y)), (np.max(x), np.max(y))
+    contour_set.sticky_edges.x[:] = mins[0], maxs[0]
+    contour_set.sticky_edges.y[:] = mins[1], maxs[1]
+    ax.update_datalim([mins, maxs])
+    ax.autoscale_view(tight=None if hasattr(ax, 'projection') else True)
+    return contour_set
@@ -4,13 +4,17 @@ import numpy as np
 import pandas as pd
 import xarray as xr
 
+from gerg_plotting.modules.utilities import is_chunked_array
+
 
 def filter_var(var, min_value, max_value) -> np.ndarray:
     """
     Filters values in an iterable or array-like object based on a range.
 
+    Chunked arrays such as dask arrays stay lazy.
+
     Parameters:
-        var (iterable): Input data (e.g., numpy array, pandas Series, xarray DataArray, list).
+        var (iterable): Input data (e.g., numpy array, pandas Series, xarray DataArray, dask array, list).
         min_value (float): Minimum threshold (inclusive).
         max_value (float): Maximum threshold (inclusive).
 
@@ -28,6 +32,9 @@ def filter_var(var, min_value, max_value) -> np.ndarray:
         var = np.where((var >= min_value) & (var <= max_value), var, np.nan)
         if series:
             var = pd.Series(var)
+    elif is_chunked_array(var):
+        # np.where dispatches to the chunked array library, so nothing is computed here
+        var = np.where((var >= min_value) & (var <= max_value), var, np.nan)
     elif isinstance(var, list):
         # Remove elements outside the range for lists
         var = [v if min_value <= v <= max_value else np.nan for v in var]
@@ -41,7 +48,7 @@ def filter_nan(values) -> np.ndarray:
     Removes NaN values from an iterable or array-like object.
 
     Parameters:
-        values (iterable): Input data (e.g., numpy array, pandas Series, xarray DataArray, list).
+        values (iterable): Input data (e.g., numpy array, pandas Series, xarray DataArray, dask array, list).
 
     Returns:
         Same type as input `values` with NaN values removed.
@@ -50,7 +57,7 @@ def filter_nan(values) -> np.ndarray:
         return values.dropna(dim="dim_0")  # Drops NaN along the first dimension
     elif isinstance(values, pd.Series):
         return values.dropna()
-    elif isinstance(values, np.ndarray):
+    elif isinstance(values, np.ndarray) or is_chunked_array(values):
         return values[~np.isnan(values)]
     elif isinstance(values, list):
         return [v for v in values if not (v is None or np.isnan(v))]
@@ -5,6 +5,7 @@ import matplotlib.pyplot as plt
 from matplotlib.colors import ListedColormap
 import matplotlib.axes as maxes
 from matplotlib.colorbar import Colorbar
+from matplotlib.ticker import MaxNLocator
 from matplotlib.colors import ListedColormap
 
 
@@ -42,6 +43,41 @@ def colorbar(fig, divider, mappable, label, nrows=1, total_cbars=2) -> Colorbar:
     return cbar
 
 
+def get_contour_levels(z, n_levels: int, extend: str = 'neither') -> np.ndarray:
+    """
+    Choose contour levels for a grid the same way matplotlib does when contour is given a number of levels.
+
+    Parameters
+    ----------
+    z : array_like
+        Grid to contour, NaNs are ignored
+    n_levels : int
+        Target number of contour levels
+    extend : str, optional
+        'neither', 'min', 'max' or 'both', as passed to contourf, default is 'neither'
+
+    Returns
+    -------
+    np.ndarray
+        Contour levels spanning the data
+    """
+    z = np.ma.masked_invalid(z, copy=False)
+    zmin, zmax = float(z.min()), float(z.max())
+    levels = MaxNLocator(n_levels + 1, min_n_ticks=1).tick_values(zmin, zmax)
+    # Trim excess levels the locator may have supplied
+    under = np.nonzero(levels < zmin)[0]
+    i0 = under[-1] if len(under) else 0
+    over = np.nonzero(levels > zmax)[0]
+    i1 = over[0] + 1 if len(over) else len(levels)
+    if extend in ('min', 'both'):
+        i0 += 1
+    if extend in ('max', 'both'):
+        i1 -= 1
+    if i1 - i0 < 3:
+        i0, i1 = 0, len(levels)
+    return levels[i0:i1]
+
+
 def get_turner_cmap() -> ListedColormap:
     """
     Create a custom colormap for Turner angle visualization.
@@ -0,0 +1,181 @@
+# rendering.py
+
+import numpy as np
+
+from gerg_plotting.modules.utilities import is_chunked_array, iter_chunks
+
+
+def _to_float(values) -> np.ndarray:
+    """Convert values to floats, datetimes become nanoseconds since the epoch and NaT becomes NaN."""
+    if is_chunked_array(values):
+        # Convert one block at a time so only the float copy of a chunked array is held in memory
+        result = np.empty(len(values))
+        start = 0
+        for chunk in iter_chunks(values):
+            result[start:start + len(chunk)] = _to_float(chunk)
+            start += len(chunk)
+        return result
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        nat = np.isnat(values)
+        values = values.astype('datetime64[ns]').view('int64').astype(float)
+        values[nat] = np.nan
+        return values
+    return values.astype(float, copy=False)
+
+
+def _pixel_index(values: np.ndarray, n_pixels: int, lower: float | None = None, upper: float | None = None) -> np.ndarray:
+    """Index of the pixel each value falls in when the range from lower to upper, the range of the values by default, is split into ``n_pixels`` pixels."""
+    lower = values.min() if lower is None else lower
+    upper = values.max() if upper is None else upper
+    if upper == lower:
+        return np.zeros(len(values), dtype=np.intp)
+    index = ((values - lower) * (n_pixels / (upper - lower))).astype(np.intp)
+    return np.minimum(index, n_pixels - 1, out=index)
+
+
+def _first_per_bin(candidates: np.ndarray, bins: np.ndarray) -> np.ndarray:
+    """First of the candidate indices in each bin."""
+    _, first = np.unique(bins[candidates], return_index=True)
+    return candidates[first]
+
+
+def _keep_per_bin(bins: np.ndarray, n_bins: int, c: np.ndarray | None) -> np.ndarray:
+    """Sorted indices of the points kept in each bin, the last point drawn and, with colors, the lowest and highest color."""
+    last = np.full(n_bins, -1, dtype=np.intp)
+    np.maximum.at(last, bins, np.arange(len(bins)))
+    keep = np.sort(last[last >= 0])
+    if c is None:
+        return keep
+    lowest = np.full(n_bins, np.inf)
+    np.minimum.at(lowest, bins, c)
+    highest = np.full(n_bins, -np.inf)
+    np.maximum.at(highest, bins, c)
+    keep_lowest = _first_per_bin(np.flatnonzero(c == lowest[bins]), bins)
+    keep_highest = _first_per_bin(np.flatnonzero(c == highest[bins]), bins)
+    return np.union1d(keep, np.union1d(keep_lowest, keep_highest))
+
+
+def decimate_points(x, y, c=None, max_points: int = 250_000, shape: tuple[int, int] = (1000, 1000)) -> np.ndarray:
+    """
+    Choose the points of a scatter plot to draw so the plot looks much the same with at most ``max_points`` markers.
+
+    The points are binned into a grid of pixels and every occupied pixel keeps its last point drawn,
+    whose color is the one visible on top, and with colors also the points with its lowest and highest color,
+    so the covered area, the visible colors, the extremes and the range of colors in each pixel are preserved.
+    The kept points are drawn in their original order. When that still leaves more than ``max_points`` points
+    the grid is coarsened until it does not. Points with NaN coordinates or colors are not drawn.
+
+    Parameters
+    ----------
+    x : array_like
+        X coordinates, may be datetimes or chunked arrays
+    y : array_like
+        Y coordinates, may be datetimes or chunked arrays
+    c : array_like, optional
+        Values mapped to colors, may be a chunked array
+    max_points : int, optional
+        Maximum number of points to keep, default is 250,000
+    shape : tuple of int, optional
+        Number of pixels across and up the plot, default is (1000, 1000)
+
+    Returns
+    -------
+    np.ndarray
+        Sorted indices of the points to draw, every index when there are no more than ``max_points`` points
+    """
+    if len(x) <= max_points:
+        return np.arange(len(x))
+    x, y = _to_float(x), _to_float(y)
+    valid = np.isfinite(x) & np.isfinite(y)
+    if c is not None:
+        c = _to_float(c)
+        valid &= np.isfinite(c)
+    index = np.flatnonzero(valid)
+    if len(index) <= max_points:
+        return index
+    x, y = x[index], y[index]
+    if c is not None:
+        c = c[index]
+
+    n_x, n_y = shape
+    while True:
+        bins = _pixel_index(x, n_x) * n_y + _pixel_index(y, n_y)
+        keep = _keep_per_bin(bins, n_x * n_y, c)
+        if len(keep) <= max_points or n_x == n_y == 1:
+            return index[keep]
+        # Coarsen the grid by the factor the kept points are over the budget
+        scale = np.sqrt(len(keep) / max_points)
+        n_x, n_y = max(1, int(n_x / scale)), max(1, int(n_y / scale))
+
+
+def rasterize_points(x, y, c=None, statistic: str = 'count', shape: tuple[int, int] = (1000, 1000),
+                     extent: list | None = None) -> tuple[np.ndarray, list]:
+    """
+    Aggregate points into an image with one cell per pixel.
+
+    Each cell holds the number of points in it, or the mean or last value of ``c`` of those points,
+    so drawing the image takes the same time however many points there are.
+
+    Parameters
+    ----------
+    x : array_like
+        X coordinates, may be datetimes
+    y : array_like
+        Y coordinates, may be datetimes
+    c : array_like, optional
+        Values to aggregate, required for the 'mean' and 'last' statistics
+    statistic : str, optional
+        'count', 'mean' or 'last', default is 'count'
+    shape : tuple of int, optional
+        Number of pixels across and up the image, default is (1000, 1000)
+    extent : list, optional
+        [x_min, x_max, y_min, y_max] covered by the image, default is the range of the points
+
+    Returns
+    -------
+    tuple
+        Image with shape (shape[1], shape[0]) and NaN in empty cells, with the first row at ``y_min``,
+        and its extent as [x_min, x_max, y_min, y_max]
+
+    Raises
+    ------
+    ValueError
+        If the statistic is not known or needs values that are not given
+    """
+    if statistic not in ('count', 'mean', 'last'):
+        raise ValueError(f"statistic must be 'count', 'mean' or 'last', not {statistic!r}")
+    if statistic != 'count' and c is None:
+        raise ValueError(f"The {statistic!r} statistic needs values to aggregate")
+    x, y = _to_float(x), _to_float(y)
+    valid = np.isfinite(x) & np.isfinite(y)
+    if statistic != 'count':
+        c = _to_float(c)
+        valid &= np.isfinite(c)
+    x, y = x[valid], y[valid]
+    if statistic != 'count':
+        c = c[valid]
+
+    n_x, n_y = shape
+    if extent is None:
+        extent = [x.min(), x.max(), y.min(), y.max()] if len(x) else [0.0, 1.0, 0.0, 1.0]
+    else:
+        # Points outside the extent are not drawn
+        inside = (x >= extent[0]) & (x <= extent[1]) & (y >= extent[2]) & (y <= extent[3])
+        x, y = x[inside], y[inside]
+        if statistic != 'count':
+            c = c[inside]
+    bins = _pixel_index(y, n_y, extent[2], extent[3]) * n_x + _pixel_index(x, n_x, extent[0], extent[1])
+
+    count = np.bincount(bins, minlength=n_x * n_y)
+    image = np.full(n_x * n_y, np.nan)
+    occupied = count > 0
+    if statistic == 'count':
+        image[occupied] = count[occupied]
+    elif statistic == 'mean':
+        image[occupied] = np.bincount(bins, weights=c, minlength=n_x * n_y)[occupied] / count[occupied]
+    else:
+        last = np.full(n_x * n_y, -1, dtype=np.intp)
+        np.maximum.at(last, bins, np.arange(len(bins)))
+        image[occupied] = c[last[occupied]]
+    return image.reshape(n_y, n_x), [float(value) for value in extent]
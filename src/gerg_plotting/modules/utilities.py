@@ -2,17 +2,109 @@
 
 import numpy as np
 import pandas as pd
+import xarray as xr
 import datetime
+from functools import lru_cache
+from attrs import fields,has
 
 
-def to_numpy_array(values) -> np.ndarray:
+def is_chunked_array(values) -> bool:
     """
-    Convert various data types to a numpy array using pandas Series as parser.
+    Check if values are a lazily evaluated chunked array, such as a dask array.
+
+    Parameters
+    ----------
+    values : object
+        Object to check
+
+    Returns
+    -------
+    bool
+        True if the object is a dask collection, xarray DataArrays are not chunked arrays themselves
+    """
+    return type(values).__module__.startswith('dask') and hasattr(values, 'chunks') and hasattr(values, 'compute')
+
+
+def is_lazy_array(values) -> bool:
+    """
+    Check if values are backed by storage outside of memory, either memory-mapped or chunked.
+
+    Parameters
+    ----------
+    values : object
+        Object to check
+
+    Returns
+    -------
+    bool
+        True for np.memmap arrays and chunked arrays
+    """
+    return isinstance(values, np.memmap) or is_chunked_array(values)
+
+
+def iter_chunks(values, chunk_size: int = 1_000_000):
+    """
+    Iterate over an array in in-memory numpy chunks.
+
+    Chunked arrays are computed one block at a time and other arrays,
+    including memory-mapped ones, are read in slices of ``chunk_size`` elements.
+
+    Parameters
+    ----------
+    values : array_like
+        Flat array to iterate over
+    chunk_size : int, optional
+        Number of elements per chunk for non-chunked arrays, default is 1,000,000
+
+    Yields
+    ------
+    np.ndarray
+        Consecutive chunks of the array
+    """
+    if is_chunked_array(values):
+        for idx in range(values.numblocks[0]):
+            yield np.asarray(values.blocks[idx].compute())
+    else:
+        for start in range(0, len(values), chunk_size):
+            yield np.asarray(values[start:start + chunk_size])
+
+
+def load_array(values) -> np.ndarray:
+    """
+    Load values into an in-memory numpy array, computing chunked arrays.
+
+    Parameters
+    ----------
+    values : array_like
+        Array to load, chunked (dask) arrays are computed
+
+    Returns
+    -------
+    np.ndarray
+        The loaded values, numpy arrays are returned unchanged
+    """
+    if is_chunked_array(values):
+        values = values.compute()
+    return np.asarray(values)
+
+
+def to_numpy_array(values, dtype=None) -> np.ndarray:
+    """
+    Convert various data types to a numpy array, without copying where possible.
+
+    Arrays, memory-mapped and chunked (dask) arrays are returned unchanged so they stay lazy.
+    pandas Series/Index, xarray DataArray and buffer-protocol objects are returned as zero-copy views
+    of their data where their dtype allows it.
+    Lists, tuples and sets are converted by numpy directly, and only parsed by pandas when
+    numpy cannot give them a numeric or datetime dtype (datetime objects, None values, strings),
+    so numeric input never ends up with object dtype.
 
     Parameters
     ----------
     values : array_like
         Input data that can be converted to a numpy array (lists, tuples, sets, etc.)
+    dtype : str or np.dtype, optional
+        dtype to cast the result to, for example 'float32', no copy is made if it already matches
 
     Returns
     -------
@@ -26,16 +118,119 @@ def to_numpy_array(values) -> np.ndarray:
     """
     if values is None:
         return None
-    elif isinstance(values, np.ndarray):
-        return values
-    if isinstance(values,dict):
+    elif isinstance(values, xr.DataArray):
+        # Chunked DataArrays give their dask array, in-memory ones a view of their numpy array
+        array = values.data if is_chunked_array(values.data) else values.values
+    elif isinstance(values, np.ndarray) or is_chunked_array(values):
+        array = values
+    elif isinstance(values, dict):
         raise TypeError(f"Cannot convert a dict with values of '{values}' to a NumPy array")
-    elif isinstance(values,set):
+    elif isinstance(values, (pd.Series, pd.Index)):
+        array = _pandas_to_numpy(values)
+    elif isinstance(values, (list, tuple, set, range)):
+        array = _sequence_to_numpy(values)
+    else:
+        try:
+            array = np.asarray(memoryview(values))
+        except TypeError:
+            array = _sequence_to_numpy(values)
+    if dtype is not None:
+        array = array.astype(dtype, copy=False)
+    return array
+
+
+def _pandas_to_numpy(values) -> np.ndarray:
+    """Convert a pandas Series or Index to a numpy array, nullable numeric dtypes become float with NaN."""
+    if isinstance(values.dtype, pd.api.extensions.ExtensionDtype) and pd.api.types.is_numeric_dtype(values.dtype) \
+            and not pd.api.types.is_bool_dtype(values.dtype):
+        return values.to_numpy(dtype='float64', na_value=np.nan)
+    return values.to_numpy(copy=False)
+
+
+def _sequence_to_numpy(values) -> np.ndarray:
+    """Convert a Python sequence with numpy, falling back to pandas for scalars and for values numpy keeps as objects or strings."""
+    if isinstance(values, set):
         values = list(values)
-    array = pd.Series(values).to_numpy()
+    array = np.asarray(values)
+    if array.dtype.kind in 'OUS' or array.ndim == 0:
+        array = pd.Series(values).to_numpy()
     return array
 
 
+@lru_cache(maxsize=None)
+def get_field_names(cls) -> tuple[str,...]:
+    """
+    Get the attribute names of an attrs class, computed once per class.
+
+    Private fields are listed under their init alias (``_vmin`` as ``vmin``),
+    and private fields that are not init arguments are internal state and skipped.
+
+    Parameters
+    ----------
+    cls : type
+        An attrs class
+
+    Returns
+    -------
+    tuple[str, ...]
+        Field names in definition order
+    """
+    return tuple(attribute.alias for attribute in fields(cls) if attribute.init or not attribute.name.startswith('_'))
+
+
+def public_asdict(instance) -> dict:
+    """
+    Get the public attributes of an attrs instance as a dict, like ``attrs.asdict`` as users see them.
+
+    Private fields are listed under their init alias with the value of the matching property
+    (``_vmin`` as ``vmin``, including limits computed from the data) and internal state is skipped.
+    Nested attrs instances, lists, tuples and dicts are converted the same way.
+
+    Parameters
+    ----------
+    instance : object
+        An attrs instance
+
+    Returns
+    -------
+    dict
+        Attribute names and values
+    """
+    return {name: _public_value(getattr(instance, name)) for name in get_field_names(type(instance))}
+
+
+def _public_value(value):
+    """Convert nested attrs instances in a value with ``public_asdict``."""
+    if has(type(value)):
+        return public_asdict(value)
+    if isinstance(value, dict):
+        return {key: _public_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_public_value(item) for item in value]
+    return value
+
+
+@lru_cache(maxsize=None)
+def get_field_set(cls) -> frozenset[str]:
+    """
+    Get the attribute names of an attrs class as a set for O(1) membership checks.
+
+    Unlike checking against ``attrs.asdict``, this never walks the instance's
+    fields, nested Variables or array data.
+
+    Parameters
+    ----------
+    cls : type
+        An attrs class
+
+    Returns
+    -------
+    frozenset[str]
+        Field names
+    """
+    return frozenset(get_field_names(cls))
+
+
 def calculate_range(var) -> list[float,float]:
     """
     Calculate the range of values in an array, ignoring NaN values.
@@ -1,5 +1,7 @@
 import numpy as np
 
+from gerg_plotting.modules.utilities import is_chunked_array
+
 
 def lat_min_smaller_than_max(instance, attribute, value) -> None:
     """
@@ -51,6 +53,8 @@ def is_flat_numpy_array(instance, attribute, value) -> None:
     """
     Validate that a value is a 1-dimensional NumPy array.
 
+    Chunked arrays such as dask arrays are accepted so they can stay lazy.
+
     Parameters
     ----------
     instance : object
@@ -65,7 +69,7 @@ def is_flat_numpy_array(instance, attribute, value) -> None:
     ValueError
         If value is not a NumPy array or is not 1-dimensional
     """
-    if not isinstance(value, np.ndarray):
+    if not isinstance(value, np.ndarray) and not is_chunked_array(value):
         raise ValueError(f"{attribute.name} must be a NumPy array or a list convertible to a NumPy array")
     if value.ndim != 1:
         raise ValueError(f"{attribute.name} must be a flat array")
@@ -6,12 +6,16 @@ import matplotlib.figure
 import matplotlib.pyplot
 from matplotlib.colors import Colormap
 import matplotlib.dates as mdates
-from attrs import define, field, asdict
+import matplotlib.image
+import numpy as np
+from attrs import define, field
 from pprint import pformat
 import cartopy.crs as ccrs
 
 from gerg_plotting.data_classes.data import Data
 from gerg_plotting.modules.plotting import  colorbar
+from gerg_plotting.modules.rendering import rasterize_points
+from gerg_plotting.modules.utilities import get_field_names,get_field_set,public_asdict
 
 @define
 class Plotter:
@@ -34,6 +38,12 @@ class Plotter:
         Number of bins for colorbar ticks, default is 5
     cbar_kwargs : dict
         Keyword arguments for colorbar customization
+    raster : bool
+        Whether scatter type plots draw an image with one cell per pixel instead of one marker per point,
+        which takes the same time however many points there are, default is False
+    raster_statistic : str
+        Statistic of the color variable shown in each pixel of raster plots, 'mean', 'last' or 'count',
+        default is 'mean'. Without a color variable the number of points in each pixel is shown.
 
     Attributes
     ----------
@@ -53,6 +63,9 @@ class Plotter:
     cbar_nbins: int = field(default=5)
     cbar_kwargs: dict = field(default={})
 
+    raster: bool = field(default=False)
+    raster_statistic: str = field(default='mean')
+
     def init_figure(self, fig=None, ax=None, figsize=(6.4, 4.8), three_d=False, geography=False) -> None:
         """
         Initialize figure and axes objects.
@@ -182,6 +195,74 @@ class Plotter:
             cmap = matplotlib.pyplot.get_cmap('viridis')
         return cmap
     
+    def get_pixel_shape(self) -> tuple[int, int]:
+        """
+        Get the size of the axes in pixels.
+
+        Returns
+        -------
+        tuple of int
+            Number of pixels across and up the axes
+        """
+        bbox = self.ax.get_window_extent()
+        return max(1, int(bbox.width)), max(1, int(bbox.height))
+
+    def get_raster_statistic(self, color_data) -> str:
+        """
+        Get the statistic shown by raster plots.
+
+        Parameters
+        ----------
+        color_data : array_like or None
+            Values of the color variable
+
+        Returns
+        -------
+        str
+            ``raster_statistic``, or 'count' when there is no color variable
+        """
+        return 'count' if color_data is None else self.raster_statistic
+
+    @staticmethod
+    def _is_datetime(values) -> bool:
+        """Whether values are datetimes, read from the dtype of arrays so chunked arrays are not computed."""
+        dtype = getattr(values, 'dtype', None)
+        if dtype is None:
+            dtype = np.asarray(values).dtype
+        return np.issubdtype(dtype, np.datetime64)
+
+    def draw_raster(self, x, y, color_data=None, **kwargs) -> matplotlib.image.AxesImage:
+        """
+        Draw points as an image with one cell per pixel of the axes.
+
+        Parameters
+        ----------
+        x : array_like
+            X coordinates, may be datetimes
+        y : array_like
+            Y coordinates, may be datetimes
+        color_data : array_like, optional
+            Values of the color variable aggregated with ``raster_statistic``
+        ``**kwargs``
+            Additional arguments for imshow, for example cmap, vmin and vmax
+
+        Returns
+        -------
+        matplotlib.image.AxesImage
+            The drawn image
+        """
+        # Datetimes are placed with matplotlib's date numbers
+        if self._is_datetime(x):
+            self.ax.xaxis.update_units(x)
+            x = mdates.date2num(x)
+        if self._is_datetime(y):
+            self.ax.yaxis.update_units(y)
+            y = mdates.date2num(y)
+        image, extent = rasterize_points(x, y, color_data, statistic=self.get_raster_statistic(color_data),
+                                         shape=self.get_pixel_shape())
+        kwargs = {'origin': 'lower', 'aspect': 'auto', 'interpolation': 'nearest', **kwargs}
+        return self.ax.imshow(image, extent=extent, **kwargs)
+
     def add_colorbar(self, mappable: matplotlib.axes.Axes, var: str | None, divider=None, total_cbars: int = 2) -> None:
         """
         Add colorbar to plot.
@@ -264,7 +345,7 @@ class Plotter:
         bool
             True if variable exists, False otherwise
         """
-        return key in asdict(self).keys()
+        return key in get_field_set(type(self))
     
     def get_vars(self) -> list:
         """
@@ -275,7 +356,7 @@ class Plotter:
         list
             List of variable names
         """
-        return list(asdict(self).keys())
+        return list(get_field_names(type(self)))
 
     def __getitem__(self, key: str):
         """
@@ -330,4 +411,4 @@ class Plotter:
         str
             Formatted string of all attributes
         """
-        return pformat(asdict(self),width=1)
+        return pformat(public_asdict(self),width=1)
@@ -9,11 +9,11 @@ from matplotlib.colors import Colormap
 from matplotlib.ticker import FixedLocator
 from matplotlib.text import Text
 from matplotlib.patches import Rectangle,FancyArrow
-from attrs import define,field,asdict
+from attrs import define,field
 from pprint import pformat
 import itertools
 
-from gerg_plotting.modules.utilities import extract_kwargs_with_aliases
+from gerg_plotting.modules.utilities import extract_kwargs_with_aliases,get_field_names,get_field_set,public_asdict
 from gerg_plotting.tools import normalize_string,merge_dicts
 
 
@@ -53,7 +53,7 @@ class Base:
         __str__()
             Return formatted string representation of class attributes.
         """
-        return key in asdict(self).keys()
+        return key in get_field_set(type(self))
     
     def get_vars(self) -> list:
         """
@@ -64,7 +64,7 @@ class Base:
         list
             List of all variable names in the object.
         """
-        return list(asdict(self).keys())
+        return list(get_field_names(type(self)))
 
     def __getitem__(self, key: str):
         """
@@ -98,7 +98,7 @@ class Base:
 
     def __str__(self) -> None:
         '''Return a pretty-printed string representation of the class attributes.'''
-        return pformat(asdict(self),width=1)
+        return pformat(public_asdict(self),width=1)
 
 
 
@@ -13,6 +13,7 @@ import numpy as np
 
 from gerg_plotting.plotting_classes.plotter import Plotter
 from gerg_plotting.data_classes.bathy import Bathy
+from gerg_plotting.modules.contours import cached_contour
 
 
 @define
@@ -51,10 +52,15 @@ class MapPlot(Plotter):
         """
         Initialize bathymetry object based on map bounds.
 
-        Creates a new Bathy object if none exists, using current map bounds.
+        Creates a new Bathy object if none exists, using current map bounds
+        and reading the bathymetry at about the pixel resolution of the axes.
         """
         if not isinstance(self.bathy, Bathy):
-            self.bathy = Bathy(bounds=self.data.bounds)
+            if self.ax is not None:
+                target_resolution = int(max(self.ax.bbox.width, self.ax.bbox.height))
+                self.bathy = Bathy(bounds=self.data.bounds, resolution_level='auto', target_resolution=target_resolution)
+            else:
+                self.bathy = Bathy(bounds=self.data.bounds)
 
     def set_up_map(self, fig=None, ax=None, var=None) -> tuple[str,Colormap,AxesDivider]|tuple[np.ndarray,Colormap,AxesDivider]:
         """
@@ -178,11 +184,18 @@ class MapPlot(Plotter):
         """
         if show_bathy:
             self.init_bathy()
-            bathy_contourf = self.ax.contourf(self.bathy.lon, self.bathy.lat, self.bathy.depth,
-                                              levels=self.bathy.contour_levels, cmap=self.bathy.cmap,
-                                              vmin=self.bathy.vmin, transform=ccrs.PlateCarree(), extend='both')
+            if self.bathy.raster:
+                # Draw the bathymetry as an image colored by contour band
+                rgba, extent, bathy_mappable = self.bathy.get_raster()
+                self.ax.imshow(rgba, extent=extent, origin='lower', interpolation='nearest', transform=ccrs.PlateCarree())
+            else:
+                # The contour paths of a region are cached, so maps of the same region reuse them
+                bathy_mappable = cached_contour(self.ax, self.bathy.lon, self.bathy.lat, self.bathy.depth, filled=True,
+                                                levels=self.bathy.contour_levels, cmap=self.bathy.cmap,
+                                                vmin=self.bathy.vmin, transform=ccrs.PlateCarree(), extend='both',
+                                                cache_dir=self.bathy.contour_cache_dir)
             # Add a colorbar for the bathymetry
-            self.cbar_bathy = self.bathy.add_colorbar(mappable=bathy_contourf, divider=divider,
+            self.cbar_bathy = self.bathy.add_colorbar(mappable=bathy_mappable, divider=divider,
                                                       fig=self.fig, nrows=self.nrows)
 
     def scatter(self, var: str | None = None, show_bathy: bool = True, show_coastlines:bool=True, pointsize=3, 
@@ -217,9 +230,20 @@ class MapPlot(Plotter):
         # Add bathymetry if needed
         self.add_bathy(show_bathy, divider)
         
-        # Plot scatter points on the map
-        self.sc = self.ax.scatter(self.data['lon'].data, self.data['lat'].data, linewidths=linewidths,
-                                  c=color, cmap=cmap, s=pointsize, transform=ccrs.PlateCarree(),vmin=self.data[var].vmin,vmax=self.data[var].vmax)
+        if self.raster:
+            # Draw an image with one cell per pixel instead of one marker per point
+            color_data = None if var is None else color
+            if self.get_raster_statistic(color_data) == 'count':
+                self.sc = self.draw_raster(self.data['lon'].data, self.data['lat'].data, transform=ccrs.PlateCarree(), aspect='equal')
+                var = None  # The colorbar of the variable does not apply to point counts
+            else:
+                self.sc = self.draw_raster(self.data['lon'].data, self.data['lat'].data, color_data, cmap=cmap,
+                                           vmin=self.data[var].vmin, vmax=self.data[var].vmax,
+                                           transform=ccrs.PlateCarree(), aspect='equal')
+        else:
+            # Plot scatter points on the map
+            self.sc = self.ax.scatter(self.data['lon'].data, self.data['lat'].data, linewidths=linewidths,
+                                      c=color, cmap=cmap, s=pointsize, transform=ccrs.PlateCarree(),vmin=self.data[var].vmin,vmax=self.data[var].vmax)
         # Add a colorbar for the scatter plot variable
         self.cbar_var = self.add_colorbar(self.sc, var, divider, total_cbars=(2 if show_bathy else 1))
 
@@ -1,4 +1,4 @@
-from attrs import define, asdict, field
+from attrs import define, field
 from pprint import pformat
 import numpy as np
 import mayavi.core.lut_manager
@@ -7,6 +7,7 @@ import mayavi.mlab as mlab
 
 from gerg_plotting.data_classes.data import Data
 from gerg_plotting.data_classes.bathy import Bathy
+from gerg_plotting.modules.utilities import get_field_names,get_field_set,public_asdict
 
 @define
 class Plotter3D:
@@ -74,7 +75,7 @@ class Plotter3D:
             True if attribute exists, False otherwise
         """
         # Check if key exists in the object's dictionary representation
-        return key in asdict(self).keys()
+        return key in get_field_set(type(self))
     
 
     def get_vars(self) -> list:
@@ -87,7 +88,7 @@ class Plotter3D:
             List of attribute names
         """
         # Get list of attributes by converting object to dictionary
-        return list(asdict(self).keys())
+        return list(get_field_names(type(self)))
 
 
     def __getitem__(self, key: str):
@@ -129,7 +130,7 @@ class Plotter3D:
             str: A formatted string representation of the object.
         """
         # Convert attributes to formatted string for display
-        return pformat(asdict(self), width=1)
+        return pformat(public_asdict(self), width=1)
     
 
     def show(self):
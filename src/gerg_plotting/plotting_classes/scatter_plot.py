@@ -7,11 +7,15 @@ import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 from matplotlib.ticker import MaxNLocator
 import numpy as np
+from scipy.stats import binned_statistic_2d
 from attrs import define, field
 import cmocean
 
 from gerg_plotting.plotting_classes.plotter import Plotter
 from gerg_plotting.modules.calculations import get_sigma_theta, get_density
+from gerg_plotting.modules.contours import cached_contour
+from gerg_plotting.modules.rendering import decimate_points
+from gerg_plotting.modules.utilities import load_array
 from gerg_plotting.data_classes.variable import Variable
 
 @define
@@ -27,9 +31,19 @@ class ScatterPlot(Plotter):
     ----------
     markersize : int or float
         Size of scatter plot markers, default is 10
+    contour_cache_dir : str or None
+        Directory where the sigma-theta contours of T-S diagrams are cached between runs, default is None for no on-disk cache
+    decimate : bool
+        Whether scatter plots with more than ``max_points`` points are thinned to the points that change
+        how the plot looks, default is True
+    max_points : int
+        Maximum number of points drawn by scatter plots when ``decimate`` is True, default is 250,000
     """
     
     markersize: int | float = field(default=10)
+    contour_cache_dir: str | None = field(default=None)
+    decimate: bool = field(default=True)
+    max_points: int = field(default=250_000)
 
     def scatter(self, x: str, y: str, color_var: str | None = None, invert_yaxis:bool=False, fig=None, ax=None, **kwargs) -> None:
         """
@@ -50,25 +64,51 @@ class ScatterPlot(Plotter):
         ax : matplotlib.axes.Axes, optional
             Axes to plot on
         ``**kwargs``
-            Additional arguments for scatter plot
+            Additional arguments for scatter plot, or for imshow when ``raster`` is True
 
         Returns
         -------
-        matplotlib.collections.PathCollection
-            Scatter plot object
+        matplotlib.collections.PathCollection or matplotlib.image.AxesImage
+            Scatter plot object, or the image when ``raster`` is True
         """
         self.data.check_for_vars([x,y,color_var])
         self.init_figure(fig, ax)  # Initialize figure and axes
 
-        # If color_var is passed
+        x_data, y_data = self.data[x].data, self.data[y].data
+        color_data = None
         if color_var is not None:
-            if color_var == "time":
-                color_data = self.data.date2num()
+            color_data = np.asarray(self.data.date2num()) if color_var == "time" else self.data[color_var].data
+
+        # Draw an image with one cell per pixel instead of one marker per point
+        if self.raster:
+            if self.get_raster_statistic(color_data) == 'count':
+                sc = self.draw_raster(x_data, y_data, **kwargs)
             else:
-                color_data = self.data[color_var].data
+                sc = self.draw_raster(x_data, y_data, color_data, cmap=self.get_cmap(color_var),
+                                      vmin=self.data[color_var].vmin, vmax=self.data[color_var].vmax, **kwargs)
+                self.add_colorbar(sc, var=color_var)  # Add colorbar
+            self.format_axes(xlabel=self.data[x].get_label(),ylabel=self.data[y].get_label(),invert_yaxis=invert_yaxis)
+            return sc
+
+        # Thin very large data sets to the points that change how the plot looks
+        if self.decimate and len(x_data) > self.max_points:
+            keep = decimate_points(x_data, y_data, color_data, max_points=self.max_points, shape=self.get_pixel_shape())
+            # Per point keyword arguments, like marker sizes, are thinned with the points
+            kwargs = {key: np.asarray(value)[keep] if np.ndim(value) == 1 and len(value) == len(x_data) else value
+                      for key, value in kwargs.items()}
+            x_data, y_data = x_data[keep], y_data[keep]
+            if color_data is not None:
+                color_data = color_data[keep]
+        # Chunked columns are loaded only now, after thinning, so only the drawn points are computed
+        x_data, y_data = load_array(x_data), load_array(y_data)
+        if color_data is not None:
+            color_data = load_array(color_data)
+
+        # If color_var is passed
+        if color_var is not None:
             sc = self.ax.scatter(
-                self.data[x].data,
-                self.data[y].data,
+                x_data,
+                y_data,
                 c=color_data,
                 cmap=self.get_cmap(color_var),
                 vmin = self.data[color_var].vmin,
@@ -78,7 +118,7 @@ class ScatterPlot(Plotter):
 
         # If color_var is not passed 
         else:
-            sc = self.ax.scatter(self.data[x].data, self.data[y].data, **kwargs)
+            sc = self.ax.scatter(x_data, y_data, **kwargs)
 
         self.format_axes(xlabel=self.data[x].get_label(),ylabel=self.data[y].get_label(),invert_yaxis=invert_yaxis)
 
@@ -139,7 +179,43 @@ class ScatterPlot(Plotter):
         return sc   
   
     
-    def hovmoller(self, var: str, fig=None, ax=None,**kwargs) -> None:
+    def get_hovmoller_grid(self, var: str, bins=100, statistic: str = 'mean') -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Bin a variable into a regular grid of time and depth.
+
+        Grids are memoized on the data per variable, bins and statistic until the time, depth or variable data change,
+        so drawing the same hovmoller again with a different style does not bin the data again.
+
+        Parameters
+        ----------
+        var : str
+            Variable name to bin
+        bins : int or [int, int] or [array, array], optional
+            Number of bins or bin edges for time and depth, as for ``scipy.stats.binned_statistic_2d``,
+            time edges are matplotlib date numbers, default is 100
+        statistic : str, optional
+            Statistic of the values in each bin, as for ``scipy.stats.binned_statistic_2d``, default is 'mean'
+
+        Returns
+        -------
+        tuple of np.ndarray
+            Time edges as matplotlib date numbers, depth edges and the grid with shape (depth bins, time bins),
+            NaN where a bin is empty
+        """
+        self.data.check_for_vars(['time','depth',var])
+        bins_key = repr(bins if np.ndim(bins) == 0 else [np.asarray(b).tolist() for b in bins])
+
+        def bin_values(time, depth, values):
+            time = np.asarray(mdates.date2num(load_array(time)), dtype=float)
+            depth = np.asarray(depth, dtype=float)
+            values = np.asarray(values, dtype=float)
+            valid = np.isfinite(time) & np.isfinite(depth) & np.isfinite(values)
+            result = binned_statistic_2d(time[valid], depth[valid], values[valid], statistic=statistic, bins=bins)
+            return result.x_edge, result.y_edge, result.statistic.T
+
+        return self.data.get_derived(f'hovmoller bins={bins_key} statistic={statistic}', ['time','depth',var], bin_values)
+
+    def hovmoller(self, var: str, fig=None, ax=None, bins=None, statistic: str = 'mean', **kwargs) -> None:
         """
         Create depth vs time plot colored by variable.
 
@@ -151,14 +227,28 @@ class ScatterPlot(Plotter):
             Figure to plot on
         ax : matplotlib.axes.Axes, optional
             Axes to plot on
+        bins : int or [int, int] or [array, array], optional
+            When given, the variable is binned into a regular grid of time and depth drawn with pcolormesh
+            instead of drawing every sample, see ``get_hovmoller_grid``, default is None
+        statistic : str, optional
+            Statistic of the values in each bin when ``bins`` is given, default is 'mean'
         ``**kwargs``
-            Additional arguments for scatter plot
+            Additional arguments for scatter plot, or for pcolormesh when ``bins`` is given
         """
-        sc = self.scatter(x='time',
-                          y='depth',
-                          color_var=var,
-                          invert_yaxis=True,
-                          ax=ax, fig=fig,**kwargs)
+        if bins is None:
+            sc = self.scatter(x='time',
+                              y='depth',
+                              color_var=var,
+                              invert_yaxis=True,
+                              ax=ax, fig=fig,**kwargs)
+        else:
+            time_edges, depth_edges, grid = self.get_hovmoller_grid(var, bins=bins, statistic=statistic)
+            self.init_figure(fig, ax)  # Initialize figure and axes
+            self.ax.xaxis_date()
+            sc = self.ax.pcolormesh(time_edges, depth_edges, np.ma.masked_invalid(grid), cmap=self.get_cmap(var),
+                                    vmin=self.data[var].vmin, vmax=self.data[var].vmax, **kwargs)
+            self.add_colorbar(sc, var=var)  # Add colorbar
+            self.ax.invert_yaxis()
         
         locator = mdates.AutoDateLocator()
         formatter = mdates.AutoDateFormatter(locator)
@@ -187,11 +277,9 @@ class ScatterPlot(Plotter):
 
         if contours:
             # Calculate sigma-theta contours
-            Sg, Tg, sigma_theta = get_sigma_theta(
-                salinity=self.data['salinity'].data,
-                temperature=self.data['temperature'].data
-            )
-            cs = self.ax.contour(Sg, Tg, sigma_theta, colors='grey', zorder=1, linestyles='dashed')
+            Sg, Tg, sigma_theta = self.data.get_derived('sigma_theta', ['salinity','temperature'], get_sigma_theta)
+            cs = cached_contour(self.ax, Sg, Tg, sigma_theta, colors='grey', zorder=1, linestyles='dashed',
+                                cache_dir=self.contour_cache_dir)
             matplotlib.pyplot.clabel(cs, fontsize=10, inline=True, fmt='%.1f')  # Add contour labels
 
         self.format_axes(xlabel=self.data.salinity.get_label(),ylabel=self.data.temperature.get_label())
@@ -216,10 +304,8 @@ class ScatterPlot(Plotter):
         """
         if color_var == 'density':
             if not isinstance(self.data['density'], Variable):  # If density is not already provided
-                color_data = get_density(
-                    self.data['salinity'].data,
-                    self.data['temperature'].data
-                )  # Calculate density from salinity and temperature
+                # Calculate density from salinity and temperature, memoized on the data
+                color_data = self.data.get_derived('density', ['salinity','temperature'], get_density)
             else:
                 color_data = self.data[color_var].data
         else:
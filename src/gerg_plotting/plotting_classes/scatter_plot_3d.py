@@ -112,8 +112,12 @@ class ScatterPlot3D(Plotter3D):
             bounds = self.data.detect_bounds(bounds_padding=bounds_padding)
             self.bathy = Bathy(bounds=bounds)
 
-        # Retrieve x, y, and z bathymetric coordinates
-        x_bathy, y_bathy, z_bathy = self.bathy.get_bathy()
+        # Retrieve x, y, and z bathymetric coordinates, loaded when the Bathy was created
+        x_bathy, y_bathy = self.bathy.get_meshgrid()
+        z_bathy = self.bathy.depth
+        # Undo the scaling applied by the bounds, the vertical scalar of the plot is applied below
+        if self.bathy.bounds.vertical_scalar not in (None, 0):
+            z_bathy = z_bathy / self.bathy.bounds.vertical_scalar
 
         # Scale z (depth) coordinates if vertical scaler is provided
         if vertical_scalar is not None:
@@ -2,6 +2,12 @@ import numpy as np
 import pandas as pd
 import xarray as xr
 from itertools import combinations
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from pathlib import Path
+import glob
+import hashlib
+import os
 import re
 
 from gerg_plotting.data_classes.data import Data
@@ -126,16 +132,14 @@ def custom_legend_handles(labels:list[str],colors,hatches=None,color_hatch_not_b
 
     return legend_handles
 
-def _map_variables(keys:list[str], values:list[str], synonyms:dict[str,list[str]]|None=None, blocklist:dict[str,list[str]]|None=None):
+def _compile_matchers(keys:list[str], synonyms:dict[str,list[str]]|None=None, blocklist:dict[str,list[str]]|None=None) -> tuple:
     """
-    Map variable names to their corresponding values using flexible matching.
+    Normalize the matching rules of each key once so they can be reused for any list of names.
 
     Parameters
     ----------
     keys : list[str]
         List of target variable names
-    values : list[str]
-        List of available variable names
     synonyms : dict, optional
         Dictionary of variable synonyms
     blocklist : dict, optional
@@ -143,87 +147,136 @@ def _map_variables(keys:list[str], values:list[str], synonyms:dict[str,list[str]
 
     Returns
     -------
-    dict
-        Mapping of variables to their matched values
+    tuple
+        One (key, lowercase key, possible matches, blocked words) tuple per key, all lowercase
     """
-    # Initialize the dictionary with None for each key
-    mapped_dict = {key: None for key in keys}
-    
-    # Iterate through each key
+    matchers = []
     for key in keys:
         # Gather possible matches, starting with the key itself
         possible_matches = [key]
-        
-        # Add synonyms if provided
         if synonyms and key in synonyms:
             possible_matches.extend(synonyms[key])
-        
-        # Get blocked words for the key if provided
         blocked_words = blocklist.get(key, []) if blocklist else []
-        
-        # Search through values for matches
-        for value in values:
+        matchers.append((key, key.lower(), tuple(match.lower() for match in possible_matches), tuple(block.lower() for block in blocked_words)))
+    return tuple(matchers)
+
+
+def _match_variables(matchers:tuple, values:list[str]) -> dict:
+    """
+    Map variable names to their corresponding values using compiled matchers.
+
+    Parameters
+    ----------
+    matchers : tuple
+        Matchers created by ``_compile_matchers``
+    values : list[str]
+        List of available variable names
+
+    Returns
+    -------
+    dict
+        Mapping of variables to their matched values
+    """
+    # Lowercase every value once rather than once per key and match
+    lowered_values = [(value, value.lower()) for value in values]
+    mapped_dict = {}
+    for key, lowered_key, possible_matches, blocked_words in matchers:
+        mapped_dict[key] = None
+        for value, lowered in lowered_values:
             # Check if the value is blocked for the key
-            if any(block.lower() in value.lower() for block in blocked_words):
-                continue  # Skip this value since it's blocked
+            if any(block in lowered for block in blocked_words):
+                continue
 
             # Check for exact matches
-            if any(match.lower() == value.lower() for match in possible_matches):
+            if lowered in possible_matches:
                 mapped_dict[key] = value
                 break
-            
+
             # Check if this is a single-letter key (like 'u', 'v', 'w', or 's')
             if len(key) == 1:
                 # Ensure the key appears only at the start or end of the value string with an underscore
-                if value.lower().startswith(f"{key.lower()}_") or value.lower().endswith(f"_{key.lower()}"):
+                if lowered.startswith(f"{lowered_key}_") or lowered.endswith(f"_{lowered_key}"):
                     mapped_dict[key] = value
                     break
             else:
                 # Check for matching using synonyms and the key itself
-                if any(match.lower() in value.lower() for match in possible_matches):
+                if any(match in lowered for match in possible_matches):
                     mapped_dict[key] = value
                     break
-    
     return mapped_dict
 
 
+def _map_variables(keys:list[str], values:list[str], synonyms:dict[str,list[str]]|None=None, blocklist:dict[str,list[str]]|None=None):
+    """
+    Map variable names to their corresponding values using flexible matching.
+
+    Parameters
+    ----------
+    keys : list[str]
+        List of target variable names
+    values : list[str]
+        List of available variable names
+    synonyms : dict, optional
+        Dictionary of variable synonyms
+    blocklist : dict, optional
+        Dictionary of terms to avoid for each variable
+
+    Returns
+    -------
+    dict
+        Mapping of variables to their matched values
+    """
+    return _match_variables(_compile_matchers(keys, synonyms, blocklist), values)
+
+
+# Standard variables and the column names they are matched against
+_VARIABLE_KEYS = ['lat', 'lon', 'depth', 'time', 'temperature', 'salinity', 'density', 'u', 'v','w', 'speed','cdom','chlor','turbidity']
+_VARIABLE_SYNONYMS = {
+    'depth': ['pressure', 'pres'],
+    'temperature': ['temp', 'temperature_measure'],
+    'salinity': ['salt', 'salinity_level'],
+    'density': ['density_metric', 'rho'],
+    'u': ['eastward_velocity', 'u_component', 'u_current', 'current_u'],
+    'v': ['northward_velocity', 'v_component', 'v_current', 'current_v'],
+    'w': ['downward_velocity','upward_velocity','w_component', 'w_current', 'current_w'],
+    's': ['combined_velocity','velocity','speed', 's_current', 'current_s'],
+    'cdom': ['cdom_concentration','cdom_concentration_measure','sci_flbbcd_cdom_units'],
+    'chlor': ['chlorophyll_concentration','chlorophyll_concentration_measure','sci_flbbcd_chlor_units'],
+    'turbidity': ['turbidity_measure','turbidity_units','turbidity','sci_flbbcd_bb_units'],
+}
+_VARIABLE_BLOCKLIST = {
+    's': ['sound','pres'],
+    'lat':['platform']
+}
+_VARIABLE_MATCHERS = _compile_matchers(_VARIABLE_KEYS, _VARIABLE_SYNONYMS, _VARIABLE_BLOCKLIST)
+
+
+@lru_cache(maxsize=256)
+def _get_default_mapping(column_names:tuple) -> tuple:
+    """Match the standard variables to a set of column names, cached since files from one instrument share columns."""
+    return tuple(_match_variables(_VARIABLE_MATCHERS, column_names).items())
+
 
 def _get_var_mapping(column_names:list,provided_map:None|dict=None) -> dict:
     """
     Create variable mapping from DataFrame columns.
 
+    The mapping of each distinct set of column names is computed once and reused.
+
     Parameters
     ----------
-    df : pandas.DataFrame
-        DataFrame containing data columns
+    column_names : list
+        Names of the available columns or variables
+    provided_map : dict, optional
+        Custom mapping that overrides the matched one
 
     Returns
     -------
     dict
         Mapping of standard variable names to DataFrame columns
     """
-    keys = ['lat', 'lon', 'depth', 'time', 'temperature', 'salinity', 'density', 'u', 'v','w', 'speed','cdom','chlor','turbidity']
-    values = column_names
-    synonyms = {
-        'depth': ['pressure', 'pres'],
-        'temperature': ['temp', 'temperature_measure'],
-        'salinity': ['salt', 'salinity_level'],
-        'density': ['density_metric', 'rho'],
-        'u': ['eastward_velocity', 'u_component', 'u_current', 'current_u'],
-        'v': ['northward_velocity', 'v_component', 'v_current', 'current_v'],
-        'w': ['downward_velocity','upward_velocity','w_component', 'w_current', 'current_w'],
-        's': ['combined_velocity','velocity','speed', 's_current', 'current_s'],
-        'cdom': ['cdom_concentration','cdom_concentration_measure','sci_flbbcd_cdom_units'],
-        'chlor': ['chlorophyll_concentration','chlorophyll_concentration_measure','sci_flbbcd_chlor_units'],
-        'turbidity': ['turbidity_measure','turbidity_units','turbidity','sci_flbbcd_bb_units'],
-    }
-    blocklist = {
-        's': ['sound','pres'],
-        'lat':['platform']
-    }
-
-    mapped_variables = _map_variables(keys, values, synonyms, blocklist)
-    
+    mapped_variables = dict(_get_default_mapping(tuple(column_names)))
+
     # Update the mapping with provided values
     if provided_map is not None:
         mapped_variables.update(provided_map)
@@ -270,6 +323,40 @@ def interp_glider_lat_lon(ds:xr.Dataset) -> xr.Dataset:
     return ds
 
 
+def _load_cached(filename: str, cache_dir: str, options: dict, loader) -> Data:
+    """
+    Load Data from an ``.npz`` cache of a source file, creating the cache on a miss.
+
+    Parameters
+    ----------
+    filename : str
+        Path to the source file
+    cache_dir : str
+        Directory holding the cache files
+    options : dict
+        Loader options that change the resulting Data, part of the cache key
+    loader : callable
+        Function returning the Data read from the source file
+
+    Returns
+    -------
+    Data
+        Cached or freshly loaded Data
+    """
+    stat = os.stat(filename)
+    key = repr((os.path.abspath(filename), stat.st_mtime_ns, stat.st_size, sorted(options.items())))
+    cache_file = os.path.join(cache_dir, f'{hashlib.sha1(key.encode()).hexdigest()}.npz')
+    if os.path.exists(cache_file):
+        return Data.from_npz(cache_file)
+    data = loader()
+    os.makedirs(cache_dir, exist_ok=True)
+    # Write to a temporary file first so a concurrent reader never sees a partial cache
+    temp_file = f'{cache_file[:-4]}.{os.getpid()}.tmp.npz'
+    data.to_npz(temp_file)
+    os.replace(temp_file, cache_file)
+    return data
+
+
 def data_from_df(df:pd.DataFrame,mapped_variables:dict|None=None,**kwargs):
     """
     Create Data object from DataFrame.
@@ -298,16 +385,26 @@ def data_from_df(df:pd.DataFrame,mapped_variables:dict|None=None,**kwargs):
     return data
 
 
-def data_from_csv(filename:str,mapped_variables:dict|None=None,**kwargs):
+def data_from_csv(filename:str,mapped_variables:dict|None=None,engine:str|None=None,chunksize:int|None=None,cache_dir:str|None=None,**kwargs):
     """
     Create Data object from CSV file.
 
+    Only the header is read to resolve the variable mapping,
+    then only the mapped columns are parsed.
+
     Parameters
     ----------
     filename : str
         Path to CSV file
     mapped_variables : dict, optional
         Custom variable mapping
+    engine : str, optional
+        Parser engine passed to ``pandas.read_csv``, for example 'pyarrow' for multithreaded parsing
+    chunksize : int, optional
+        Number of rows parsed at a time, bounds the parser's working memory on very long files
+    cache_dir : str, optional
+        Directory of ``.npz`` caches, when set the Data is loaded from the cache if the file,
+        its modification time and the mapping are unchanged, and the cache is written otherwise
     ``**kwargs``
         Additional arguments for Data initialization
 
@@ -316,7 +413,29 @@ def data_from_csv(filename:str,mapped_variables:dict|None=None,**kwargs):
     Data
         Initialized Data object
     """
-    df = pd.read_csv(filename)
+    if cache_dir is not None:
+        options = {'loader': 'csv', 'mapped_variables': mapped_variables, 'engine': engine, **kwargs}
+        return _load_cached(filename, cache_dir, options,
+                            lambda: data_from_csv(filename, mapped_variables, engine, chunksize, **kwargs))
+
+    # Resolve the mapping from the header alone
+    columns = pd.read_csv(filename, nrows=0).columns.tolist()
+    mapped_variables = _get_var_mapping(columns, mapped_variables)
+    usecols = list(dict.fromkeys(value for value in mapped_variables.values() if value is not None))
+
+    # Parse the numeric columns straight into the requested float dtype
+    dtype = None
+    if kwargs.get('float_dtype') is not None:
+        dtype = {value: kwargs['float_dtype'] for key, value in mapped_variables.items()
+                 if value is not None and key != 'time' and value != mapped_variables['time']}
+
+    read_kwargs = {'usecols': usecols, 'dtype': dtype}
+    if engine is not None:
+        read_kwargs['engine'] = engine
+    if chunksize is not None:
+        df = pd.concat(pd.read_csv(filename, chunksize=chunksize, **read_kwargs), ignore_index=True)
+    else:
+        df = pd.read_csv(filename, **read_kwargs)
 
     data = data_from_df(df,mapped_variables=mapped_variables,**kwargs)
 
@@ -339,15 +458,17 @@ def data_from_ds(ds: xr.Dataset, mapped_variables: dict | None = None, **kwargs)
     Returns
     -------
     Data
-        New Data object containing the dataset variables
+        New Data object containing the dataset variables, chunked (dask backed) variables stay lazy
     """
     mapped_variables = _get_var_mapping(ds.variables.keys(), mapped_variables)
-    mapped_variables = {key: ds[value].values for key, value in mapped_variables.items() if value is not None}
+    mapped_variables = {key: ds[value].data if ds[value].chunks is not None else ds[value].values
+                        for key, value in mapped_variables.items() if value is not None}
     data = Data(**mapped_variables, **kwargs)
     return data
 
 
-def data_from_netcdf(filename: str, mapped_variables: dict | None = None, interp_glider: bool = False, **kwargs):
+def data_from_netcdf(filename: str, mapped_variables: dict | None = None, interp_glider: bool = False, chunks: dict | int | str | None = None,
+                     cache_dir: str | None = None, **kwargs):
     """
     Create Data object from NetCDF file.
 
@@ -359,6 +480,13 @@ def data_from_netcdf(filename: str, mapped_variables: dict | None = None, interp
         Dictionary mapping variable names to dataset variables  
     interp_glider : bool, optional
         Whether to interpolate glider lat/lon positions
+    chunks : dict, int, str or None, optional
+        Chunk sizes passed to ``xr.open_dataset``, when set the variables are read lazily
+        as dask arrays instead of being loaded into memory (requires dask)
+    cache_dir : str or None, optional
+        Directory of ``.npz`` caches, when set the Data is loaded from the cache if the file,
+        its modification time and the mapping are unchanged, and the cache is written otherwise.
+        Ignored when ``chunks`` is set so lazy loads stay lazy.
     ``**kwargs``
         Additional keyword arguments passed to Data constructor
 
@@ -367,9 +495,116 @@ def data_from_netcdf(filename: str, mapped_variables: dict | None = None, interp
     Data
         New Data object containing the NetCDF variables
     """
-    ds = xr.open_dataset(filename)
+    if cache_dir is not None and chunks is None:
+        options = {'loader': 'netcdf', 'mapped_variables': mapped_variables, 'interp_glider': interp_glider, **kwargs}
+        return _load_cached(filename, cache_dir, options,
+                            lambda: data_from_netcdf(filename, mapped_variables, interp_glider, **kwargs))
+    ds = xr.open_dataset(filename, chunks=chunks)
     if interp_glider:
         ds = interp_glider_lat_lon(ds)
     data = data_from_ds(ds, mapped_variables=mapped_variables, **kwargs)
     return data
 
+
+def _read_netcdf_arrays(filename: str, mapped_variables: dict | None = None, interp_glider: bool = False) -> dict:
+    """
+    Read the mapped variables of one NetCDF file into numpy arrays.
+
+    Parameters
+    ----------
+    filename : str
+        Path to NetCDF file
+    mapped_variables : dict or None, optional
+        Dictionary mapping variable names to dataset variables
+    interp_glider : bool, optional
+        Whether to interpolate glider lat/lon positions
+
+    Returns
+    -------
+    dict
+        Arrays keyed by standard variable name
+    """
+    with xr.open_dataset(filename) as ds:
+        if interp_glider:
+            ds = interp_glider_lat_lon(ds)
+        mapping = _get_var_mapping(ds.variables.keys(), mapped_variables)
+        return {key: ds[value].values for key, value in mapping.items() if value is not None}
+
+
+def _concatenate_arrays(arrays: list[dict]) -> dict:
+    """
+    Concatenate per-file arrays with one allocation per variable.
+
+    Variables missing from a file are filled with NaN, or NaT for datetimes.
+
+    Parameters
+    ----------
+    arrays : list[dict]
+        Arrays keyed by variable name, one dict per file
+
+    Returns
+    -------
+    dict
+        Concatenated arrays keyed by variable name
+    """
+    lengths = [len(next(iter(file_arrays.values()))) if file_arrays else 0 for file_arrays in arrays]
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+    keys = list(dict.fromkeys(key for file_arrays in arrays for key in file_arrays))
+    concatenated = {}
+    for key in keys:
+        dtype = np.result_type(*[file_arrays[key].dtype for file_arrays in arrays if key in file_arrays])
+        if any(key not in file_arrays for file_arrays in arrays) and dtype.kind in 'iub':
+            dtype = np.result_type(dtype, np.float64)  # Integers cannot hold the NaN fill
+        result = np.empty(offsets[-1], dtype=dtype)
+        for file_arrays, start, stop in zip(arrays, offsets[:-1], offsets[1:]):
+            result[start:stop] = file_arrays[key] if key in file_arrays else (np.datetime64('NaT') if dtype.kind == 'M' else np.nan)
+        concatenated[key] = result
+    return concatenated
+
+
+def data_from_netcdf_many(paths: str | Path | list, mapped_variables: dict | None = None, interp_glider: bool = False,
+                          workers: int | None = None, processes: bool = False, **kwargs):
+    """
+    Create one Data object from many NetCDF files read in parallel.
+
+    Each file is opened, optionally glider-interpolated and converted to arrays in a worker,
+    then the arrays are concatenated into a single allocation per variable in the order of the files.
+
+    Parameters
+    ----------
+    paths : str, Path or list
+        Glob pattern (for example 'dives/*.nc') or list of paths to NetCDF files
+    mapped_variables : dict or None, optional
+        Dictionary mapping variable names to dataset variables
+    interp_glider : bool, optional
+        Whether to interpolate glider lat/lon positions of each file
+    workers : int or None, optional
+        Number of parallel workers, defaults to the executor's default
+    processes : bool, optional
+        Whether to use a process pool instead of a thread pool, default False.
+        Processes avoid the HDF5 lock that serializes NetCDF reads between threads.
+    ``**kwargs``
+        Additional keyword arguments passed to Data constructor
+
+    Returns
+    -------
+    Data
+        New Data object containing the variables of all files
+
+    Raises
+    ------
+    ValueError
+        If no files match the paths
+    """
+    if isinstance(paths, (str, Path)):
+        paths = sorted(glob.glob(str(paths)))
+    paths = [str(path) for path in paths]
+    if not paths:
+        raise ValueError('No NetCDF files found')
+
+    executor_class = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with executor_class(max_workers=workers) as executor:
+        arrays = list(executor.map(_read_netcdf_arrays, paths, [mapped_variables] * len(paths), [interp_glider] * len(paths)))
+
+    data = Data(**_concatenate_arrays(arrays), **kwargs)
+    return data
@@ -0,0 +1,71 @@
+import unittest
+import threading
+import pickle
+import numpy as np
+
+from gerg_plotting.data_classes.array_cache import ArrayCache
+
+
+class TestArrayCache(unittest.TestCase):
+    def setUp(self):
+        """Set up a cache that holds two 800 byte entries."""
+        self.cache = ArrayCache(max_bytes=2_000)
+
+    def test_hit_and_miss(self):
+        """Test that lookups are counted and stored arrays are read-only."""
+        self.assertIsNone(self.cache.get('a'))
+        arrays = self.cache.put('a', (np.zeros(100), np.ones(100)))
+        self.assertIs(self.cache.get('a'), arrays)
+        self.assertFalse(arrays[0].flags.writeable)
+        with self.assertRaises(ValueError):
+            arrays[0][0] = 1
+        self.assertEqual(self.cache.info()['hits'], 1)
+        self.assertEqual(self.cache.info()['misses'], 1)
+        self.assertEqual(self.cache.nbytes, 1_600)
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted when over the size cap."""
+        self.cache.put('a', (np.zeros(100),))
+        self.cache.put('b', (np.zeros(100),))
+        self.cache.get('a')
+        self.cache.put('c', (np.zeros(100),))
+        self.assertIsNone(self.cache.get('b'))
+        self.assertIsNotNone(self.cache.get('a'))
+        self.assertEqual(self.cache.info()['evictions'], 1)
+        self.assertLessEqual(self.cache.nbytes, self.cache.max_bytes)
+
+    def test_oversized_entry(self):
+        """Test that entries larger than the cap are returned but not stored."""
+        arrays = self.cache.put('big', (np.zeros(1_000),))
+        self.assertEqual(len(arrays[0]), 1_000)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_clear(self):
+        """Test that clear removes entries and statistics."""
+        self.cache.put('a', (np.zeros(10),))
+        self.cache.get('a')
+        self.cache.clear()
+        self.assertEqual(self.cache.info(), {'hits': 0, 'misses': 0, 'evictions': 0, 'entries': 0, 'nbytes': 0, 'max_bytes': 2_000})
+
+    def test_threads(self):
+        """Test concurrent use keeps the size accounting consistent."""
+        def worker(offset):
+            for idx in range(200):
+                key = (offset + idx) % 7
+                if self.cache.get(key) is None:
+                    self.cache.put(key, (np.zeros(50),))
+        threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.cache.nbytes, 400 * len(self.cache))
+
+    def test_pickle(self):
+        """Test that a pickled cache comes back empty with its size cap and a working lock."""
+        self.cache.put('a', (np.zeros(100),))
+        cache = pickle.loads(pickle.dumps(self.cache))
+        self.assertEqual(cache.max_bytes, 2_000)
+        self.assertEqual(len(cache), 0)
+        cache.put('b', (np.zeros(100),))
+        self.assertEqual(cache.nbytes, 800)
@@ -1,8 +1,15 @@
 import unittest
+import tempfile
+import os
+import sys
+import errno
+from pathlib import Path
+import matplotlib.pyplot
+import numpy as np
 from matplotlib.colors import Colormap
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock,patch
 
-from gerg_plotting.data_classes.bathy import Bathy
+from gerg_plotting.data_classes.bathy import Bathy,bathy_cache,get_seafloor_store,get_user_cache_dir
 from gerg_plotting.data_classes.bounds import Bounds
 
 class TestBathy(unittest.TestCase):
@@ -87,3 +94,94 @@ class TestBathy(unittest.TestCase):
         mappable_mock = MagicMock()
         self.bathy.add_colorbar(fig_mock, divider_mock, mappable_mock, nrows=1)
         self.assertIsNotNone(self.bathy.cbar)
+
+    def test_auto_resolution(self):
+        """Test that an automatic resolution level reads roughly the target number of cells."""
+        bathy = Bathy(bounds=self.bounds, resolution_level='auto', target_resolution=50)
+        self.assertGreaterEqual(bathy.depth.shape[1], 50)
+        self.assertLess(bathy.depth.shape[1], 4 * 50)
+        self.assertEqual(bathy.depth.shape, (len(bathy.lat), len(bathy.lon)))
+
+    def test_cache(self):
+        """Test that Bathy objects with the same bounds share read-only cached arrays."""
+        bathy_cache.clear()
+        first = Bathy(bounds=self.bounds)
+        second = Bathy(bounds=self.bounds)
+        self.assertIs(second.depth, first.depth)
+        self.assertFalse(second.depth.flags.writeable)
+        self.assertGreater(bathy_cache.info()['hits'], 0)
+        scaled = Bathy(bounds=Bounds(lat_min=25, lat_max=30, lon_min=-95, lon_max=-90, depth_bottom=1000, depth_top=0, vertical_scalar=-1))
+        np.testing.assert_array_equal(scaled.depth, -first.depth)
+        # get_bathy returns the unscaled depth
+        np.testing.assert_array_equal(scaled.get_bathy()[2], first.depth)
+
+    def test_coordinates_are_1d(self):
+        """Test that coordinates stay 1D and the meshgrid is only built on request."""
+        self.assertEqual(self.bathy.lon.ndim, 1)
+        self.assertEqual(self.bathy.depth.shape, (len(self.bathy.lat), len(self.bathy.lon)))
+        lon_grid, lat_grid = self.bathy.get_meshgrid()
+        self.assertEqual(lon_grid.shape, self.bathy.depth.shape)
+        np.testing.assert_array_equal(lat_grid[:, 0], self.bathy.lat)
+
+    def test_raster_matches_contourf(self):
+        """Test that the raster colors each cell like the contourf band it falls in."""
+        bathy = Bathy(bounds=self.bounds, raster=True)
+        rgba, extent, mappable = bathy.get_raster()
+        self.assertEqual(rgba.shape, bathy.depth.shape + (4,))
+        self.assertLess(extent[0], bathy.lon[0])
+        fig, ax = matplotlib.pyplot.subplots()
+        contour_set = ax.contourf(bathy.lon, bathy.lat, bathy.depth, levels=bathy.contour_levels,
+                                  cmap=bathy.cmap, vmin=bathy.vmin, extend='both')
+        np.testing.assert_array_equal(mappable.norm.boundaries, contour_set.levels)
+        # Cells inside a band get the color contourf gives that band
+        band = np.digitize(bathy.depth, contour_set.levels)
+        expected = contour_set.to_rgba(contour_set.layers)[band]
+        inside = ~np.isin(bathy.depth, contour_set.levels)
+        # The raster holds 8-bit colors, so they match to within one step
+        np.testing.assert_allclose(rgba[inside] / 255, expected[inside], rtol=0, atol=1/255)
+        matplotlib.pyplot.close(fig)
+
+    def test_raster_disk_cache(self):
+        """Test that rasters are cached on disk and reused."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            bathy = Bathy(bounds=self.bounds, raster=True, raster_cache_dir=tmpdir)
+            rgba = bathy.get_raster()[0]
+            self.assertEqual(len(os.listdir(tmpdir)), 1)
+            cached, _, mappable = Bathy(bounds=self.bounds, raster=True, raster_cache_dir=tmpdir).get_raster()
+            np.testing.assert_array_equal(cached, rgba)
+            self.assertEqual(len(os.listdir(tmpdir)), 1)
+            # A different number of levels is cached separately
+            Bathy(bounds=self.bounds, raster=True, raster_cache_dir=tmpdir, contour_levels=10).get_raster()
+            self.assertEqual(len(os.listdir(tmpdir)), 2)
+            # A different depth grid for the same bounds is cached separately
+            bathy.depth = bathy.depth / 2
+            bathy.get_raster()
+            self.assertEqual(len(os.listdir(tmpdir)), 3)
+
+class TestSeafloorStore(unittest.TestCase):
+    def test_user_cache_dir(self):
+        """Test that the cache directory follows XDG_CACHE_HOME."""
+        with tempfile.TemporaryDirectory() as tmpdir, patch.dict(os.environ, {'XDG_CACHE_HOME': tmpdir, 'LOCALAPPDATA': tmpdir}):
+            self.assertEqual(get_user_cache_dir(), Path(tmpdir) / 'gerg_plotting')
+
+    def test_read_only_cache_dir(self):
+        """Test that the pyramid is built in the temporary directory when the cache directory cannot be written."""
+        module = sys.modules[get_seafloor_store.__module__]
+        built = []
+        def build(elevation, lat, lon, path, attrs):
+            if not built:
+                built.append(path)
+                raise OSError(errno.EROFS, 'Read-only file system')
+            built.append(path)
+            return path
+        with tempfile.TemporaryDirectory() as tmpdir, patch.object(module, 'get_user_cache_dir', return_value=Path(tmpdir) / 'cache'), \
+                patch.object(module, 'tempfile', MagicMock(gettempdir=lambda: tmpdir)), \
+                patch.object(module.TilePyramid, 'open', side_effect=FileNotFoundError), \
+                patch.object(module.TilePyramid, 'build', side_effect=build):
+            get_seafloor_store.cache_clear()
+            try:
+                self.assertEqual(get_seafloor_store(), Path(tmpdir) / 'gerg_plotting_seafloor_tiles')
+            finally:
+                get_seafloor_store.cache_clear()
+        self.assertEqual(built[0], Path(tmpdir) / 'cache' / 'seafloor_tiles')
+
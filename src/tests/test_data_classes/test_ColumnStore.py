@@ -0,0 +1,49 @@
+import unittest
+import numpy as np
+
+from gerg_plotting.data_classes.column_store import ColumnStore
+
+
+class TestColumnStore(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.arrays = {
+            'lat': np.array([1.0, 2.0, 3.0, 4.0]),
+            'lon': np.array([5.0, 6.0, 7.0, 8.0]),
+            'time': np.array(['2023-01-01', '2023-01-02', '2023-01-03', '2023-01-04'], dtype='datetime64[ns]'),
+        }
+        self.store = ColumnStore.from_arrays(self.arrays)
+
+    def test_from_arrays(self):
+        """Test that columns sharing a dtype are packed into one block."""
+        self.assertEqual(len(self.store), 4)
+        self.assertEqual(len(self.store.blocks), 2)
+        for name, values in self.arrays.items():
+            np.testing.assert_array_equal(self.store.columns[name], values)
+            self.assertTrue(self.store.columns[name].flags.c_contiguous)
+
+    def test_from_arrays_mismatched_lengths(self):
+        """Test that columns of different lengths are rejected."""
+        with self.assertRaises(ValueError):
+            ColumnStore.from_arrays({'lat': np.zeros(3), 'lon': np.zeros(4)})
+
+    def test_take_slice(self):
+        """Test that slicing rows returns views."""
+        result = self.store.take(slice(1, 3))
+        np.testing.assert_array_equal(result.columns['lon'], np.array([6.0, 7.0]))
+        self.assertTrue(np.shares_memory(result.columns['lon'], self.store.columns['lon']))
+
+    def test_take_mask(self):
+        """Test that boolean masks and index arrays select the same rows."""
+        mask = np.array([True, False, True, False])
+        by_mask = self.store.take(mask)
+        by_index = self.store.take(np.array([0, 2]))
+        for name in self.arrays:
+            np.testing.assert_array_equal(by_mask.columns[name], self.arrays[name][mask])
+            np.testing.assert_array_equal(by_index.columns[name], self.arrays[name][mask])
+
+    def test_owns(self):
+        """Test detection of reassigned columns."""
+        self.assertTrue(self.store.owns('lat', self.store.columns['lat']))
+        self.assertFalse(self.store.owns('lat', self.arrays['lat']))
+        self.assertFalse(self.store.owns('depth', self.arrays['lat']))
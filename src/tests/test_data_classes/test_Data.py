@@ -4,6 +4,11 @@ from unittest.mock import MagicMock
 import cmocean
 from datetime import datetime
 import pytest
+import timeit
+import tempfile
+import os
+import pickle
+from attrs import asdict
 
 from gerg_plotting.data_classes.data import Data
 from gerg_plotting.data_classes.variable import Variable
@@ -54,6 +59,75 @@ class TestData(unittest.TestCase):
         self.data.calculate_speed(include_w=True)
         np.testing.assert_array_almost_equal(self.data.speed.data, np.array([5.0, 5.0]))
         
+    def test_calculate_speed_memoized(self):
+        """Test that a calculated speed is reused and recalculated once the velocity changes."""
+        self.data.u = Variable(data=np.array([3.0, 4.0]), name='u')
+        self.data.v = Variable(data=np.array([4.0, 3.0]), name='v')
+        self.data.calculate_speed()
+        speed = self.data.speed
+        self.data.calculate_speed()
+        self.assertIs(self.data.speed, speed)
+        # The calculated speed is the user's to change, the memo keeps its own copy
+        self.data.speed.data[0] = 10.0
+        np.testing.assert_array_equal(self.data.get_derived('speed', ['u', 'v'], None), [5.0, 5.0])
+        # Copies keep the memo and recalculate their own speed once their velocity changes
+        copied_data = self.data.copy()
+        copied_data.v.data = np.array([0.0, 0.0])
+        copied_data.calculate_speed()
+        np.testing.assert_array_almost_equal(copied_data.speed.data, np.array([3.0, 4.0]))
+        self.data.u.data = np.array([0.0, 0.0])
+        self.data.calculate_speed()
+        np.testing.assert_array_almost_equal(self.data.speed.data, np.array([4.0, 3.0]))
+
+    def test_calculate_speed_provided(self):
+        """Test that a provided speed is not replaced."""
+        self.data.u = Variable(data=np.array([3.0, 4.0]), name='u')
+        self.data.v = Variable(data=np.array([4.0, 3.0]), name='v')
+        self.data.speed = Variable(data=np.array([1.0, 1.0]), name='speed')
+        self.data.calculate_speed()
+        np.testing.assert_array_equal(self.data.speed.data, np.array([1.0, 1.0]))
+
+    def test_get_derived(self):
+        """Test that derived values are memoized until a source variable holds a new array."""
+        calls = []
+        def total(lat, lon):
+            calls.append(1)
+            return lat + lon
+        first = self.data.get_derived('total', ['lat', 'lon'], total)
+        self.assertIs(self.data.get_derived('total', ['lat', 'lon'], total), first)
+        self.assertEqual(len(calls), 1)
+        self.data.lat.data = self.data.lat.data + 1
+        np.testing.assert_array_equal(self.data.get_derived('total', ['lat', 'lon'], total), first + 1)
+        self.assertEqual(len(calls), 2)
+        # Data changed in place is recalculated once it is reassigned
+        lat = self.data.lat.data
+        lat += 1
+        self.data.lat.data = lat
+        np.testing.assert_array_equal(self.data.get_derived('total', ['lat', 'lon'], total), first + 2)
+        self.assertEqual(len(calls), 3)
+        # Appending renews the version even when the rows are written into the same buffer
+        version = self.data.lat.version
+        self.data.append({'lat': [4.0], 'lon': [4.0], 'depth': [4.0]})
+        self.assertNotEqual(self.data.lat.version, version)
+        self.assertEqual(len(self.data.get_derived('total', ['lat', 'lon'], total)), 4)
+        self.assertEqual(len(calls), 4)
+
+    def test_pickle(self):
+        """Test that Data with memoized derived values round-trips through pickle."""
+        self.data.get_derived('total', ['lat', 'lon'], lambda lat, lon: lat + lon)
+        loaded = pickle.loads(pickle.dumps(self.data))
+        np.testing.assert_array_equal(loaded.lat.data, self.data.lat.data)
+        np.testing.assert_array_equal(loaded.get_derived('total', ['lat', 'lon'], lambda lat, lon: lat + lon), [2.0, 4.0, 6.0])
+
+    def test_get_derived_bounded(self):
+        """Test that memoized derived values are evicted once they outgrow the memo."""
+        self.data._derived.max_bytes = 100
+        for idx in range(10):
+            self.data.lat.data = np.arange(10.0) + idx
+            self.data.get_derived('double', ['lat'], lambda lat: lat * 2)
+        self.assertLessEqual(self.data._derived.nbytes, 100)
+        self.assertLessEqual(len(self.data._derived), 1)
+
     def test_psd_with_w(self):
         """Test PSD calculation with w component."""
         self.data.u = Variable(data=np.array([3.0, 4.0]), name='u')
@@ -176,6 +250,34 @@ class TestData(unittest.TestCase):
         np.testing.assert_array_equal(result.lat.data, self.test_data[0:2])
         np.testing.assert_array_equal(result.lon.data, self.test_data[0:2])
 
+    def test_getitem_slice_is_view(self):
+        """Test that slicing shares array memory and metadata instead of copying."""
+        result = self.data[0:2]
+        self.assertTrue(np.shares_memory(result.lat.data, self.data.lat.data))
+        self.assertIs(result.lat.cmap, self.data.lat.cmap)
+        self.assertEqual(result.lat.vmax, self.data.lat.vmax)
+
+    def test_getitem_boolean_mask(self):
+        """Test row selection with a boolean mask."""
+        data = Data(lat=self.test_data, lon=self.test_data, depth=self.test_data)
+        mask = self.test_data > 1.5
+        result = data[mask]
+        np.testing.assert_array_equal(result.lat.data, self.test_data[mask])
+        np.testing.assert_array_equal(result.depth.data, self.test_data[mask])
+
+    def test_getitem_index_array(self):
+        """Test row selection with an integer index array."""
+        data = Data(lat=self.test_data, lon=self.test_data)
+        result = data[np.array([2, 0])]
+        np.testing.assert_array_equal(result.lon.data, self.test_data[[2, 0]])
+
+    def test_getitem_slice_custom_variable(self):
+        """Test that custom variables are carried through slicing."""
+        self.data.add_custom_variable(Variable(data=self.test_data * 3, name='custom_var', units='K'))
+        result = self.data[1:]
+        np.testing.assert_array_equal(result.custom_var.data, self.test_data[1:] * 3)
+        self.assertEqual(result['custom_var'].units, 'K')
+
     def test_setitem(self):
         """Test variable assignment via indexing."""
         new_var = Variable(data=np.array([4.0, 5.0]), name='lat')
@@ -242,8 +344,255 @@ class TestData(unittest.TestCase):
         self.assertIsInstance(repr_str, str)
         self.assertIn('lat', repr_str)
         self.assertIn('lon', repr_str)
+        # Variables show their public limits, not their internal state
+        self.assertIn(f"'vmin': {self.data.lat.vmin!r}", repr_str)
+        self.assertNotIn('_vmin', repr_str)
+        self.assertNotIn('_sketch', repr_str)
+        self.assertNotIn('_version', repr_str)
 
     def test_format_datetime(self):
         """Test datetime formatting."""
         formatted_time = self.data.time.data
         self.assertEqual(formatted_time.dtype.kind, 'M')
+
+    def test_columnar_slice_returns_views(self):
+        """Test that slicing columnar data returns views into the shared store."""
+        data = Data(lat=self.test_data, lon=self.test_data * 2, depth=self.test_data, columnar=True)
+        result = data[0:2]
+        self.assertTrue(result.columnar)
+        np.testing.assert_array_equal(result.lon.data, self.test_data[0:2] * 2)
+        self.assertTrue(np.shares_memory(result.lat.data, data.lat.data))
+        self.assertEqual(result.lat.vmin, data.lat.vmin)
+
+    def test_columnar_getitem_list(self):
+        """Test index list selection on columnar data."""
+        data = Data(lat=self.test_data, lon=self.test_data * 2, columnar=True)
+        result = data[[0, 2]]
+        np.testing.assert_array_equal(result.lat.data, self.test_data[[0, 2]])
+        np.testing.assert_array_equal(result.lon.data, self.test_data[[0, 2]] * 2)
+
+    def test_columnar_mismatched_lengths(self):
+        """Test that columnar data requires all variables to share length."""
+        with self.assertRaises(ValueError):
+            Data(lat=self.test_data, lon=self.test_data[:2], columnar=True)
+
+    def test_columnar_rebuilds_after_reassignment(self):
+        """Test that reassigning variable data is picked up by the columnar store."""
+        data = Data(lat=self.test_data, lon=self.test_data, columnar=True)
+        data.lat.data = np.array([7.0, 8.0, 9.0])
+        np.testing.assert_array_equal(data[1:].lat.data, np.array([8.0, 9.0]))
+
+    def test_memmap_variables_stay_lazy(self):
+        """Test that memory-mapped data is not loaded into memory or packed into the column store."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            lat = np.memmap(os.path.join(tmpdir, 'lat.dat'), dtype='float64', mode='w+', shape=(1000,))
+            lat[:] = np.linspace(20, 30, 1000)
+            data = Data(lat=lat, lon=np.linspace(-95, -85, 1000), columnar=True)
+            self.assertIsInstance(data.lat.data, np.memmap)
+            self.assertAlmostEqual(data.lat.vmin, np.nanpercentile(lat, 1), delta=0.1)
+            self.assertEqual(data.detect_bounds().lat_max, 30)
+            result = data[::10]
+            self.assertIsInstance(result.lat.data, np.memmap)
+            self.assertNotIn('lat', result._column_store)
+            del lat, data, result
+
+    def test_dask_variables_stay_lazy(self):
+        """Test that chunked data stays lazy through initialization, limits, bounds and slicing."""
+        da = pytest.importorskip('dask.array')
+        data = Data(lat=da.from_array(np.linspace(20, 30, 1000), chunks=100),
+                    lon=np.linspace(-95, -85, 1000))
+        self.assertIsInstance(data.lat.data, da.Array)
+        self.assertAlmostEqual(data.lat.vmax, 29.9, delta=0.1)
+        self.assertEqual(data.detect_bounds().lat_min, 20)
+        self.assertIsInstance(data[::10].lat.data, da.Array)
+        # Slicing carries the known limits without computing the missing ones
+        data = Data(lat=da.from_array(np.linspace(20, 30, 1000), chunks=100), lon=np.linspace(-95, -85, 1000))
+        data.lat.vmin = 21
+        subset = data[::10]
+        self.assertIsNone(data.lat._limits)
+        self.assertEqual(subset.lat.vmin, 21)
+
+    def test_float_dtype(self):
+        """Test that the float_dtype policy is applied to numeric variables but not time."""
+        data = Data(lat=self.test_data, lon=[1, 2, 3], temperature=self.test_data,
+                    time=np.array([datetime(2023, 1, 1), datetime(2023, 1, 2), datetime(2023, 1, 3)]),
+                    float_dtype='float32')
+        self.assertEqual(data.lat.data.dtype, np.float32)
+        self.assertEqual(data.lon.data.dtype, np.float32)
+        self.assertEqual(data.temperature.data.dtype, np.float32)
+        self.assertEqual(data.time.data.dtype, np.dtype('datetime64[ns]'))
+        data.add_custom_variable(Variable(data=self.test_data, name='custom_var'))
+        self.assertEqual(data.custom_var.data.dtype, np.float32)
+        self.assertEqual(data[0:2].lat.data.dtype, np.float32)
+        self.assertNotIn('float_dtype', data.get_vars())
+
+    def test_npz_round_trip(self):
+        """Test that to_npz and from_npz round-trip variables, metadata and bounds."""
+        data = Data(lat=self.test_data, lon=self.test_data, temperature=[10.0, 12.0, 14.0],
+                    time=np.array([datetime(2023, 1, 1), datetime(2023, 1, 2), datetime(2023, 1, 3)]),
+                    bounds=Bounds(lat_min=0, lat_max=5, lon_min=-5, lon_max=5))
+        data.temperature.vmin = 11
+        data.temperature.label = 'Temp'
+        data.add_custom_variable(Variable(data=[4.0, 5.0, 6.0], name='custom_var', units='K', cmap=cmocean.cm.amp))
+        expected_vmax = data.lat.vmax
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, 'data.npz')
+            data.to_npz(filename)
+            loaded = Data.from_npz(filename)
+        np.testing.assert_array_equal(loaded.time.data, data.time.data)
+        np.testing.assert_array_equal(loaded.custom_var.data, [4.0, 5.0, 6.0])
+        self.assertEqual(loaded.temperature.vmin, 11)
+        self.assertEqual(loaded.temperature.label, 'Temp')
+        self.assertEqual(loaded.temperature.cmap.name, cmocean.cm.thermal.name)
+        self.assertEqual(loaded.custom_var.units, 'K')
+        self.assertEqual(loaded.custom_var.cmap.name, cmocean.cm.amp.name)
+        self.assertEqual(loaded.lat._limits, (data.lat.vmin, expected_vmax))
+        self.assertEqual(loaded.bounds, data.bounds)
+
+    def test_npz_round_trip_window(self):
+        """Test that to_npz and from_npz keep the max_rows and max_span window."""
+        data = Data(lat=self.test_data, time=np.array([datetime(2023, 1, 1), datetime(2023, 1, 2), datetime(2023, 1, 3)]),
+                    max_rows=3, max_span=np.timedelta64(2, 'D'))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, 'data.npz')
+            data.to_npz(filename)
+            loaded = Data.from_npz(filename)
+        self.assertEqual(loaded.max_rows, 3)
+        self.assertEqual(loaded.max_span, np.timedelta64(2, 'D'))
+        loaded.append({'lat': [4.0], 'time': np.array([datetime(2023, 1, 4)])})
+        np.testing.assert_array_equal(loaded.lat.data, [2.0, 3.0, 4.0])
+
+    def test_append(self):
+        """Test that append grows buffers in place and updates limits and detected bounds."""
+        data = Data(lat=[1.0, 2.0], lon=[3.0, 4.0], temperature=[10.0, 11.0],
+                    time=np.array([datetime(2023, 1, 1), datetime(2023, 1, 2)]))
+        data.detect_bounds()
+        data.append({'lat': [5.0], 'lon': [0.0], 'temperature': [30.0], 'time': np.array([datetime(2023, 1, 3)])})
+        np.testing.assert_array_equal(data.lat.data, [1.0, 2.0, 5.0])
+        self.assertEqual(data.time.data.dtype, np.dtype('datetime64[ns]'))
+        self.assertEqual(data.bounds.lat_max, 5.0)
+        self.assertEqual(data.bounds.lon_min, 0.0)
+        self.assertEqual(data.temperature.vmax, 30.0)
+        # Appends within the buffer capacity write into the same buffer
+        buffer = data.lat.data.base
+        data.append(Data(lat=[6.0], lon=[1.0], temperature=[12.0], time=np.array([datetime(2023, 1, 4)])))
+        self.assertIs(data.lat.data.base, buffer)
+        self.assertEqual(len(data.time.data), 4)
+        # User bounds are left alone
+        data.bounds = Bounds(lat_min=0, lat_max=10)
+        data.append({'lat': [20.0], 'lon': [1.0], 'temperature': [12.0], 'time': np.array([datetime(2023, 1, 5)])})
+        self.assertEqual(data.bounds.lat_max, 10)
+        with self.assertRaises(ValueError):
+            data.append({'lat': [1.0]})
+
+    def test_append_to_empty(self):
+        """Test that appending to an empty Data takes the new rows as its variables."""
+        data = Data(float_dtype='float32')
+        data.append({'lat': [1.0, 2.0], 'temperature': [10.0, 11.0], 'time': np.array([datetime(2023, 1, 1), datetime(2023, 1, 2)])})
+        np.testing.assert_array_equal(data.lat.data, [1.0, 2.0])
+        self.assertEqual(data.lat.data.dtype, np.float32)
+        self.assertEqual(data.time.data.dtype, np.dtype('datetime64[ns]'))
+        self.assertEqual(data.temperature.cmap, cmocean.cm.thermal)
+        data.append({'lat': [3.0], 'temperature': [12.0], 'time': np.array([datetime(2023, 1, 3)])})
+        np.testing.assert_array_equal(data.temperature.data, [10.0, 11.0, 12.0])
+        # Appending a Data keeps its custom variables and leaves its Variables alone
+        source = Data(lat=[1.0, 2.0])
+        source.add_custom_variable(Variable(data=[4.0, 5.0], name='custom_var'))
+        data = Data()
+        data.append(source)
+        np.testing.assert_array_equal(data.custom_var.data, [4.0, 5.0])
+        self.assertIsNot(data.lat, source.lat)
+        with self.assertRaises(ValueError):
+            Data().append({'not_a_var': [1.0]})
+        with self.assertRaises(ValueError):
+            Data().append({'lat': [1.0], 'lon': [1.0, 2.0]})
+
+    def test_append_amortized(self):
+        """Test that many small appends reallocate the buffers only a logarithmic number of times."""
+        data = Data(lat=[0.0], lon=[0.0])
+        buffers = set()
+        for idx in range(1, 1_000):
+            data.append({'lat': [float(idx)], 'lon': [float(idx)]})
+            buffers.add(id(data.lat.data.base))
+        np.testing.assert_array_equal(data.lat.data, np.arange(1_000))
+        self.assertLess(len(buffers), 12)
+        self.assertAlmostEqual(data.lat.vmax, 989, delta=10)
+
+    def test_append_then_reassign(self):
+        """Test that reassigning the data after appending drops the quantile sketch of the old data."""
+        data = Data(lat=np.arange(10.0), lon=np.arange(10.0))
+        data.append({'lat': np.arange(10.0, 20.0), 'lon': np.arange(10.0, 20.0)})
+        self.assertIsNotNone(data.lat.sketch)
+        data.lat.data = np.array([100.0, 200.0, 300.0])
+        self.assertIsNone(data.lat.sketch)
+        self.assertEqual(data.lat.vmin, np.nanpercentile([100.0, 200.0, 300.0], 1))
+        self.assertEqual(data.lat.vmax, np.nanpercentile([100.0, 200.0, 300.0], 99))
+        # Recomputing the limits ignores the sketch and uses the data
+        data.lon.get_vmin_vmax(ignore_existing=True)
+        self.assertIsNone(data.lon.sketch)
+        self.assertEqual(data.lon.vmax, np.nanpercentile(np.arange(20.0), 99))
+
+    def test_max_rows_window(self):
+        """Test that max_rows keeps a contiguous window of the newest rows in constant memory."""
+        data = Data(lat=np.arange(5.0), lon=np.arange(5.0), max_rows=3)
+        np.testing.assert_array_equal(data.lat.data, [2.0, 3.0, 4.0])
+        buffers = set()
+        for idx in range(5, 500):
+            data.append({'lat': [float(idx)], 'lon': [float(idx)]})
+            buffers.add(id(data.lat.data.base))
+            self.assertTrue(data.lat.data.flags['C_CONTIGUOUS'])
+        np.testing.assert_array_equal(data.lat.data, [497.0, 498.0, 499.0])
+        self.assertEqual(data.lat.vmin, np.nanpercentile([497.0, 498.0, 499.0], 1))
+        self.assertEqual(len(buffers), 1)
+        self.assertLessEqual(len(data.lat.data.base), 16)
+        self.assertNotIn('max_rows', data.get_vars())
+
+    def test_max_span_window(self):
+        """Test that max_span evicts rows older than the time span."""
+        times = np.datetime64('2023-01-01T00') + np.arange(6) * np.timedelta64(1, 'h')
+        data = Data(lat=np.arange(6.0), time=times, max_span=np.timedelta64(2, 'h'))
+        np.testing.assert_array_equal(data.lat.data, [3.0, 4.0, 5.0])
+        data.append({'lat': [6.0, 7.0], 'time': times[-1] + np.array([1, 2]) * np.timedelta64(1, 'h')})
+        np.testing.assert_array_equal(data.lat.data, [5.0, 6.0, 7.0])
+        with self.assertRaises(ValueError):
+            Data(lat=np.arange(6.0), max_span=np.timedelta64(2, 'h'))
+
+    def test_window_subset(self):
+        """Test that row selections keep the max_rows and max_span window."""
+        times = np.datetime64('2023-01-01T00') + np.arange(6) * np.timedelta64(1, 'h')
+        data = Data(lat=np.arange(6.0), time=times, max_rows=3, max_span=np.timedelta64(2, 'h'))
+        subset = data[1:]
+        self.assertEqual(subset.max_rows, 3)
+        self.assertEqual(subset.max_span, np.timedelta64(2, 'h'))
+        subset.append({'lat': [6.0, 7.0], 'time': times[-1] + np.array([1, 2]) * np.timedelta64(1, 'h')})
+        np.testing.assert_array_equal(subset.lat.data, [5.0, 6.0, 7.0])
+
+    def test_max_span_window_nat(self):
+        """Test that a NaT time does not evict the whole max_span window."""
+        times = np.datetime64('2023-01-01T00') + np.arange(6) * np.timedelta64(1, 'h')
+        data = Data(lat=np.arange(6.0), time=times, max_span=np.timedelta64(2, 'h'))
+        data.append({'lat': [6.0], 'time': np.array([np.datetime64('NaT')])})
+        np.testing.assert_array_equal(data.lat.data, [3.0, 4.0, 5.0, 6.0])
+        # Only NaT times leave the window alone
+        data = Data(lat=np.arange(3.0), time=np.full(3, np.datetime64('NaT', 'ns')), max_span=np.timedelta64(2, 'h'))
+        np.testing.assert_array_equal(data.lat.data, [0.0, 1.0, 2.0])
+
+    def test_max_span_window_unsorted(self):
+        """Test that max_span measures the span from the newest time when times are out of order."""
+        hours = np.array([0, 1, 5, 2, 3])
+        times = np.datetime64('2023-01-01T00') + hours * np.timedelta64(1, 'h')
+        data = Data(lat=hours.astype(float), time=times, max_span=np.timedelta64(2, 'h'))
+        # The newest time is 05:00, rows are dropped up to the first one at or after 03:00
+        np.testing.assert_array_equal(data.lat.data, [5.0, 2.0, 3.0])
+
+
+@pytest.mark.slow
+def test_has_var_benchmark():
+    """Microbenchmark: registry lookups on a 1M-row Data against the asdict based lookup."""
+    n = 1_000_000
+    data = Data(lat=np.random.rand(n), lon=np.random.rand(n), depth=np.random.rand(n),
+                temperature=np.random.rand(n), salinity=np.random.rand(n))
+    registry_time = timeit.timeit(lambda: data._has_var('salinity'), number=2_000)
+    asdict_time = timeit.timeit(lambda: 'salinity' in asdict(data).keys() or 'salinity' in data.custom_variables, number=2_000)
+    print(f"registry: {registry_time:.4f}s, asdict: {asdict_time:.4f}s, speedup: {asdict_time/registry_time:.0f}x")
+    assert registry_time * 10 < asdict_time
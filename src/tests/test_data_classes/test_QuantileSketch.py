@@ -0,0 +1,59 @@
+import unittest
+import numpy as np
+
+from gerg_plotting.data_classes.quantile_sketch import QuantileSketch
+from gerg_plotting.data_classes.variable import Variable
+
+
+class TestQuantileSketch(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.values = np.random.default_rng(1).normal(size=200_000)
+
+    def test_quantiles_from_chunks(self):
+        """Test that quantiles built from chunks are close to the exact quantiles."""
+        sketch = QuantileSketch()
+        for chunk in np.array_split(self.values, 20):
+            sketch.update(chunk)
+        self.assertEqual(sketch.count, self.values.size)
+        lower, upper = sketch.quantile([0.01, 0.99])
+        # Compare ranks rather than values, the sketch guarantees rank accuracy
+        self.assertAlmostEqual(np.mean(self.values <= lower), 0.01, delta=0.01)
+        self.assertAlmostEqual(np.mean(self.values <= upper), 0.99, delta=0.01)
+
+    def test_bounded_memory(self):
+        """Test that the sketch retains far fewer values than it was fed."""
+        sketch = QuantileSketch(k=100)
+        sketch.update(self.values)
+        self.assertLess(sketch.size, 2_000)
+
+    def test_merge(self):
+        """Test that merged sketches describe the union of their values."""
+        first, second = QuantileSketch(), QuantileSketch()
+        first.update(self.values[:100_000])
+        second.update(self.values[100_000:] + 10)
+        merged = first.merge(second)
+        self.assertEqual(merged.count, self.values.size)
+        median = merged.quantile(0.5)
+        combined = np.concatenate([self.values[:100_000], self.values[100_000:] + 10])
+        self.assertAlmostEqual(np.mean(combined <= median), 0.5, delta=0.01)
+
+    def test_ignores_nan(self):
+        """Test that NaNs are not counted."""
+        sketch = QuantileSketch().update(np.array([1.0, np.nan, 3.0]))
+        self.assertEqual(sketch.count, 2)
+
+    def test_empty(self):
+        """Test that an empty sketch returns NaN."""
+        self.assertTrue(np.isnan(QuantileSketch().quantile(0.5)))
+
+    def test_variable_limits_from_sketch(self):
+        """Test that Variable uses its sketch for vmin and vmax."""
+        variable = Variable(data=np.zeros(3), name='temperature')
+        for chunk in np.array_split(self.values, 4):
+            variable.update_sketch(chunk)
+        self.assertAlmostEqual(np.mean(self.values <= variable.vmin), 0.01, delta=0.01)
+        self.assertAlmostEqual(np.mean(self.values <= variable.vmax), 0.99, delta=0.01)
+        other = Variable(data=np.zeros(3), name='temperature')
+        other.merge_sketch(variable.sketch)
+        self.assertEqual(other.vmax, variable.vmax)
@@ -0,0 +1,85 @@
+import unittest
+import tempfile
+import os
+import numpy as np
+import xarray as xr
+
+from gerg_plotting.data_classes.tile_store import TileStore,TilePyramid
+
+
+class TestTileStore(unittest.TestCase):
+    def setUp(self):
+        """Build a small store with tiles that do not evenly divide the grid."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.lat = np.linspace(20, 30, 53)
+        self.lon = np.linspace(-98, -80, 71)
+        self.values = np.random.default_rng(0).random((53, 71)).astype('float32')
+        self.store = TileStore.build(self.values, self.lat, self.lon, os.path.join(self.tmpdir.name, 'tiles'), tile_size=16)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_read_matches_sel(self):
+        """Test that bounds queries match xarray's label based selection."""
+        da = xr.DataArray(self.values, coords={'lat': self.lat, 'lon': self.lon}, dims=('lat', 'lon'))
+        for bounds in [(22.1, 27.3, -95, -90.5), (None, 21, -85, None), (20, 30, -98, -80)]:
+            lat, lon, values = self.store.read(*bounds)
+            expected = da.sel(lat=slice(bounds[0], bounds[1]), lon=slice(bounds[2], bounds[3]))
+            np.testing.assert_array_equal(lat, expected.lat.values)
+            np.testing.assert_array_equal(lon, expected.lon.values)
+            np.testing.assert_array_equal(values, expected.values)
+
+    def test_reads_only_intersecting_tiles(self):
+        """Test that only the tiles intersecting the bounds are opened."""
+        self.store.read(20, 20.5, -98, -97.5)
+        self.assertEqual(list(self.store._tiles), [(0, 0)])
+
+    def test_open_and_descending(self):
+        """Test reopening a store and that descending coordinates are stored ascending."""
+        path = os.path.join(self.tmpdir.name, 'descending')
+        TileStore.build(self.values[::-1], self.lat[::-1], self.lon, path, tile_size=16, attrs={'source': 'test'})
+        store = TileStore.open(path)
+        self.assertEqual(store.attrs, {'source': 'test'})
+        lat, lon, values = store.read(25, 26)
+        self.assertTrue(np.all(np.diff(lat) > 0))
+        np.testing.assert_array_equal(values, self.store.read(25, 26)[2])
+        with self.assertRaises(FileNotFoundError):
+            TileStore.open(os.path.join(self.tmpdir.name, 'missing'))
+
+
+class TestTilePyramid(unittest.TestCase):
+    def setUp(self):
+        """Build a pyramid with a few levels."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.lat = np.linspace(20, 30, 200)
+        self.lon = np.linspace(-98, -80, 300)
+        self.values = np.random.default_rng(0).random((200, 300))
+        self.pyramid = TilePyramid.build(self.values, self.lat, self.lon, os.path.join(self.tmpdir.name, 'pyramid'),
+                                         tile_size=64, min_size=40, attrs={'source': 'test'})
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_levels(self):
+        """Test that each level halves the resolution of the one before it."""
+        self.assertEqual([len(level.lon) for level in self.pyramid.levels], [300, 150, 75, 37])
+        da = xr.DataArray(self.values, dims=('lat', 'lon'))
+        expected = da.coarsen(lat=4, lon=4, boundary='trim').mean().values
+        np.testing.assert_allclose(self.pyramid.read(level=2)[2], expected)
+        reopened = TilePyramid.open(self.pyramid.path)
+        self.assertEqual(len(reopened.levels), 4)
+        self.assertEqual(reopened.attrs, {'source': 'test'})
+
+    def test_select_level(self):
+        """Test that the coarsest level with enough cells across the bounds is chosen."""
+        self.assertEqual(self.pyramid.select_level(target_size=300), 0)
+        self.assertEqual(self.pyramid.select_level(target_size=100), 1)
+        self.assertEqual(self.pyramid.select_level(target_size=1), 3)
+        # A small extent needs a finer level for the same target size
+        self.assertEqual(self.pyramid.select_level(25, 26, -90, -85, target_size=40), 1)
+        self.assertEqual(self.pyramid.select_level(25, 26, -90, -85, target_size=60), 0)
+
+    def test_open_single_store(self):
+        """Test that a directory holding a single store is not mistaken for a pyramid."""
+        with self.assertRaises(FileNotFoundError):
+            TilePyramid.open(self.pyramid.levels[0].path)
@@ -1,5 +1,6 @@
 import unittest
 import numpy as np
+import xarray as xr
 from gerg_plotting.data_classes.variable import Variable
 
 
@@ -125,3 +126,52 @@ class TestVariable(unittest.TestCase):
         self.assertEqual(self.variable.vmin, np.nanpercentile(self.data, 1))
         self.assertEqual(self.variable.vmax, np.nanpercentile(self.data, 99))
 
+    def test_vmin_vmax_lazy(self):
+        """Test that vmin and vmax are only computed on first access."""
+        variable = Variable(data=self.data, name='salinity')
+        self.assertIsNone(variable._limits)
+        self.assertEqual(variable.vmax, np.nanpercentile(self.data, 99))
+        self.assertIsNotNone(variable._limits)
+
+    def test_vmin_vmax_invalidated_on_data_reassignment(self):
+        """Test that reassigning data recomputes the cached limits."""
+        _ = self.variable.vmin
+        new_data = np.array([10.0, 20.0, 30.0])
+        self.variable.data = new_data
+        self.assertEqual(self.variable.vmin, np.nanpercentile(new_data, 1))
+        self.assertEqual(self.variable.vmax, np.nanpercentile(new_data, 99))
+
+    def test_vmin_vmax_user_values_kept(self):
+        """Test that user provided limits are not replaced by computed ones."""
+        variable = Variable(data=self.data, name='salinity', vmin=0, vmax=100)
+        variable.data = np.array([10.0, 20.0, 30.0])
+        self.assertEqual(variable.vmin, 0)
+        self.assertEqual(variable.vmax, 100)
+        variable.get_vmin_vmax(ignore_existing=True)
+        self.assertEqual(variable.vmin, np.nanpercentile(variable.data, 1))
+
+    def test_vmin_vmax_dataarray(self):
+        """Test that an in-memory DataArray becomes a numpy array with limits."""
+        values = np.arange(10.0)
+        variable = Variable(data=xr.DataArray(values), name='salinity')
+        self.assertIsInstance(variable.data, np.ndarray)
+        self.assertEqual(variable.vmin, np.nanpercentile(values, 1))
+        self.assertEqual(variable.vmax, np.nanpercentile(values, 99))
+
+    def test_vmin_vmax_time(self):
+        """Test that limits are not computed for time."""
+        variable = Variable(data=np.array(['2023-01-01', '2023-01-02'], dtype='datetime64[ns]'), name='time')
+        self.assertIsNone(variable.vmin)
+        self.assertIsNone(variable.vmax)
+
+    def test_vmin_vmax_approximate(self):
+        """Test approximate limits for arrays above the configured threshold."""
+        data = np.linspace(0, 1, 100_001)
+        try:
+            Variable.approx_limits_threshold = 1_000
+            variable = Variable(data=data, name='salinity')
+            self.assertAlmostEqual(variable.vmin, np.nanpercentile(data, 1), places=2)
+            self.assertAlmostEqual(variable.vmax, np.nanpercentile(data, 99), places=2)
+        finally:
+            Variable.approx_limits_threshold = None
+
@@ -1,7 +1,10 @@
-from gerg_plotting.modules.calculations import get_center_of_mass,get_sigma_theta,get_density,rotate_vector
+from gerg_plotting.modules.calculations import get_center_of_mass,get_sigma_theta,get_density,rotate_vector,get_percentile_limits,coarsen_mean
+import xarray as xr
 import numpy as np
 import unittest
 import pytest
+import time
+import tracemalloc
 
 
 class TestGetCenterOfMass(unittest.TestCase):
@@ -49,29 +52,43 @@ class TestGetSigmaTheta(unittest.TestCase):
         salinity = np.array([35, 34.5, 34.7])
         temperature = np.array([10, 12, 15])
         Sg, Tg, sigma_theta = get_sigma_theta(salinity, temperature)
-        self.assertEqual(sigma_theta.shape, (3, 3))  # Check the output shape
+        self.assertEqual(sigma_theta.shape, (200, 200))  # Check the output shape, the grid size does not depend on the data
 
     def test_large_data(self):
-        # Test with large input arrays (simulate 500,000 points)
+        # Test with large input arrays (simulate 100,000 points)
         salinity = np.linspace(30, 40, 100_000)
         temperature = np.linspace(0, 30, 100_000)
         Sg, Tg, sigma_theta = get_sigma_theta(salinity, temperature)
-        self.assertEqual(sigma_theta.shape, (10_000, 10_000))  # Check the output shape, should downsample to 10,000 by 10,000
+        self.assertEqual(sigma_theta.shape, (200, 200))  # Check the output shape, should stay at the grid size
+        self.assertEqual((Sg.min(), Sg.max()), (29, 41))  # The grid should span the whole range of the data
+        self.assertEqual((Tg.min(), Tg.max()), (-1, 31))
+
+    def test_grid_size(self):
+        # Test setting the grid resolution
+        salinity = np.array([35, 34.5, 34.7])
+        temperature = np.array([10, 12, 15])
+        Sg, Tg, sigma_theta = get_sigma_theta(salinity, temperature, grid_size=50)
+        self.assertEqual(sigma_theta.shape, (50, 50))
 
     def test_with_nan_values(self):
         # Test handling of NaN values in the data
         salinity = np.array([35, np.nan, 34.7])
         temperature = np.array([10, 12, 15])
         Sg, Tg, sigma_theta = get_sigma_theta(salinity, temperature)
-        self.assertEqual(sigma_theta.shape, (3, 3))  # NaN should be included
+        self.assertEqual(sigma_theta.shape, (200, 200))
+        self.assertFalse(np.isnan(sigma_theta).any())
+        # The temperature paired with the NaN salinity should not set the range
+        salinity = np.array([35, 34.5, np.nan])
+        Sg, Tg, sigma_theta = get_sigma_theta(salinity, temperature)
+        self.assertEqual(Tg.max(), 13)
 
     def test_cnt_parameter(self):
         # Test with cnt=True
         salinity = np.array([35, 34.5, 34.7])
         temperature = np.array([10, 12, 15])
         Sg, Tg, sigma_theta, sigma_theta_lin = get_sigma_theta(salinity, temperature, cnt=True)
-        self.assertEqual(sigma_theta.shape, (3, 3))  # Check shape
-        self.assertEqual(sigma_theta_lin.shape, (3,))  # Should return linspace
+        self.assertEqual(sigma_theta.shape, (200, 200))  # Check shape
+        self.assertEqual(sigma_theta_lin.shape, (200,))  # Should return linspace
 
     def test_sigma_theta_range(self):
         # Test if sigma_theta values are within expected range
@@ -81,6 +98,25 @@ class TestGetSigmaTheta(unittest.TestCase):
         self.assertTrue(np.min(sigma_theta) >= 0)  # Test if sigma_theta values are non-negative
 
 
+@pytest.mark.slow
+def test_get_sigma_theta_benchmark():
+    """Benchmark: time and peak memory of get_sigma_theta for 1e3 to 1e7 input points."""
+    rng = np.random.default_rng(0)
+    for n in [1_000, 100_000, 10_000_000]:
+        salinity = rng.uniform(30, 37, n)
+        temperature = rng.uniform(0, 30, n)
+        tracemalloc.start()
+        start = time.perf_counter()
+        Sg, Tg, sigma_theta = get_sigma_theta(salinity, temperature)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{n:>10,} points: {elapsed:.3f}s, peak {peak / 2**20:.1f} MiB")
+        assert sigma_theta.shape == (200, 200)
+        # Only the NaN masks scale with the number of points
+        assert peak < salinity.nbytes + 16 * 2**20
+
+
 class TestGetDensity(unittest.TestCase):
 
     def test_standard_case(self):
@@ -184,3 +220,39 @@ class TestRotateVector(unittest.TestCase):
         self.assertEqual(u_rot.size, 0)
         self.assertEqual(v_rot.size, 0)
 
+
+
+class TestGetPercentileLimits(unittest.TestCase):
+
+    def test_matches_nanpercentile(self):
+        # Single pass result should match two separate percentile calls
+        values = np.array([1.0, np.nan, 3.0, 7.0, 2.0])
+        lower, upper = get_percentile_limits(values)
+        self.assertEqual(lower, np.nanpercentile(values, 1))
+        self.assertEqual(upper, np.nanpercentile(values, 99))
+
+    def test_sampled(self):
+        # Sampling large arrays should closely approximate the exact percentiles
+        values = np.linspace(0, 100, 1_000_001)
+        lower, upper = get_percentile_limits(values, sample_size=10_000)
+        self.assertAlmostEqual(lower, 1, delta=0.05)
+        self.assertAlmostEqual(upper, 99, delta=0.05)
+
+
+class TestCoarsenMean(unittest.TestCase):
+
+    def test_matches_xarray_coarsen(self):
+        # Trimmed block means should match xarray's coarsen
+        values = np.random.default_rng(0).random((23, 17))
+        values[3, 4] = np.nan
+        da = xr.DataArray(values, dims=('lat', 'lon'))
+        expected = da.coarsen(lat=5, boundary='trim').mean().values
+        np.testing.assert_allclose(coarsen_mean(values, 5, axis=0), expected)
+        expected = da.coarsen(lon=4, boundary='trim').mean().values
+        np.testing.assert_allclose(coarsen_mean(values, 4, axis=1), expected)
+
+    def test_all_nan_block(self):
+        # A block of only NaNs averages to NaN
+        result = coarsen_mean(np.array([np.nan, np.nan, 1.0, 3.0]), 2)
+        self.assertTrue(np.isnan(result[0]))
+        self.assertEqual(result[1], 2.0)
@@ -0,0 +1,77 @@
+from gerg_plotting.modules.contours import cached_contour,contour_cache
+
+import unittest
+import tempfile
+from pathlib import Path
+import matplotlib.pyplot as plt
+import numpy as np
+
+
+class TestCachedContour(unittest.TestCase):
+    def setUp(self):
+        contour_cache.clear()
+        x = np.linspace(-98, -88, 60)
+        y = np.linspace(18, 30, 50)
+        self.x, self.y = x, y
+        self.z = np.sin(x)[None, :] * np.cos(y)[:, None] * 1000 + 2000
+        self.z[:5, :5] = np.nan
+        self.fig, self.ax = plt.subplots()
+
+    def tearDown(self):
+        plt.close(self.fig)
+        contour_cache.clear()
+
+    def assert_same_paths(self, expected, result):
+        np.testing.assert_array_equal(expected.levels, result.levels)
+        self.assertEqual(len(expected.get_paths()), len(result.get_paths()))
+        for expected_path, path in zip(expected.get_paths(), result.get_paths()):
+            np.testing.assert_array_equal(expected_path.vertices, path.vertices)
+            if expected_path.codes is None:
+                self.assertIsNone(path.codes)
+            else:
+                np.testing.assert_array_equal(expected_path.codes, path.codes)
+
+    def test_matches_contour(self):
+        # Cached line and filled contours should match the ones drawn by matplotlib
+        for filled, kwargs in [(False, {}), (True, {'levels': 20, 'extend': 'both'})]:
+            expected = (self.ax.contourf if filled else self.ax.contour)(self.x, self.y, self.z, **kwargs)
+            self.assert_same_paths(expected, cached_contour(self.ax, self.x, self.y, self.z, filled=filled, **kwargs))
+            self.assert_same_paths(expected, cached_contour(self.ax, self.x, self.y, self.z, filled=filled, **kwargs))
+        self.assertEqual(contour_cache.misses, 2)
+        self.assertEqual(contour_cache.hits, 2)
+
+    def test_matches_limits_and_colors(self):
+        # The cached contours should scale the axes and map colors like matplotlib
+        fig, ax = plt.subplots()
+        try:
+            expected = ax.contourf(self.x, self.y, self.z, levels=10, extend='both', cmap='viridis')
+            result = cached_contour(self.ax, self.x, self.y, self.z, filled=True, levels=10, extend='both', cmap='viridis')
+            self.assertEqual(ax.get_xlim(), self.ax.get_xlim())
+            self.assertEqual(ax.get_ylim(), self.ax.get_ylim())
+            np.testing.assert_array_equal(expected.get_array(), result.get_array())
+            self.assertEqual((expected.norm.vmin, expected.norm.vmax), (result.norm.vmin, result.norm.vmax))
+        finally:
+            plt.close(fig)
+
+    def test_key_depends_on_grid_and_levels(self):
+        # A different grid or different levels should not reuse the cached paths
+        cached_contour(self.ax, self.x, self.y, self.z, levels=10)
+        cached_contour(self.ax, self.x, self.y, self.z, levels=5)
+        cached_contour(self.ax, self.x, self.y, self.z + 1, levels=10)
+        self.assertEqual(contour_cache.misses, 3)
+        self.assertEqual(len(contour_cache), 3)
+
+    def test_disk_cache(self):
+        # Paths saved to disk should be reused once the in-memory cache is cleared
+        with tempfile.TemporaryDirectory() as cache_dir:
+            expected = cached_contour(self.ax, self.x, self.y, self.z, filled=True, levels=10, cache_dir=cache_dir)
+            self.assertEqual(len(list(Path(cache_dir).glob('contour_*.npz'))), 1)
+            contour_cache.clear()
+            result = cached_contour(self.ax, self.x, self.y, self.z, filled=True, levels=10, cache_dir=cache_dir)
+            self.assert_same_paths(expected, result)
+            self.assertEqual(contour_cache.misses, 1)
+            self.assertEqual(contour_cache.hits, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
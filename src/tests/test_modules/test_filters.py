@@ -4,6 +4,7 @@ import unittest
 import numpy as np
 import pandas as pd
 import xarray as xr
+import pytest
 
 
 class TestFilterVarFunction(unittest.TestCase):
@@ -42,6 +43,15 @@ class TestFilterVarFunction(unittest.TestCase):
             filter_var(data, 2, 4)
 
 
+    def test_filter_var_dask_array(self):
+        # Test with a chunked dask array, the result should stay lazy
+        da = pytest.importorskip('dask.array')
+        data = da.from_array(np.array([1.0, 2.0, 3.0, 4.0, 5.0]), chunks=2)
+        result = filter_var(data, 2, 4)
+        self.assertIsInstance(result, da.Array)
+        np.testing.assert_array_equal(result.compute(), np.array([np.nan, 2, 3, 4, np.nan]))
+
+
 class TestFilterNanFunction(unittest.TestCase):
     def test_filter_nan_numpy_array(self):
         # Test with numpy array
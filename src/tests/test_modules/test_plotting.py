@@ -1,4 +1,4 @@
-from gerg_plotting.modules.plotting import colorbar,get_turner_cmap
+from gerg_plotting.modules.plotting import colorbar,get_turner_cmap,get_contour_levels
 
 import unittest
 import matplotlib.pyplot as plt
@@ -61,3 +61,16 @@ class TestGetTurnerCmapFunction(unittest.TestCase):
         # Check last 12.5% of colors (red)
         self.assertTrue(np.allclose(colors[224:], [1, 0, 0, 1]), "Last color range is incorrect (red).")
 
+
+class TestGetContourLevels(unittest.TestCase):
+
+    def test_matches_contourf(self):
+        # Levels should be the ones contourf picks for the same number of levels
+        z = np.random.default_rng(0).random((20, 30)) * 3000 - 100
+        z[0, 0] = np.nan
+        fig, ax = plt.subplots()
+        for extend in ['neither', 'both']:
+            for n_levels in [5, 50]:
+                contour_set = ax.contourf(z, levels=n_levels, extend=extend)
+                np.testing.assert_array_equal(get_contour_levels(z, n_levels, extend=extend), contour_set.levels)
+        plt.close(fig)
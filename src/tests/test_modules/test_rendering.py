@@ -0,0 +1,89 @@
+from gerg_plotting.modules.rendering import decimate_points,rasterize_points
+
+import unittest
+import pytest
+import numpy as np
+
+
+class TestDecimatePoints(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.x = np.arange(200_000).astype('datetime64[s]')
+        self.y = rng.random(200_000) * 100
+        self.c = rng.normal(size=200_000)
+
+    def test_small_data_unchanged(self):
+        # Data within the budget should be drawn in full
+        keep = decimate_points(self.x[:1000], self.y[:1000], self.c[:1000], max_points=1000)
+        np.testing.assert_array_equal(keep, np.arange(1000))
+
+    def test_budget_and_extremes(self):
+        # The kept points should fit the budget and include the lowest and highest colors
+        keep = decimate_points(self.x, self.y, self.c, max_points=10_000, shape=(200, 100))
+        self.assertLessEqual(len(keep), 10_000)
+        self.assertTrue(np.all(np.diff(keep) > 0))
+        self.assertEqual(self.c[keep].min(), self.c.min())
+        self.assertEqual(self.c[keep].max(), self.c.max())
+
+    def test_keeps_every_pixel(self):
+        # Every occupied pixel should keep a point so the covered area is unchanged
+        y = np.concatenate([np.zeros(50_000), np.ones(10)])
+        x = np.concatenate([np.linspace(0, 1, 50_000), np.linspace(0, 1, 10)])
+        keep = decimate_points(x, y, max_points=1000, shape=(10, 10))
+        self.assertEqual(np.count_nonzero(y[keep] == 1), 10)
+
+    def test_keeps_last_drawn(self):
+        # The last point drawn in each pixel sets its visible color and is kept, in drawing order
+        x = np.zeros(5_000)
+        y = np.zeros(5_000)
+        c = np.linspace(0, 1, 5_000)
+        c[-1] = 0.5
+        keep = decimate_points(x, y, c, max_points=10, shape=(1, 1))
+        np.testing.assert_array_equal(keep, [0, 4_998, 4_999])
+
+    def test_drops_nan(self):
+        # Points that would not be drawn are dropped
+        y = self.y.copy()
+        y[::2] = np.nan
+        keep = decimate_points(self.x, y, max_points=1000, shape=(10, 10))
+        self.assertFalse(np.isnan(y[keep]).any())
+
+    def test_chunked_arrays(self):
+        # Chunked arrays, including datetimes, are thinned like the arrays they hold
+        da = pytest.importorskip('dask.array')
+        expected = decimate_points(self.x, self.y, self.c, max_points=10_000, shape=(200, 100))
+        keep = decimate_points(da.from_array(self.x, chunks=30_000), da.from_array(self.y, chunks=30_000),
+                               da.from_array(self.c, chunks=30_000), max_points=10_000, shape=(200, 100))
+        np.testing.assert_array_equal(keep, expected)
+
+
+class TestRasterizePoints(unittest.TestCase):
+    def setUp(self):
+        self.x = np.array([0.0, 0.1, 0.9, 1.0, np.nan])
+        self.y = np.array([0.0, 0.1, 0.9, 1.0, 0.5])
+        self.c = np.array([1.0, 3.0, 5.0, 7.0, 9.0])
+
+    def test_statistics(self):
+        # Each pixel should hold the count, mean or last value of its points
+        count, extent = rasterize_points(self.x, self.y, shape=(2, 2))
+        self.assertEqual(extent, [0.0, 1.0, 0.0, 1.0])
+        np.testing.assert_array_equal(count, [[2, np.nan], [np.nan, 2]])
+        mean, _ = rasterize_points(self.x, self.y, self.c, statistic='mean', shape=(2, 2))
+        np.testing.assert_array_equal(mean, [[2, np.nan], [np.nan, 6]])
+        last, _ = rasterize_points(self.x, self.y, self.c, statistic='last', shape=(2, 2))
+        np.testing.assert_array_equal(last, [[3, np.nan], [np.nan, 7]])
+
+    def test_rows_go_up(self):
+        # The first row of the image should be at the bottom of the extent
+        image, _ = rasterize_points([0.0, 1.0], [0.0, 1.0], [1.0, 2.0], statistic='mean', shape=(1, 2))
+        np.testing.assert_array_equal(image[:, 0], [1.0, 2.0])
+
+    def test_invalid_statistic(self):
+        with self.assertRaises(ValueError):
+            rasterize_points(self.x, self.y, self.c, statistic='median')
+        with self.assertRaises(ValueError):
+            rasterize_points(self.x, self.y, statistic='mean')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,12 @@
-from gerg_plotting.modules.utilities import to_numpy_array,calculate_range,calculate_pad,print_time,print_datetime,extract_kwargs,extract_kwargs_with_aliases
+from gerg_plotting.modules.utilities import to_numpy_array,calculate_range,calculate_pad,print_time,print_datetime,extract_kwargs,extract_kwargs_with_aliases,is_chunked_array,is_lazy_array,iter_chunks,load_array
 
 import unittest
+import pytest
+import tempfile
+import os
+import timeit
+import pandas as pd
+import xarray as xr
 import numpy as np
 import io
 from unittest.mock import patch
@@ -37,6 +43,113 @@ class TestToNumpyArray(unittest.TestCase):
         self.assertIsNone(result)
 
 
+class TestToNumpyArrayDispatch(unittest.TestCase):
+    def test_series_zero_copy(self):
+        """Test that numeric Series are returned as views of their data."""
+        series = pd.Series(np.arange(5, dtype='float64'))
+        result = to_numpy_array(series)
+        self.assertTrue(np.shares_memory(result, series.to_numpy()))
+
+    def test_dataarray_zero_copy(self):
+        """Test that in-memory DataArrays are returned as views of their data."""
+        values = np.arange(5, dtype='float64')
+        result = to_numpy_array(xr.DataArray(values))
+        self.assertIsInstance(result, np.ndarray)
+        self.assertTrue(np.shares_memory(result, values))
+        # Variables built from a DataArray hold the numpy array and compute their limits from it
+        from gerg_plotting.data_classes.variable import Variable
+        variable = Variable(data=xr.DataArray(values), name='salinity')
+        self.assertIsInstance(variable.data, np.ndarray)
+        self.assertEqual(variable.vmin, np.nanpercentile(values, 1))
+        self.assertEqual(variable.vmax, np.nanpercentile(values, 99))
+
+    def test_buffer_protocol(self):
+        """Test that buffer-protocol objects are wrapped without copying."""
+        import array
+        buffer = array.array('d', [1.0, 2.0, 3.0])
+        result = to_numpy_array(buffer)
+        self.assertEqual(result.dtype, np.float64)
+        np.testing.assert_array_equal(result, [1.0, 2.0, 3.0])
+
+    def test_numeric_list_with_none(self):
+        """Test that numeric input never gets object dtype."""
+        self.assertEqual(to_numpy_array([1.0, 2.0]).dtype, np.float64)
+        result = to_numpy_array([1.0, None, 3.0])
+        self.assertEqual(result.dtype, np.float64)
+        self.assertTrue(np.isnan(result[1]))
+        result = to_numpy_array(pd.Series([1, None, 3], dtype='Int64'))
+        self.assertEqual(result.dtype, np.float64)
+        self.assertTrue(np.isnan(result[1]))
+
+    def test_datetime_list(self):
+        """Test that lists of datetimes become datetime64."""
+        result = to_numpy_array([datetime.datetime(2023, 1, 1), datetime.datetime(2023, 1, 2)])
+        self.assertEqual(result.dtype.kind, 'M')
+
+    def test_dtype(self):
+        """Test casting to a compact dtype."""
+        self.assertEqual(to_numpy_array([1.0, 2.0], dtype='float32').dtype, np.float32)
+        values = np.zeros(3, dtype='float32')
+        self.assertIs(to_numpy_array(values, dtype='float32'), values)
+
+    def test_scalar(self):
+        """Test that scalars become one element arrays."""
+        np.testing.assert_array_equal(to_numpy_array(5), np.array([5]))
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize('size', [1_000, 100_000, 10_000_000])
+def test_to_numpy_array_benchmark(size):
+    """Benchmark: type-dispatched conversion against the previous pandas round-trip."""
+    values = np.random.rand(size)
+    inputs = {'list': values.tolist(), 'Series': pd.Series(values), 'DataArray': xr.DataArray(values)}
+    number = max(1, 100_000 // size)
+    for kind, input_values in inputs.items():
+        new_time = timeit.timeit(lambda: to_numpy_array(input_values), number=number)
+        old_time = timeit.timeit(lambda: pd.Series(input_values).to_numpy(), number=number)
+        print(f"{kind} {size:>10}: {new_time/number*1e3:.3f} ms vs {old_time/number*1e3:.3f} ms")
+        assert to_numpy_array(input_values).dtype == np.float64
+        assert new_time < old_time * 1.5
+
+
+class TestLazyArrays(unittest.TestCase):
+    def test_is_lazy_array_memmap(self):
+        """Test that memory-mapped arrays are lazy but not chunked."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            values = np.memmap(os.path.join(tmpdir, 'values.dat'), dtype='float64', mode='w+', shape=(10,))
+            self.assertTrue(is_lazy_array(values))
+            self.assertFalse(is_chunked_array(values))
+            self.assertIs(to_numpy_array(values), values)
+            del values
+        self.assertFalse(is_lazy_array(np.zeros(3)))
+
+    def test_dask_passthrough(self):
+        """Test that dask arrays are kept lazy."""
+        da = pytest.importorskip('dask.array')
+        values = da.zeros(10, chunks=5)
+        self.assertTrue(is_chunked_array(values))
+        self.assertIs(to_numpy_array(values), values)
+        # A DataArray backed by dask gives its dask array
+        self.assertIs(to_numpy_array(xr.DataArray(values)), values)
+        self.assertFalse(is_chunked_array(xr.DataArray(np.zeros(3))))
+
+    def test_iter_chunks(self):
+        """Test that chunks cover the whole array in order."""
+        values = np.arange(10)
+        chunks = list(iter_chunks(values, chunk_size=4))
+        self.assertEqual([len(chunk) for chunk in chunks], [4, 4, 2])
+        np.testing.assert_array_equal(np.concatenate(chunks), values)
+
+    def test_load_array(self):
+        """Test that chunked arrays are computed and numpy arrays are returned unchanged."""
+        da = pytest.importorskip('dask.array')
+        values = np.arange(10)
+        self.assertIs(load_array(values), values)
+        loaded = load_array(da.from_array(values, chunks=3))
+        self.assertIsInstance(loaded, np.ndarray)
+        np.testing.assert_array_equal(loaded, values)
+
+
 class TestCalculateRange(unittest.TestCase):
     def test_calculate_range(self):
         """Test that the range is calculated correctly."""
@@ -85,6 +85,17 @@ class TestMapPlot(unittest.TestCase):
         self.map_plot.add_bathy(show_bathy=True, divider=divider)
         self.assertIsNotNone(self.map_plot.cbar_bathy)
 
+    def test_add_bathy_raster(self):
+        """Test adding bathymetry as a raster."""
+        fig, ax = plt.subplots(subplot_kw={'projection': ccrs.PlateCarree()})
+        divider = make_axes_locatable(plt.figure().add_axes([0, 0, 1, 1]))
+        self.map_plot.bathy.raster = True
+        self.map_plot.init_figure(fig=fig, ax=ax, geography=True)
+        self.map_plot.add_bathy(show_bathy=True, divider=divider)
+        self.assertEqual(len(ax.get_images()), 1)
+        self.assertEqual(len(ax.collections), 0)
+        self.assertIsNotNone(self.map_plot.cbar_bathy)
+
     def test_scatter(self):
         """Test scatter plot functionality."""
         fig, ax = plt.subplots(subplot_kw={'projection': ccrs.PlateCarree()})
@@ -93,6 +104,14 @@ class TestMapPlot(unittest.TestCase):
         self.assertIsNotNone(self.map_plot.sc)
         self.assertIsNotNone(self.map_plot.cbar_var)
 
+    def test_scatter_raster(self):
+        """Test scatter plot drawn as an image."""
+        fig, ax = plt.subplots(subplot_kw={'projection': ccrs.PlateCarree()})
+        self.map_plot.raster = True
+        self.map_plot.scatter(var='temperature', show_bathy=False, fig=fig, ax=ax)
+        self.assertEqual(len(ax.get_images()), 1)
+        self.assertIsNotNone(self.map_plot.cbar_var)
+
     def test_quiver(self):
         """Test quiver plot functionality."""
         fig, ax = plt.subplots(subplot_kw={'projection': ccrs.PlateCarree()})
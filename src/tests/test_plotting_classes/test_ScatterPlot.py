@@ -1,7 +1,9 @@
 import unittest
+import pytest
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
 
 from gerg_plotting.data_classes.data import Data
 from gerg_plotting.data_classes.variable import Variable
@@ -43,6 +45,15 @@ class TestScatterPlot(unittest.TestCase):
     def test_get_density_color_data(self):
         self.plotter.get_density_color_data(color_var='density')
 
+    def test_get_density_color_data_memoized(self):
+        """
+        Test that density is calculated once per salinity and temperature data.
+        """
+        density = self.plotter.get_density_color_data(color_var='density')
+        self.assertIs(ScatterPlot(data=self.data).get_density_color_data(color_var='density'), density)
+        self.data.salinity.data = self.data.salinity.data + 1
+        self.assertFalse(np.allclose(self.plotter.get_density_color_data(color_var='density'), density))
+
     def test_scatter(self):
         """
         Test the scatter plot method for valid execution.
@@ -73,6 +84,69 @@ class TestScatterPlot(unittest.TestCase):
         # Assert that the scatter plot is created
         self.assertIsNotNone(scatter)
 
+    def test_scatter_decimate(self):
+        """
+        Test that scatter plots over the point budget are thinned unless decimation is disabled.
+        """
+        fig, ax = plt.subplots()
+        self.plotter.max_points = 5
+        scatter = self.plotter.scatter(x="salinity", y="temperature", color_var="depth", fig=fig, ax=ax)
+        self.assertLessEqual(len(scatter.get_offsets()), 5)
+        self.assertEqual(scatter.get_array().min(), self.data.depth.data.min())
+        self.assertEqual(scatter.get_array().max(), self.data.depth.data.max())
+
+        scatter = self.plotter.scatter(x="salinity", y="temperature", color_var="time", fig=fig, ax=ax)
+        self.assertLessEqual(len(scatter.get_offsets()), 5)
+
+        self.plotter.decimate = False
+        scatter = self.plotter.scatter(x="salinity", y="temperature", color_var="depth", fig=fig, ax=ax)
+        self.assertEqual(len(scatter.get_offsets()), 10)
+
+    def test_scatter_dask_time(self):
+        """
+        Test that scatter plots and hovmoller plots draw chunked time columns, thinned or not.
+        """
+        da = pytest.importorskip('dask.array')
+        data = Data(time=da.from_array(self.data.time.data, chunks=4), depth=da.from_array(self.data.depth.data, chunks=4),
+                    temperature=da.from_array(self.data.temperature.data, chunks=4))
+        plotter = ScatterPlot(data=data)
+        fig, ax = plt.subplots()
+        for max_points in (250_000, 5):
+            plotter.max_points = max_points
+            scatter = plotter.scatter(x="time", y="depth", color_var="temperature", fig=fig, ax=ax)
+            self.assertLessEqual(len(scatter.get_offsets()), min(max_points, 10))
+            plotter.hovmoller("temperature", fig=fig, ax=ax)
+        plotter.hovmoller("temperature", bins=3, fig=fig, ax=ax)
+        plotter.raster = True
+        image = plotter.scatter(x="time", y="depth", color_var="temperature", fig=fig, ax=ax)
+        # Chunked times are recognized from their dtype and placed with date numbers
+        self.assertAlmostEqual(image.get_extent()[0], mdates.date2num(self.data.time.data.min()), delta=1)
+
+    def test_scatter_raster(self):
+        """
+        Test that raster scatter plots draw one image instead of markers.
+        """
+        fig, ax = plt.subplots()
+        self.plotter.raster = True
+        image = self.plotter.scatter(x="salinity", y="temperature", color_var="depth", fig=fig, ax=ax)
+        self.assertEqual(len(ax.get_images()), 1)
+        self.assertEqual(len(ax.collections), 0)
+        self.assertAlmostEqual(np.nanmax(image.get_array()), self.data.depth.data.max())
+
+        fig, ax = plt.subplots()
+        image = self.plotter.scatter(x="salinity", y="temperature", fig=fig, ax=ax)
+        self.assertEqual(np.nansum(image.get_array()), 10)
+
+    def test_hovmoller_raster(self):
+        """
+        Test the hovmoller method drawn as an image.
+        """
+        fig, ax = plt.subplots()
+        self.plotter.raster = True
+        self.plotter.hovmoller(var="salinity", fig=fig, ax=ax)
+        self.assertEqual(len(ax.get_images()), 1)
+        self.assertTrue(ax.yaxis_inverted())
+
     def test_hovmoller(self):
         """
         Test the hovmoller method for depth vs. time plotting.
@@ -84,6 +158,28 @@ class TestScatterPlot(unittest.TestCase):
         self.assertEqual(ax.get_xlabel(), "Time")
         self.assertEqual(ax.get_ylabel(), "Depth")
 
+    def test_hovmoller_binned(self):
+        """
+        Test the binned hovmoller drawn with pcolormesh.
+        """
+        fig, ax = plt.subplots()
+        self.plotter.hovmoller(var="salinity", fig=fig, ax=ax, bins=[5, 2])
+        mesh, = ax.collections
+        self.assertEqual(mesh.get_array().shape, (2, 5))
+        self.assertTrue(ax.yaxis_inverted())
+        self.assertEqual(ax.get_xlabel(), "Time")
+
+    def test_get_hovmoller_grid(self):
+        """
+        Test that binned grids are cached until the data change.
+        """
+        time_edges, depth_edges, grid = self.plotter.get_hovmoller_grid("salinity", bins=[10, 1])
+        self.assertEqual(grid.shape, (1, 10))
+        np.testing.assert_allclose(np.sort(grid[0]), np.sort(self.data.salinity.data))
+        self.assertIs(self.plotter.get_hovmoller_grid("salinity", bins=[10, 1])[2], grid)
+        self.data.salinity.data = self.data.salinity.data + 1
+        self.assertIsNot(self.plotter.get_hovmoller_grid("salinity", bins=[10, 1])[2], grid)
+
     def test_TS(self):
         """
         Test the T-S plot with optional sigma-theta contours.
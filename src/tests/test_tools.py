@@ -15,7 +15,8 @@ from gerg_plotting.tools.tools import (
     interp_glider_lat_lon,
     data_from_csv,
     data_from_ds,
-    data_from_netcdf
+    data_from_netcdf,
+    data_from_netcdf_many
 )
 
 class TestTools(unittest.TestCase):
@@ -154,6 +155,17 @@ class TestTools(unittest.TestCase):
         self.assertIn('salinity', result)
         self.assertEqual(result['depth'], 'pressure')
 
+    def test_get_var_mapping_cached(self):
+        columns = ['Temperature', 'salinity', 'pressure', 'platform_lat', 'latitude']
+        first = _get_var_mapping(columns)
+        self.assertEqual(first['temperature'], 'Temperature')
+        self.assertEqual(first['lat'], 'latitude')
+        # Changing a returned mapping does not change the cached one
+        first['temperature'] = 'other'
+        second = _get_var_mapping(tuple(columns), {'salinity': 'salt'})
+        self.assertEqual(second['temperature'], 'Temperature')
+        self.assertEqual(second['salinity'], 'salt')
+
     def test_interp_glider_lat_lon(self):
         # Create test dataset
         times = pd.date_range('2023-01-01', '2023-01-02', periods=5)
@@ -193,6 +205,17 @@ class TestTools(unittest.TestCase):
         self.assertTrue(hasattr(result, 'depth'))
         self.assertTrue(hasattr(result, 'time'))
 
+    def test_data_from_df_float_dtype(self):
+        df = pd.DataFrame({
+            'latitude': [25.0, 26.0],
+            'temperature': [20.0, 21.0],
+            'time': pd.date_range('2023-01-01', '2023-01-02')
+        })
+        result = data_from_df(df, float_dtype='float32')
+        self.assertEqual(result.lat.data.dtype, np.float32)
+        self.assertEqual(result.temperature.data.dtype, np.float32)
+        self.assertEqual(result.time.data.dtype.kind, 'M')
+
     def test_data_from_csv(self):
         # Create temporary CSV file
         test_df = pd.DataFrame({
@@ -214,7 +237,71 @@ class TestTools(unittest.TestCase):
             self.assertTrue(hasattr(mapped_result, 'temperature'))
         
         os.remove(f.name)
-        
+
+    def test_data_from_csv_projected(self):
+        # Wide file where only a few columns are mapped
+        test_df = pd.DataFrame({f'extra_{idx}': ['text', 'more'] for idx in range(50)})
+        test_df['lat'] = [25, 26]
+        test_df['lon'] = [-90, -91]
+        test_df['temp'] = [20, 21]
+        test_df['time'] = ['2023-01-01', '2023-01-02']
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, 'wide.csv')
+            test_df.to_csv(filename, index=False)
+
+            result = data_from_csv(filename, float_dtype='float32')
+            self.assertEqual(result.lat.data.dtype, np.float32)
+            np.testing.assert_array_equal(result.temperature.data, [20, 21])
+            self.assertEqual(result.time.data.dtype, np.dtype('datetime64[ns]'))
+
+            # Chunked parsing gives the same result
+            chunked = data_from_csv(filename, chunksize=1)
+            np.testing.assert_array_equal(chunked.lon.data, [-90, -91])
+            np.testing.assert_array_equal(chunked.time.data, result.time.data)
+
+    def test_data_from_csv_cache(self):
+        test_df = pd.DataFrame({'lat': [25.0, 26.0], 'lon': [-90.0, -91.0], 'temp': [20.0, 21.0]})
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, 'test.csv')
+            cache_dir = os.path.join(tmpdir, 'cache')
+            test_df.to_csv(filename, index=False)
+
+            # First load writes the cache, the second is read from it
+            result = data_from_csv(filename, cache_dir=cache_dir)
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+            cached = data_from_csv(filename, cache_dir=cache_dir)
+            np.testing.assert_array_equal(cached.temperature.data, result.temperature.data)
+
+            # A different mapping is cached separately
+            data_from_csv(filename, mapped_variables={'salinity': 'temp'}, cache_dir=cache_dir)
+            self.assertEqual(len(os.listdir(cache_dir)), 2)
+
+            # Modifying the source invalidates the cache
+            test_df['temp'] = [30.0, 31.0]
+            test_df.to_csv(filename, index=False)
+            os.utime(filename, ns=(0, os.stat(filename).st_mtime_ns + 1_000_000))
+            updated = data_from_csv(filename, cache_dir=cache_dir)
+            np.testing.assert_array_equal(updated.temperature.data, [30.0, 31.0])
+
+    def test_data_from_csv_cache_window(self):
+        test_df = pd.DataFrame({'lat': np.arange(10.0), 'lon': np.arange(10.0)})
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, 'test.csv')
+            cache_dir = os.path.join(tmpdir, 'cache')
+            test_df.to_csv(filename, index=False)
+
+            # The window is part of the cache key and is kept by data loaded from the cache
+            data_from_csv(filename, cache_dir=cache_dir)
+            data_from_csv(filename, cache_dir=cache_dir, max_rows=5)
+            self.assertEqual(len(os.listdir(cache_dir)), 2)
+            cached = data_from_csv(filename, cache_dir=cache_dir, max_rows=5)
+            self.assertEqual(cached.max_rows, 5)
+            cached.append({'lat': [10.0], 'lon': [10.0]})
+            np.testing.assert_array_equal(cached.lat.data, np.arange(6.0, 11.0))
+
     def test_data_from_ds(self):
         # Create test xarray dataset
         ds = xr.Dataset(
@@ -272,4 +359,29 @@ class TestTools(unittest.TestCase):
         
         os.remove(f.name)
 
+    def test_data_from_netcdf_many(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for idx in range(3):
+                variables = {
+                    'latitude': ('time', [25.0 + idx, 26.0 + idx]),
+                    'longitude': ('time', [-90.0, -91.0]),
+                }
+                if idx != 1:
+                    variables['temperature'] = ('time', [20.0 + idx, 21.0 + idx])
+                ds = xr.Dataset(variables, coords={'time': pd.date_range(f'2023-01-0{idx + 1}', periods=2, freq='h')})
+                ds.to_netcdf(os.path.join(tmpdir, f'dive_{idx}.nc'))
+
+            # Test glob loading in threads
+            result = data_from_netcdf_many(os.path.join(tmpdir, 'dive_*.nc'), workers=2)
+            np.testing.assert_array_equal(result.lat.data, [25.0, 26.0, 26.0, 27.0, 27.0, 28.0])
+            self.assertEqual(len(result.time.data), 6)
+            # The file without temperature is filled with NaN
+            np.testing.assert_array_equal(np.isnan(result.temperature.data), [False, False, True, True, False, False])
 
+            # Test an explicit list of paths with processes
+            paths = [os.path.join(tmpdir, f'dive_{idx}.nc') for idx in (2, 0)]
+            result = data_from_netcdf_many(paths, workers=2, processes=True)
+            np.testing.assert_array_equal(result.lat.data, [27.0, 28.0, 25.0, 26.0])
+
+        with self.assertRaises(ValueError):
+            data_from_netcdf_many([])